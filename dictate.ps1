@@ -10,11 +10,36 @@
     Recording duration in seconds (default: manual - press Enter to stop)
 
 .PARAMETER Model
-    Whisper model: tiny (fastest), base, small (default), medium, large (most accurate)
+    Whisper model: auto (default: the -Benchmark pick for this machine, else small),
+    tiny (fastest), base, small, medium, large (most accurate)
+
+.PARAMETER Backend
+    STT backend: whisper (default), faster-whisper (int8 on CPU, much faster), auto
+
+.PARAMETER Threads
+    CPU threads for inference (default: the -Benchmark pick, else engine default)
 
 .PARAMETER NoClipboard
     Don't copy to clipboard
 
+.PARAMETER SaveAudio
+    Also archive the recording as a WAV file at this path
+
+.PARAMETER Benchmark
+    Time each model and thread count on this machine and remember the most
+    accurate one that transcribes fast enough; -Model auto then uses it
+
+.PARAMETER Daemon
+    Start the resident dictation daemon in the background (if it isn't
+    running) and dictate through it. The model stays loaded between runs,
+    so later dictations skip the Whisper load entirely.
+
+.PARAMETER StopDaemon
+    Stop the background dictation daemon
+
+.PARAMETER IdleTimeout
+    Seconds before the daemon unloads an unused model (default: 600)
+
 .EXAMPLE
     .\dictate.ps1
     Record until you press Enter, then transcribe
@@ -27,17 +52,34 @@
     .\dictate.ps1 -Model medium
     Use more accurate model (slower)
 
+.EXAMPLE
+    .\dictate.ps1 -Benchmark
+    Pick the model and thread count for this machine (run once)
+
+.EXAMPLE
+    .\dictate.ps1 -Daemon
+    Keep the model resident; bind this to a hotkey for sub-second dictation
+
 .NOTES
     Requires: Python, Whisper, sounddevice, pyperclip
     First run may be slow (downloads Whisper model)
     Subsequent runs are fast
+    Without -Daemon, an already-running daemon is still used if present
 #>
 
 param(
     [int]$Duration = 0,
-    [ValidateSet("tiny", "base", "small", "medium", "large")]
-    [string]$Model = "small",
-    [switch]$NoClipboard
+    [ValidateSet("auto", "tiny", "base", "small", "medium", "large")]
+    [string]$Model = "auto",
+    [ValidateSet("whisper", "faster-whisper", "auto")]
+    [string]$Backend = "whisper",
+    [int]$Threads = 0,
+    [switch]$NoClipboard,
+    [string]$SaveAudio = "",
+    [switch]$Benchmark,
+    [switch]$Daemon,
+    [switch]$StopDaemon,
+    [int]$IdleTimeout = 600
 )
 
 $ErrorActionPreference = "Stop"
@@ -64,8 +106,61 @@ if (-not (Test-Path $dictateScript)) {
     exit 1
 }
 
+$daemonPort = 8766
+
+function Test-Daemon {
+    $client = New-Object System.Net.Sockets.TcpClient
+    try {
+        return $client.ConnectAsync("127.0.0.1", $daemonPort).Wait(200)
+    }
+    catch {
+        return $false
+    }
+    finally {
+        $client.Dispose()
+    }
+}
+
+if ($Benchmark) {
+    $benchArgs = @($dictateScript, "--benchmark", "--backend", $Backend)
+    if ($Threads -gt 0) {
+        $benchArgs += @("--threads", $Threads)
+    }
+    & python @benchArgs
+    exit $LASTEXITCODE
+}
+
+if ($StopDaemon) {
+    & python $dictateScript --stop-daemon --port $daemonPort
+    exit $LASTEXITCODE
+}
+
+if ($Daemon -and -not (Test-Daemon)) {
+    Write-Info "Starting dictation daemon (loading $Model model)..."
+    $daemonArgs = @($dictateScript, "--daemon", "--model", $Model, "--backend", $Backend,
+                    "--port", $daemonPort, "--idle-timeout", $IdleTimeout)
+    if ($Threads -gt 0) {
+        $daemonArgs += @("--threads", $Threads)
+    }
+    Start-Process -FilePath $python.Source -ArgumentList $daemonArgs -WindowStyle Hidden
+
+    # Wait for the model to load so this dictation already goes through the daemon
+    $deadline = (Get-Date).AddSeconds(120)
+    while (-not (Test-Daemon)) {
+        if ((Get-Date) -gt $deadline) {
+            Write-Warn "Daemon not ready yet - transcribing in this process"
+            break
+        }
+        Start-Sleep -Milliseconds 500
+    }
+}
+
 # Build Python command
-$pythonArgs = @($dictateScript, "--model", $Model)
+$pythonArgs = @($dictateScript, "--model", $Model, "--backend", $Backend, "--port", $daemonPort)
+
+if ($Threads -gt 0) {
+    $pythonArgs += @("--threads", $Threads)
+}
 
 if ($Duration -gt 0) {
     $pythonArgs += @("--duration", $Duration)
@@ -75,12 +170,16 @@ if ($NoClipboard) {
     $pythonArgs += "--no-clipboard"
 }
 
+if ($SaveAudio) {
+    $pythonArgs += @("--save-audio", $SaveAudio)
+}
+
 # Show info
 Write-Host ""
 Write-Info "WHISPER DICTATION"
 Write-Info "================="
 Write-Host ""
-Write-Host "Model: $Model" -ForegroundColor Gray
+Write-Host "Model: $Model ($Backend)" -ForegroundColor Gray
 
 if ($Duration -gt 0) {
     Write-Host "Duration: $Duration seconds" -ForegroundColor Gray
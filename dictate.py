@@ -1,17 +1,47 @@
 """
 Real-time dictation using local Whisper AI.
 Records audio from microphone, transcribes, and copies to clipboard.
+
+Run `python dictate.py --daemon` once to keep the model resident; later
+invocations find the daemon on localhost, have it record and transcribe,
+and only copy the text, so they skip the torch import and model load.
+Without a daemon, dictate.py loads the model itself as before. The daemon
+writes a per-user token to a 0600 file under ~/.cache/voice_v10 and refuses
+requests that don't carry it; --save-audio through the daemon only writes
+under the directory it was started with (--save-audio-dir).
+
+--long transcribes while you talk: the recording is split on pauses and
+each finished segment is transcribed in the background, so memory stays
+bounded and the text is ready moments after you stop.
 """
 import sounddevice as sd
 import numpy as np
-import whisper
 import pyperclip
 import sys
 import os
-import tempfile
-from scipy.io import wavfile
+import gc
+import hmac
+import json
+import queue
+import secrets
+import select
+import socket
+import socketserver
+import threading
+import time
+import wave
 import argparse
 
+# Share the STT backends with Voice V10 (imported on first use: pulls in torch)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "voice-integration", "voice_core"))
+from vad import VADSegmenter, VADConfig, compact_speech
+import stt_autotune
+
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8766
+DAEMON_TOKEN_DIR = os.path.join(os.path.expanduser("~"), ".cache", "voice_v10")
+DEFAULT_IDLE_TIMEOUT = 600  # Seconds before an unused model is unloaded
+
 def print_info(msg):
     """Print info message"""
     print(f"\033[96m{msg}\033[0m")
@@ -50,24 +80,9 @@ def record_audio(duration=None, sample_rate=16000):
             sd.wait()
         else:
             # Manual stop recording
-            audio_chunks = []
-
-            def callback(indata, frames, time, status):
-                if status:
-                    print_error(f"Status: {status}")
-                audio_chunks.append(indata.copy())
-
-            with sd.InputStream(
-                samplerate=sample_rate,
-                channels=1,
-                dtype='float32',
-                callback=callback
-            ):
-                print("  Recording in progress...")
-                print("  Press Enter when done speaking")
-                input()
-
-            audio = np.concatenate(audio_chunks, axis=0)
+            print("  Recording in progress...")
+            print("  Press Enter when done speaking")
+            audio = record_until(input, sample_rate)
 
         return audio, sample_rate
 
@@ -79,38 +94,231 @@ def record_audio(duration=None, sample_rate=16000):
         print_error(f"Recording failed: {e}")
         sys.exit(1)
 
+def record_until(wait, sample_rate=16000, on_block=None):
+    """
+    Record from the microphone until wait() returns.
+
+    Args:
+        wait: Blocks for as long as recording should continue
+        sample_rate: Audio sample rate
+        on_block: Receives each block instead of it being kept (streaming),
+            in 100 ms blocks
+
+    Returns:
+        numpy array of audio data (float32, frames x 1); empty when streaming
+    """
+    audio_chunks = []
+
+    def callback(indata, frames, time, status):
+        if status:
+            print_error(f"Status: {status}")
+        if on_block is not None:
+            on_block(indata.copy())
+        else:
+            audio_chunks.append(indata.copy())
+
+    with sd.InputStream(
+        samplerate=sample_rate,
+        channels=1,
+        dtype='float32',
+        blocksize=sample_rate // 10 if on_block is not None else 0,
+        callback=callback
+    ):
+        wait()
+
+    if not audio_chunks:
+        return np.zeros((0, 1), dtype=np.float32)
+    return np.concatenate(audio_chunks, axis=0)
+
 def save_audio(audio, sample_rate, filepath):
-    """Save audio to WAV file"""
+    """Save audio to WAV file (archiving only; transcription reads the array)"""
+    from scipy.io import wavfile
+
     # Normalize audio to int16 range
     audio_int16 = np.int16(audio * 32767)
     wavfile.write(filepath, sample_rate, audio_int16)
 
-def transcribe_audio(audio_file, model_name="small"):
+def load_backend(model_name="small", backend="whisper", threads=0, compute_type="int8", prompt=None):
+    """Load an STT backend (the slow part: torch import and model weights)."""
+    from stt_backend import STTConfig, create_stt_backend
+
+    return create_stt_backend(STTConfig(
+        backend=backend,
+        model=model_name,
+        language=None,  # Auto-detect, as before
+        threads=threads,
+        compute_type=compute_type,
+        initial_prompt=prompt,
+    ))
+
+def transcribe_audio(audio, model_name="small", backend="whisper", threads=0, compute_type="int8",
+                     prompt=None, stt=None, trim=True):
     """
-    Transcribe audio file using Whisper.
+    Transcribe recorded audio using Whisper.
 
     Args:
-        audio_file: Path to audio file
+        audio: float32 samples at 16 kHz (any shape; used as mono), or a path
+            to an audio file (decoded through ffmpeg)
         model_name: Whisper model (tiny, base, small, medium, large)
+        backend: STT backend (whisper, faster-whisper, auto)
+        threads: CPU threads for inference (0 = engine default)
+        compute_type: Quantisation for faster-whisper (int8, float32)
+        prompt: Optional vocabulary prompt (names, jargon) to bias decoding
+        stt: Already-loaded backend (e.g. the daemon's); None = load one
+        trim: Cut silence and long pauses before transcribing
 
     Returns:
         Transcribed text
     """
-    print_info(f"🤖 Transcribing with Whisper ({model_name} model)...")
+    print_info(f"🤖 Transcribing with Whisper ({model_name} model, {backend} backend)...")
 
     try:
         # Load Whisper model
-        model = whisper.load_model(model_name)
+        if stt is None:
+            stt = load_backend(model_name, backend, threads, compute_type, prompt)
 
         # Transcribe
-        result = model.transcribe(audio_file, fp16=False)
+        result = stt.transcribe(as_whisper_input(audio, trim))
 
-        return result['text'].strip()
+        return result.text
 
     except Exception as e:
         print_error(f"Transcription failed: {e}")
         sys.exit(1)
 
+class LongFormDictation:
+    """
+    Transcribes a recording segment by segment while it is still going.
+
+    Microphone blocks are split on pauses (VADSegmenter, with a hard cap on
+    segment length) by a worker thread that transcribes each finished
+    segment and hands its text to on_text. Only the segment in progress and
+    blocks waiting for the worker are held in memory, however long the
+    recording; silence is never kept.
+
+    The blocks waiting for the worker are capped at max_backlog_s of audio.
+    If transcription falls that far behind, the overflow policy applies:
+    "drop" discards new blocks until the worker catches up, "stop" discards
+    everything from then on. Either way dropped_s counts what was lost.
+
+    Usage:
+        dictation = LongFormDictation(stt, on_text=print)
+        dictation.start()
+        record_until(input, on_block=dictation.feed)
+        text = dictation.finish()
+    """
+
+    BLOCK_S = 0.1  # record_until's streaming block size
+
+    def __init__(self, stt, sample_rate=16000, threshold=0.01, silence_ms=700, max_segment_s=30,
+                 on_text=None, archive_path=None, trim=True, max_backlog_s=60, overflow="drop"):
+        if overflow not in ("drop", "stop"):
+            raise ValueError(f"overflow must be 'drop' or 'stop', not {overflow!r}")
+        self.stt = stt
+        self.trim = trim
+        self.sample_rate = sample_rate
+        self.on_text = on_text
+        self.archive_path = archive_path  # Recording streamed to a WAV as it arrives
+        self.segments = []                # Text per segment
+        self.language = None              # Detected on the first segment, then kept
+        self.heard_audio = False
+        self.overflow = overflow
+        self.overflowed = False           # The backlog limit was hit at least once
+        self.dropped_s = 0.0              # Audio discarded because transcription fell behind
+        self._vad = VADSegmenter(VADConfig(
+            sample_rate=sample_rate,
+            threshold=threshold,
+            silence_ms=silence_ms,
+            max_speech_ms=int(max_segment_s * 1000),
+        ))
+        self._blocks = queue.Queue(maxsize=max(1, round(max_backlog_s / self.BLOCK_S)))
+        self._worker = None
+        self._error = None
+
+    def start(self):
+        self._worker = threading.Thread(target=self._run, name="long-form", daemon=True)
+        self._worker.start()
+
+    def feed(self, block):
+        """Queue a microphone block (safe to call from the audio callback; never blocks)."""
+        if not (self.overflowed and self.overflow == "stop"):
+            try:
+                self._blocks.put_nowait(block)
+                return
+            except queue.Full:
+                self.overflowed = True
+        self.dropped_s += len(block) / self.sample_rate
+
+    def finish(self):
+        """
+        Transcribe whatever is still being said and wait for the worker.
+
+        Returns:
+            The full transcription
+        """
+        self._blocks.put(None)
+        self._worker.join()
+        if self._error is not None:
+            raise self._error
+        return " ".join(self.segments)
+
+    def _run(self):
+        archive = None
+        if self.archive_path:
+            archive = wave.open(self.archive_path, "wb")
+            archive.setnchannels(1)
+            archive.setsampwidth(2)
+            archive.setframerate(self.sample_rate)
+        try:
+            while True:
+                block = self._blocks.get()
+                if block is None:
+                    segment = self._vad.flush()
+                    if segment is not None:
+                        self._transcribe(segment)
+                    return
+                if archive is not None:
+                    archive.writeframes(np.int16(block * 32767).tobytes())
+                segment = self._vad.push(block)
+                if segment is not None:
+                    self._transcribe(segment)
+                    backlog = self._blocks.qsize() * len(block) / self.sample_rate
+                    if backlog > 10:
+                        print_error(f"Transcription is {backlog:.0f}s behind - try a smaller model")
+        except Exception as e:
+            self._error = e
+            while self._blocks.get() is not None:  # Keep draining until finish()
+                pass
+        finally:
+            if archive is not None:
+                archive.close()
+
+    def _transcribe(self, segment):
+        self.heard_audio = True
+        result = self.stt.transcribe(as_whisper_input(segment, self.trim), language=self.language)
+        self.language = self.language or result.language
+        text = result.text.strip()
+        if text:
+            self.segments.append(text)
+            if self.on_text:
+                self.on_text(text)
+
+def as_whisper_input(audio, trim=False):
+    """
+    Flatten a recording to the 1-D float32 array Whisper takes (no copy when possible).
+
+    With trim, leading and trailing silence is cut and pauses over 300 ms are
+    shortened, since Whisper's cost grows with the length of its input.
+    """
+    if isinstance(audio, str):
+        return audio
+    audio = np.ascontiguousarray(audio, dtype=np.float32).reshape(-1)
+    if trim:
+        compacted, _ = compact_speech(audio)
+        if compacted.size:
+            return compacted
+    return audio
+
 def copy_to_clipboard(text):
     """Copy text to clipboard"""
     try:
@@ -119,6 +327,445 @@ def copy_to_clipboard(text):
     except Exception as e:
         print_error(f"Clipboard copy failed: {e}")
 
+def show_transcription(text):
+    """Print the transcription banner"""
+    print()
+    print("=" * 50)
+    print("  TRANSCRIPTION")
+    print("=" * 50)
+    print()
+    print(text)
+    print()
+    print("=" * 50)
+    print()
+
+# ----------------------------------------------------------------------
+# Daemon: models stay resident between dictations
+# ----------------------------------------------------------------------
+
+class ModelCache:
+    """
+    STT backends kept loaded between requests, unloaded after idle_timeout.
+
+    Backends are keyed by every setting that changes the loaded model, so a
+    client asking for a different model or prompt gets its own entry.
+    """
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._models = {}     # key -> backend
+        self._last_used = {}  # key -> time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(options):
+        return (options["backend"], options["model"], options["threads"],
+                options["compute_type"], options["prompt"])
+
+    def get(self, options):
+        """Return the resident backend for these options, loading it if needed."""
+        key = self.key(options)
+        with self._lock:
+            stt = self._models.get(key)
+            if stt is None:
+                print_info(f"Loading {options['model']} ({options['backend']})...")
+                stt = load_backend(options["model"], options["backend"], options["threads"],
+                                   options["compute_type"], options["prompt"])
+                self._models[key] = stt
+            self._last_used[key] = time.monotonic()
+            return stt
+
+    def loaded(self):
+        with self._lock:
+            return [f"{key[1]} ({key[0]})" for key in self._models]
+
+    def unload_idle(self):
+        """Drop models unused for idle_timeout; returns how many were unloaded."""
+        now = time.monotonic()
+        with self._lock:
+            idle = [key for key, used in self._last_used.items() if now - used >= self.idle_timeout]
+            for key in idle:
+                del self._models[key]
+                del self._last_used[key]
+        if idle:
+            gc.collect()
+            print_info(f"Unloaded {len(idle)} idle model(s)")
+        return len(idle)
+
+    def run_reaper(self, stop):
+        """Unload idle models until stop (a threading.Event) is set."""
+        while not stop.wait(min(30, self.idle_timeout)):
+            self.unload_idle()
+
+def daemon_token_path(port):
+    """Token file for the daemon on this port (readable only by its user)"""
+    return os.path.join(DAEMON_TOKEN_DIR, f"dictate_daemon_{port}.token")
+
+def write_daemon_token(port):
+    """Create a fresh token file with 0600 permissions and return the token"""
+    os.makedirs(DAEMON_TOKEN_DIR, mode=0o700, exist_ok=True)
+    path = daemon_token_path(port)
+    token = secrets.token_hex(32)
+    try:
+        os.unlink(path)  # O_EXCL below: never reuse a file someone else created or loosened
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token
+
+def read_daemon_token(port):
+    """The running daemon's token, or None if this user hasn't started one"""
+    try:
+        with open(daemon_token_path(port)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+class DictationHandler(socketserver.StreamRequestHandler):
+    """
+    One client connection; newline-delimited JSON in both directions.
+
+    Every request carries the daemon's "token"; others are refused.
+    Client: {"cmd": "dictate", "duration", "model", "backend", ...}
+            then {"cmd": "stop"} (manual stop) or {"cmd": "cancel"}
+            or {"cmd": "ping"} / {"cmd": "shutdown"}
+    Daemon: {"event": "recording"}, {"event": "transcribing"},
+            then {"text", "seconds"[, "dropped_s"]} or {"error"}
+    """
+
+    def send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def receive(self):
+        line = self.rfile.readline()
+        return json.loads(line) if line else {"cmd": "cancel"}
+
+    def handle(self):
+        request = self.receive()
+        token = request.get("token")
+        if not (isinstance(token, str) and hmac.compare_digest(token.encode(), self.server.token.encode())):
+            self.send({"error": "Invalid daemon token"})
+            return
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            self.send({"ok": True, "models": self.server.models.loaded()})
+        elif cmd == "shutdown":
+            self.send({"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif cmd == "dictate":
+            try:
+                if request.get("save_audio"):
+                    request["save_audio"] = self.server.audio_path(request["save_audio"])
+            except ValueError as e:
+                self.send({"error": str(e)})
+                return
+            if not self.server.busy.acquire(blocking=False):
+                self.send({"error": "Daemon is busy with another dictation"})
+                return
+            try:
+                self.dictate(request)
+            finally:
+                self.server.busy.release()
+        else:
+            self.send({"error": f"Unknown command: {cmd}"})
+
+    def dictate(self, request):
+        # Load (or touch) the model before recording so the wait is up front
+        stt = self.server.models.get(request)
+        if request.get("long"):
+            self.dictate_long(request, stt)
+            return
+
+        stop = {"cmd": "stop"}
+
+        def wait():
+            self.send({"event": "recording"})  # Stream is open
+            if request.get("duration"):
+                self.wait_or_cancel(request["duration"], stop)
+            else:
+                stop.update(self.receive())
+
+        audio = record_until(wait, request.get("sample_rate", 16000))
+        if stop["cmd"] == "cancel":
+            return
+
+        if audio.size == 0 or np.max(np.abs(audio)) < 0.01:
+            self.send({"error": "No audio detected - microphone might be muted"})
+            return
+
+        self.send({"event": "transcribing"})
+        start = time.perf_counter()
+        try:
+            if request.get("save_audio"):
+                save_audio(audio, request.get("sample_rate", 16000), request["save_audio"])
+            text = stt.transcribe(as_whisper_input(audio, request.get("trim", True))).text
+        except Exception as e:
+            self.send({"error": f"Transcription failed: {e}"})
+            return
+        self.send({"text": text, "seconds": time.perf_counter() - start})
+
+    def wait_or_cancel(self, duration, stop):
+        """Wait out a fixed-duration recording, ending early if the client sends a command."""
+        deadline = time.monotonic() + duration
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            # In short slices, so a cancel (or a dropped connection) ends the recording promptly
+            readable, _, _ = select.select([self.connection], [], [], min(remaining, 0.1))
+            if readable:
+                stop.update(self.receive())
+                return
+
+    def dictate_long(self, request, stt):
+        """Long-form: stream each segment's text back while recording continues."""
+        lock = threading.Lock()  # Segments are sent from the worker thread
+
+        def on_text(text):
+            with lock:
+                self.send({"event": "segment", "text": text})
+
+        dictation = LongFormDictation(stt, request.get("sample_rate", 16000),
+                                      max_segment_s=request.get("max_segment", 30),
+                                      on_text=on_text, archive_path=request.get("save_audio"),
+                                      trim=request.get("trim", True))
+        stop = {"cmd": "stop"}
+
+        def wait():
+            self.send({"event": "recording"})
+            stop.update(self.receive())
+
+        dictation.start()
+        record_until(wait, request.get("sample_rate", 16000), on_block=dictation.feed)
+        with lock:
+            self.send({"event": "transcribing"})
+        start = time.perf_counter()
+        try:
+            text = dictation.finish()
+        except Exception as e:
+            self.send({"error": f"Transcription failed: {e}"})
+            return
+        if stop["cmd"] == "cancel":
+            return
+        if not dictation.heard_audio:
+            self.send({"error": "No audio detected - microphone might be muted"})
+            return
+        self.send({"text": text, "seconds": time.perf_counter() - start, "dropped_s": dictation.dropped_s})
+
+class DictationDaemon(socketserver.ThreadingTCPServer):
+    """Localhost dictation server owning the microphone and the resident models."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, models, port=DAEMON_PORT, token="", audio_dir=None):
+        super().__init__((DAEMON_HOST, port), DictationHandler)
+        self.models = models
+        self.token = token
+        self.audio_dir = os.path.realpath(audio_dir) if audio_dir else None
+        self.busy = threading.Lock()  # One recording at a time: there is one microphone
+
+    def audio_path(self, requested):
+        """Resolve a client's --save-audio path, which must lie under audio_dir"""
+        if self.audio_dir is None:
+            raise ValueError("This daemon doesn't save recordings (start it with --save-audio-dir)")
+        path = os.path.realpath(os.path.join(self.audio_dir, requested))
+        if os.path.commonpath([self.audio_dir, path]) != self.audio_dir:
+            raise ValueError(f"Recordings can only be saved under {self.audio_dir}")
+        return path
+
+def request_options(args):
+    """Settings a client sends with each dictation."""
+    return {
+        "model": args.model,
+        "backend": args.backend,
+        "threads": args.threads,
+        "compute_type": args.compute_type,
+        "prompt": args.prompt,
+        "duration": args.duration,
+        "save_audio": os.path.abspath(args.save_audio) if args.save_audio else None,
+        "long": args.long,
+        "max_segment": args.max_segment,
+        "trim": not args.no_trim,
+    }
+
+def run_daemon(args):
+    """Serve dictation requests until interrupted, preloading args.model."""
+    models = ModelCache(args.idle_timeout)
+    models.get(request_options(args))
+
+    # Listen only once the model is loaded, so a reachable daemon is a ready one
+    daemon = DictationDaemon(models, args.port, write_daemon_token(args.port), args.save_audio_dir)
+    stop = threading.Event()
+    threading.Thread(target=models.run_reaper, args=(stop,), daemon=True).start()
+    print_success(f"Dictation daemon listening on {DAEMON_HOST}:{args.port} "
+                  f"(idle models unloaded after {args.idle_timeout}s)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        stop.set()
+        daemon.server_close()
+        try:
+            os.unlink(daemon_token_path(args.port))
+        except OSError:
+            pass
+        print_info("Dictation daemon stopped")
+
+def daemon_request(port, message, timeout=0.25):
+    """
+    Connect to a running daemon and send one request with its token.
+
+    Returns:
+        (socket, file) for reading replies, or None if this user has no daemon listening
+    """
+    token = read_daemon_token(port)
+    if token is None:
+        return None
+    try:
+        sock = socket.create_connection((DAEMON_HOST, port), timeout=timeout)
+    except OSError:
+        return None
+    sock.settimeout(None)  # Recording lasts as long as the user speaks
+    stream = sock.makefile("rwb")
+    stream.write((json.dumps({**message, "token": token}) + "\n").encode("utf-8"))
+    stream.flush()
+    return sock, stream
+
+def dictate_via_daemon(args):
+    """
+    Have the daemon record and transcribe.
+
+    Returns:
+        Transcribed text, or None if no daemon is running
+    """
+    connection = daemon_request(args.port, {"cmd": "dictate", **request_options(args)})
+    if connection is None:
+        return None
+    sock, stream = connection
+
+    def send(message):
+        stream.write((json.dumps(message) + "\n").encode("utf-8"))
+        stream.flush()
+
+    try:
+        while True:
+            line = stream.readline()
+            if not line:
+                print_error("Dictation daemon closed the connection")
+                sys.exit(1)
+            reply = json.loads(line)
+
+            if reply.get("event") == "recording":
+                print_info("🎤 Recording... (Press Ctrl+C to stop)")
+                print()
+                if not args.duration or args.long:
+                    print("  Recording in progress...")
+                    print("  Press Enter when done speaking")
+                    input()
+                    send({"cmd": "stop"})
+            elif reply.get("event") == "segment":
+                emit_segment(reply["text"], args.output)
+            elif reply.get("event") == "transcribing":
+                print_success("Recording complete!")
+                print()
+                print_info(f"🤖 Transcribing with Whisper ({args.model} model, resident in daemon)...")
+            elif "error" in reply:
+                print_error(reply["error"])
+                sys.exit(1)
+            else:
+                warn_dropped(reply.get("dropped_s", 0))
+                return reply["text"]
+
+    except KeyboardInterrupt:
+        send({"cmd": "cancel"})
+        print()
+        print_error("Recording cancelled")
+        sys.exit(1)
+    finally:
+        stream.close()
+        sock.close()
+
+def emit_segment(text, output=None):
+    """Show a long-form segment as soon as it is transcribed, appending to output"""
+    print(f"  {text}")
+    if output:
+        with open(output, "a", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+def warn_dropped(dropped_s):
+    """Report audio a long-form dictation discarded because transcription fell behind"""
+    if dropped_s:
+        print_error(f"{dropped_s:.0f}s of audio was dropped - transcription fell behind; try a smaller model")
+
+def dictate_long_locally(args):
+    """Long-form dictation in this process; returns the full text."""
+    stt = load_backend(args.model, args.backend, args.threads, args.compute_type, args.prompt)
+    dictation = LongFormDictation(stt, max_segment_s=args.max_segment,
+                                  on_text=lambda text: emit_segment(text, args.output),
+                                  archive_path=args.save_audio, trim=not args.no_trim)
+    dictation.start()
+
+    print_info("🎤 Recording... (Press Ctrl+C to stop)")
+    print()
+    print("  Recording in progress - text appears as you pause")
+    print("  Press Enter when done speaking")
+    print()
+    try:
+        record_until(input, on_block=dictation.feed)
+    except KeyboardInterrupt:
+        print()
+        print_error("Recording cancelled")
+        sys.exit(1)
+
+    print_success("Recording complete!")
+    print_info("🤖 Finishing the last segment...")
+    try:
+        text = dictation.finish()
+    except Exception as e:
+        print_error(f"Transcription failed: {e}")
+        sys.exit(1)
+    if not dictation.heard_audio:
+        print_error("No audio detected - microphone might be muted")
+        sys.exit(1)
+    warn_dropped(dictation.dropped_s)
+    return text
+
+def stop_daemon(port):
+    connection = daemon_request(port, {"cmd": "shutdown"})
+    if connection is None:
+        print_error(f"No dictation daemon on port {port}")
+        sys.exit(1)
+    sock, stream = connection
+    reply = json.loads(stream.readline() or "{}")
+    sock.close()
+    if "error" in reply:
+        print_error(reply["error"])
+        sys.exit(1)
+    print_success("Dictation daemon stopped")
+
+def run_benchmark(args):
+    """Time each model and thread count on this machine and cache the best fit."""
+    config = stt_autotune.TuneConfig(backend=args.backend, compute_type=args.compute_type)
+    if args.threads:
+        config.threads = [args.threads]
+    print_info(f"⏱️  Benchmarking {', '.join(config.models)} on {config.threads} threads ({args.backend})...")
+    print_info("Models not yet downloaded are fetched on first load")
+    profile = stt_autotune.benchmark(
+        config,
+        on_result=lambda m: print(f"  {m.model} x {m.threads}: load {m.load_s:.1f}s, "
+                                  f"dictation {m.latency_ms['dictation']:.0f} ms"),
+    )
+    stt_autotune.save_profile(profile)
+    print()
+    print(stt_autotune.format_profile(profile))
+    print()
+    print_success(f"Profile saved to {stt_autotune.DEFAULT_PROFILE_PATH}")
+
 def main():
     parser = argparse.ArgumentParser(
         description="Real-time dictation using Whisper AI"
@@ -132,70 +779,186 @@ def main():
     parser.add_argument(
         "-m", "--model",
         type=str,
-        default="small",
-        choices=["tiny", "base", "small", "medium", "large"],
-        help="Whisper model to use (default: small)"
+        default="auto",
+        choices=["auto", "tiny", "base", "small", "medium", "large"],
+        help="Whisper model to use; auto picks from the --benchmark profile, else small (default: auto)"
+    )
+    parser.add_argument(
+        "-b", "--backend",
+        type=str,
+        default="whisper",
+        choices=["whisper", "faster-whisper", "auto"],
+        help="STT backend; faster-whisper runs int8 on CPU (default: whisper)"
+    )
+    parser.add_argument(
+        "-t", "--threads",
+        type=int,
+        default=0,
+        help="CPU threads for inference (default: from the --benchmark profile, else engine default)"
+    )
+    parser.add_argument(
+        "--compute-type",
+        type=str,
+        default="int8",
+        choices=["int8", "int8_float32", "float32"],
+        help="faster-whisper compute type (default: int8)"
+    )
+    parser.add_argument(
+        "-p", "--prompt",
+        type=str,
+        default=None,
+        help="Vocabulary prompt to bias spelling, e.g. \"GPNet, Preventli, WorkSafe\""
     )
     parser.add_argument(
         "--no-clipboard",
         action="store_true",
         help="Don't copy to clipboard"
     )
+    parser.add_argument(
+        "--no-trim",
+        action="store_true",
+        help="Transcribe the recording as is, without cutting silence and long pauses"
+    )
+    parser.add_argument(
+        "--save-audio",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Also archive the recording as a 16-bit WAV file (via the daemon: only under its --save-audio-dir)"
+    )
+    parser.add_argument(
+        "-l", "--long",
+        action="store_true",
+        help="Long-form: transcribe segments in the background while recording (manual stop)"
+    )
+    parser.add_argument(
+        "--max-segment",
+        type=int,
+        default=30,
+        help="Long-form: cut segments without a pause at this many seconds (default: 30)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        type=str,
+        default=None,
+        help="Long-form: append each segment's text to this file as it is transcribed"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Benchmark models and thread counts on this machine, cache the best fit for -m auto, and exit"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run the resident dictation daemon (keeps the model loaded)"
+    )
+    parser.add_argument(
+        "--stop-daemon",
+        action="store_true",
+        help="Stop a running dictation daemon"
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Load the model in this process even if a daemon is running"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DAEMON_PORT,
+        help=f"Dictation daemon port on localhost (default: {DAEMON_PORT})"
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=int,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=f"Daemon: unload models unused for this many seconds (default: {DEFAULT_IDLE_TIMEOUT})"
+    )
+    parser.add_argument(
+        "--save-audio-dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Daemon: allow clients' --save-audio only under this directory (default: refuse)"
+    )
 
     args = parser.parse_args()
 
+    if args.benchmark:
+        run_benchmark(args)
+        return
+    if args.model == "auto":
+        args.model, tuned_threads = stt_autotune.resolve_model("dictation", "small", args.backend)
+        args.threads = args.threads or tuned_threads
+
+    if args.daemon:
+        run_daemon(args)
+        return
+    if args.stop_daemon:
+        stop_daemon(args.port)
+        return
+
     print()
     print("=" * 50)
     print("  WHISPER DICTATION")
     print("=" * 50)
     print()
 
-    # Create temp file for audio
-    temp_file = tempfile.NamedTemporaryFile(
-        suffix=".wav",
-        delete=False
-    )
-    temp_filepath = temp_file.name
-    temp_file.close()
-
-    try:
-        # Record audio
-        audio, sample_rate = record_audio(duration=args.duration)
-        print_success("Recording complete!")
+    # A resident daemon records and transcribes without loading anything here
+    if not args.no_daemon:
+        text = dictate_via_daemon(args)
+        if text is not None:
+            show_transcription(text)
+            if not args.no_clipboard:
+                copy_to_clipboard(text)
+            print_success("Done!")
+            print()
+            return
+
+    if args.long:
+        text = dictate_long_locally(args)
+        show_transcription(text)
+        if not args.no_clipboard:
+            copy_to_clipboard(text)
+        print_success("Done!")
         print()
+        return
 
-        # Check if audio is silent
-        if np.max(np.abs(audio)) < 0.01:
-            print_error("No audio detected - microphone might be muted")
-            sys.exit(1)
-
-        # Save audio
-        save_audio(audio, sample_rate, temp_filepath)
+    # Record audio
+    audio, sample_rate = record_audio(duration=args.duration)
+    print_success("Recording complete!")
+    print()
 
-        # Transcribe
-        text = transcribe_audio(temp_filepath, args.model)
+    # Check if audio is silent
+    if audio.size == 0 or np.max(np.abs(audio)) < 0.01:
+        print_error("No audio detected - microphone might be muted")
+        sys.exit(1)
 
-        print()
-        print("=" * 50)
-        print("  TRANSCRIPTION")
-        print("=" * 50)
-        print()
-        print(text)
-        print()
-        print("=" * 50)
-        print()
+    # Archive audio (transcription works on the in-memory recording)
+    if args.save_audio:
+        save_audio(audio, sample_rate, args.save_audio)
+        print_info(f"Saved recording to {args.save_audio}")
+
+    # Transcribe
+    text = transcribe_audio(
+        audio,
+        args.model,
+        backend=args.backend,
+        threads=args.threads,
+        compute_type=args.compute_type,
+        prompt=args.prompt,
+        trim=not args.no_trim,
+    )
 
-        # Copy to clipboard
-        if not args.no_clipboard:
-            copy_to_clipboard(text)
+    show_transcription(text)
 
-        print_success("Done!")
-        print()
+    # Copy to clipboard
+    if not args.no_clipboard:
+        copy_to_clipboard(text)
 
-    finally:
-        # Cleanup temp file
-        if os.path.exists(temp_filepath):
-            os.remove(temp_filepath)
+    print_success("Done!")
+    print()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,521 @@
+"""
+Batch transcription of audio and video files using local Whisper AI.
+Transcribes whole directories or globs into transcripts/, in parallel.
+
+Files are decoded to 16 kHz mono by a pool of ffmpeg processes, long
+recordings are cut into shards at the quietest point near each shard
+boundary, and shards are transcribed by a process pool with one resident
+model per worker. Each finished shard is appended to a manifest, so an
+interrupted run picks up where it stopped; each file's transcript is
+written as soon as its last shard is done.
+
+Usage:
+    python transcribe_batch.py recordings/ "demos/*.mp4" --model small
+"""
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+
+# Share the STT backends with Voice V10 (workers import them too)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "voice-integration", "voice_core"))
+
+SAMPLE_RATE = 16000
+MEDIA_EXTENSIONS = {
+    ".wav", ".mp3", ".m4a", ".aac", ".flac", ".ogg", ".opus", ".wma",
+    ".mp4", ".mkv", ".mov", ".avi", ".webm", ".m4v",
+}
+MANIFEST_NAME = ".batch-manifest.jsonl"
+
+def print_info(msg):
+    """Print info message"""
+    print(f"\033[96m{msg}\033[0m")
+
+def print_success(msg):
+    """Print success message"""
+    print(f"\033[92m✓ {msg}\033[0m")
+
+def print_error(msg):
+    """Print error message"""
+    print(f"\033[91m✗ {msg}\033[0m", file=sys.stderr)
+
+# ----------------------------------------------------------------------
+# Discovery and decoding
+# ----------------------------------------------------------------------
+
+def find_media(inputs):
+    """
+    Expand files, directories (recursively) and globs into media files.
+
+    Returns:
+        Sorted list of absolute paths, without duplicates
+    """
+    found = set()
+    for item in inputs:
+        paths = glob.glob(item, recursive=True) if glob.has_magic(item) else [item]
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, names in os.walk(path):
+                    for name in names:
+                        if os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS:
+                            found.add(os.path.abspath(os.path.join(root, name)))
+            elif os.path.isfile(path):
+                found.add(os.path.abspath(path))
+    return sorted(found)
+
+def decode_audio_file(path, sample_rate=SAMPLE_RATE):
+    """
+    Decode any audio or video file to mono int16 at sample_rate with ffmpeg.
+
+    Returns:
+        numpy int16 array
+    """
+    result = subprocess.run(
+        ["ffmpeg", "-nostdin", "-v", "error", "-i", path,
+         "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-"],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip() or "ffmpeg failed")
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+def frame_energy(audio, frame, chunk_frames=4096):
+    """Mean power of each frame, computed in chunks to bound temporaries"""
+    n = len(audio) // frame
+    energy = np.empty(n, dtype=np.float32)
+    for i in range(0, n, chunk_frames):
+        block = audio[i * frame:min(n, i + chunk_frames) * frame].astype(np.float32)
+        block = block.reshape(-1, frame)
+        energy[i:i + len(block)] = np.einsum("ij,ij->i", block, block) / frame
+    return energy
+
+def silence_shards(audio, shard_s=600, search_s=30, sample_rate=SAMPLE_RATE, frame_ms=50):
+    """
+    Split a recording into shards of about shard_s, cutting at the quietest
+    point within search_s of each boundary so no word is split.
+
+    Returns:
+        List of (start, end) sample offsets covering the whole recording
+    """
+    frame = sample_rate * frame_ms // 1000
+    shard = int(shard_s * sample_rate)
+    if len(audio) <= shard * 1.25:  # Don't leave a sliver of a last shard
+        return [(0, len(audio))]
+
+    energy = frame_energy(audio, frame)
+    search = int(search_s * 1000 / frame_ms)
+    cuts = [0]
+    while len(audio) - cuts[-1] > shard * 1.25:
+        center = (cuts[-1] + shard) // frame
+        lo = max(cuts[-1] // frame + 1, center - search)
+        hi = min(len(energy), center + search)
+        window = energy[lo:hi]
+        # Of the (near-)silent frames, cut at the one closest to the target
+        quiet = np.flatnonzero(window <= window.min() * 2 + 1.0) + lo
+        cut = int(quiet[np.argmin(np.abs(quiet - center))])
+        cuts.append(cut * frame + frame // 2)
+    cuts.append(len(audio))
+    return list(zip(cuts[:-1], cuts[1:]))
+
+# ----------------------------------------------------------------------
+# Transcription workers (one model per process)
+# ----------------------------------------------------------------------
+
+_worker_stt = None
+
+def _init_worker(config):
+    global _worker_stt
+    from stt_backend import create_stt_backend
+
+    _worker_stt = create_stt_backend(config)
+
+def _transcribe_shard(audio, language):
+    """Worker: int16 shard -> (text, detected language)"""
+    result = _worker_stt.transcribe(audio.astype(np.float32) / 32768.0, language=language)
+    return result.text.strip(), result.language
+
+# ----------------------------------------------------------------------
+# Resume manifest
+# ----------------------------------------------------------------------
+
+class Manifest:
+    """
+    Append-only JSONL record of finished shards and files.
+
+    A shard only counts on resume if the source file is unchanged (size and
+    mtime) and the shard boundaries match, so changing --shard-s or editing
+    a recording re-transcribes it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._shards = {}   # source -> {(start, end): record}
+        self._done = {}     # source -> record
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line from an interrupted run
+                    if record.get("done"):
+                        self._done[record["source"]] = record
+                    elif "shard" in record:
+                        span = (record["start"], record["end"])
+                        self._shards.setdefault(record["source"], {})[span] = record
+        self._file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _current(record, job):
+        return record["size"] == job.size and record["mtime"] == job.mtime
+
+    def is_done(self, job):
+        record = self._done.get(job.source)
+        return record is not None and self._current(record, job) and os.path.exists(record["output"])
+
+    def finished_shards(self, job):
+        """Previously transcribed shards of this job: {(start, end): record}"""
+        return {span: record for span, record in self._shards.get(job.source, {}).items()
+                if self._current(record, job)}
+
+    def record(self, job, **fields):
+        record = {"source": job.source, "size": job.size, "mtime": job.mtime, **fields}
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+# ----------------------------------------------------------------------
+# Batch run
+# ----------------------------------------------------------------------
+
+@dataclass
+class FileJob:
+    """One input file on its way through decode -> shards -> transcript"""
+    source: str
+    output: str
+    size: int
+    mtime: float
+    duration_s: float = 0.0
+    shards: list = field(default_factory=list)   # (start, end) samples
+    texts: dict = field(default_factory=dict)    # shard index -> text
+    language: str = None
+
+    @property
+    def complete(self):
+        return len(self.texts) == len(self.shards)
+
+@dataclass
+class BatchStats:
+    """Counters for a batch run"""
+    files: int = 0
+    skipped: int = 0
+    failed: int = 0
+    shards: int = 0
+    audio_s: float = 0.0     # Audio transcribed in this run
+    start: float = field(default_factory=time.monotonic)
+
+    @property
+    def wall_s(self):
+        return time.monotonic() - self.start
+
+    @property
+    def speedup(self):
+        """Audio-hours transcribed per wall-clock hour"""
+        return self.audio_s / self.wall_s if self.wall_s > 0 else 0.0
+
+    def summary(self):
+        return (
+            f"{self.files} files ({self.shards} shards) transcribed, {self.skipped} already done, "
+            f"{self.failed} failed; {self.audio_s / 3600:.2f} audio-hours in {self.wall_s / 3600:.2f} "
+            f"wall-hours = {self.speedup:.1f} audio-hours per wall-hour"
+        )
+
+def plan_jobs(files, output_dir):
+    """FileJobs with unique output names (same-named inputs get a path hash)"""
+    stems = {}
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        stems.setdefault(stem, []).append(path)
+
+    jobs = []
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if len(stems[stem]) > 1:
+            stem += "-" + hashlib.sha1(path.encode("utf-8")).hexdigest()[:6]
+        stat = os.stat(path)
+        jobs.append(FileJob(path, os.path.join(output_dir, stem + ".txt"), stat.st_size, stat.st_mtime))
+    return jobs
+
+def format_timestamp(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def write_transcript(job, model):
+    """Write a finished file's transcript (same layout as transcribe-video.ps1)"""
+    paragraphs = []
+    for i, (start, _) in enumerate(job.shards):
+        if job.texts[i]:
+            paragraphs.append(f"[{format_timestamp(start / SAMPLE_RATE)}] {job.texts[i]}")
+
+    content = (
+        f"# Transcript: {os.path.splitext(os.path.basename(job.source))[0]}\n\n"
+        f"**Source:** {job.source}\n"
+        f"**Duration:** {job.duration_s / 60:.1f} minutes\n"
+        f"**Transcribed:** {datetime.now():%Y-%m-%d %H:%M}\n"
+        f"**Model:** {model}\n"
+        f"**Language:** {job.language or ''}\n\n"
+        f"---\n\n"
+        + "\n\n".join(paragraphs)
+        + "\n\n---\n"
+    )
+    tmp = job.output + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, job.output)
+
+def run_batch(jobs, config, args):
+    """
+    Transcribe jobs, resuming from the manifest in the output directory.
+
+    Decoding runs ahead of transcription only as far as needed to keep
+    every worker busy, so memory holds a few files' audio at most.
+
+    Returns:
+        BatchStats for this run
+    """
+    stats = BatchStats()
+    manifest = Manifest(os.path.join(args.output_dir, MANIFEST_NAME))
+
+    pending = deque()
+    for job in jobs:
+        if manifest.is_done(job):
+            stats.skipped += 1
+        else:
+            pending.append(job)
+
+    decoding = {}      # future -> FileJob
+    transcribing = {}  # future -> (FileJob, shard index)
+    ready = deque()    # (FileJob, shard index, int16 audio) awaiting a worker
+    backlog = args.workers * 2
+    last_report = time.monotonic()
+
+    def finish(job):
+        write_transcript(job, args.model)
+        manifest.record(job, done=True, output=job.output)
+        stats.files += 1
+        print_success(f"{os.path.basename(job.source)} -> {job.output}")
+
+    def refill():
+        while pending and len(decoding) < args.decoders and len(ready) + len(decoding) < backlog:
+            job = pending.popleft()
+            decoding[decode_pool.submit(decode_audio_file, job.source)] = job
+        while ready and len(transcribing) < backlog:
+            job, index, audio = ready.popleft()
+            transcribing[workers.submit(_transcribe_shard, audio, args.language or job.language)] = (job, index)
+
+    def decoded(job, future):
+        try:
+            audio = future.result()
+        except Exception as e:
+            stats.failed += 1
+            print_error(f"{os.path.basename(job.source)}: {e}")
+            return
+        job.duration_s = len(audio) / SAMPLE_RATE
+        job.shards = silence_shards(audio, args.shard_s)
+        finished = manifest.finished_shards(job)
+        for index, span in enumerate(job.shards):
+            if span in finished:
+                job.texts[index] = finished[span]["text"]
+                job.language = job.language or finished[span].get("language")
+            else:
+                ready.append((job, index, audio[span[0]:span[1]]))
+        if job.complete:
+            finish(job)
+
+    def transcribed(job, index, future):
+        try:
+            text, language = future.result()
+        except Exception as e:
+            stats.failed += 1
+            print_error(f"{os.path.basename(job.source)} shard {index + 1}: {e}")
+            return
+        start, end = job.shards[index]
+        job.texts[index] = text
+        job.language = job.language or language
+        manifest.record(job, shard=index, start=start, end=end, text=text, language=language)
+        stats.shards += 1
+        stats.audio_s += (end - start) / SAMPLE_RATE
+        if job.complete:
+            finish(job)
+
+    ctx = mp.get_context("spawn")  # Fresh interpreters on every platform; each loads its own model
+    with ThreadPoolExecutor(args.decoders, thread_name_prefix="decode") as decode_pool, \
+            ProcessPoolExecutor(args.workers, mp_context=ctx, initializer=_init_worker,
+                                initargs=(config,)) as workers:
+        try:
+            refill()
+            while decoding or transcribing:
+                done, _ = wait(list(decoding) + list(transcribing), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in decoding:
+                        decoded(decoding.pop(future), future)
+                    else:
+                        transcribed(*transcribing.pop(future), future)
+                refill()
+
+                if time.monotonic() - last_report >= args.report_s:
+                    last_report = time.monotonic()
+                    print_info(f"  {stats.audio_s / 3600:.2f} audio-hours so far, {stats.speedup:.1f}x real time")
+        except KeyboardInterrupt:
+            # Drop queued work; finished shards are already in the manifest
+            decode_pool.shutdown(wait=False, cancel_futures=True)
+            workers.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            manifest.close()
+    return stats
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(
+        description="Batch-transcribe audio and video files with Whisper AI"
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Files, directories (searched recursively) or globs"
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=str,
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcripts"),
+        help="Where transcripts and the resume manifest go (default: transcripts/)"
+    )
+    parser.add_argument(
+        "-m", "--model",
+        type=str,
+        default="small",
+        choices=["tiny", "base", "small", "medium", "large"],
+        help="Whisper model to use (default: small)"
+    )
+    parser.add_argument(
+        "-b", "--backend",
+        type=str,
+        default="auto",
+        choices=["whisper", "faster-whisper", "auto"],
+        help="STT backend (default: auto)"
+    )
+    parser.add_argument(
+        "--compute-type",
+        type=str,
+        default="int8",
+        choices=["int8", "int8_float32", "float32"],
+        help="faster-whisper compute type (default: int8)"
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=max(1, cores // 4),
+        help="Transcription processes, one model each (default: cores / 4)"
+    )
+    parser.add_argument(
+        "-t", "--threads",
+        type=int,
+        default=0,
+        help="Inference threads per worker (default: cores / workers)"
+    )
+    parser.add_argument(
+        "--decoders",
+        type=int,
+        default=min(4, cores),
+        help="Parallel ffmpeg decodes (default: min(4, cores))"
+    )
+    parser.add_argument(
+        "--shard-s",
+        type=float,
+        default=600,
+        help="Target shard length in seconds; cuts land on silence (default: 600)"
+    )
+    parser.add_argument(
+        "-l", "--language",
+        type=str,
+        default=None,
+        help="Language code (default: detect per file)"
+    )
+    parser.add_argument(
+        "-p", "--prompt",
+        type=str,
+        default=None,
+        help="Vocabulary prompt to bias spelling, e.g. \"GPNet, Preventli, WorkSafe\""
+    )
+    parser.add_argument(
+        "--report-s",
+        type=float,
+        default=60,
+        help="Seconds between throughput reports (default: 60)"
+    )
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        print_error("ffmpeg not found")
+        print("   Install: winget install ffmpeg")
+        sys.exit(1)
+
+    from stt_backend import STTConfig
+
+    config = STTConfig(
+        backend=args.backend,
+        model=args.model,
+        language=args.language,
+        threads=args.threads or max(1, cores // args.workers),
+        compute_type=args.compute_type,
+        initial_prompt=args.prompt,
+    )
+
+    files = find_media(args.inputs)
+    if not files:
+        print_error("No audio or video files found")
+        sys.exit(1)
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = plan_jobs(files, args.output_dir)
+
+    print()
+    print("=" * 50)
+    print("  WHISPER BATCH TRANSCRIPTION")
+    print("=" * 50)
+    print()
+    print_info(f"{len(jobs)} files, {args.workers} workers x {config.threads} threads "
+               f"({args.model}, {args.backend}), {args.decoders} decoders")
+    print()
+
+    try:
+        stats = run_batch(jobs, config, args)
+    except KeyboardInterrupt:
+        print()
+        print_error("Interrupted - run again to resume")
+        sys.exit(1)
+
+    print()
+    print("=" * 50)
+    print(f"  {stats.summary()}")
+    print("=" * 50)
+    print()
+    if stats.failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
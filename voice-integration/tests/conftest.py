@@ -0,0 +1,15 @@
+"""
+Shared setup for the Voice V10 tests.
+
+The voice_core modules import each other by bare name (they are also run
+as scripts), so the package directory goes on sys.path, along with the
+repository root for the standalone scripts that share them
+(transcribe_batch.py).
+"""
+
+import os
+import sys
+
+_INTEGRATION = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(_INTEGRATION))
+sys.path.insert(0, os.path.join(_INTEGRATION, "voice_core"))
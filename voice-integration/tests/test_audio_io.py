@@ -0,0 +1,52 @@
+"""Persistent output stream: clip playback driven through the callback."""
+
+import time
+import types
+
+import numpy as np
+
+from audio_io import AudioOutput
+
+
+def run_block(output, frames, latency=0.0):
+    outdata = np.zeros((frames, 1), dtype=np.int16)
+    now = time.monotonic()
+    output._callback(outdata, frames, types.SimpleNamespace(currentTime=now, outputBufferDacTime=now + latency), None)
+    return outdata
+
+
+def test_on_start_fires_once_with_output_latency():
+    output = AudioOutput(sample_rate=16000)
+    starts = []
+    done = output.play(np.full(800, 1000, dtype=np.int16), 16000, on_start=starts.append)
+
+    before = time.monotonic()
+    first = run_block(output, 320, latency=0.05)
+    run_block(output, 320, latency=0.05)
+    last = run_block(output, 320, latency=0.05)
+
+    assert len(starts) == 1
+    assert starts[0] >= before + 0.05
+    assert first[:, 0].tolist() == [1000] * 320
+    assert last[:160, 0].tolist() == [1000] * 160 and not last[160:].any()
+    assert done.is_set()
+
+
+def test_on_start_not_called_for_a_clip_stopped_before_playing():
+    output = AudioOutput(sample_rate=16000)
+    starts = []
+    output.play(np.ones(320, dtype=np.int16), 16000, on_start=starts.append)
+    assert output.stop() == 0
+
+    assert not run_block(output, 320).any()
+    assert starts == []
+
+
+def test_on_block_reports_reference_samples():
+    blocks = []
+    output = AudioOutput(sample_rate=16000, on_block=lambda chunk, rate, at: blocks.append((len(chunk), rate)))
+    output.play(np.ones(500, dtype=np.int16), 16000)
+    run_block(output, 320)
+    run_block(output, 320)
+    run_block(output, 320)
+    assert blocks == [(320, 16000), (180, 16000)]
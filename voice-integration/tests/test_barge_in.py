@@ -0,0 +1,98 @@
+"""Barge-in: echo fit and subtraction, and how fast near-end speech triggers."""
+
+import numpy as np
+import pytest
+
+from barge_in import BargeInConfig, BargeInDetector
+
+SR = 16000
+FRAME = SR // 50  # 20 ms
+START = 1000.0    # Playback start, in detector (monotonic) time
+
+
+def playback(seconds=3.0):
+    """Amplitude-modulated tone, so the echo level varies and the delay can be fitted."""
+    t = np.arange(int(seconds * SR)) / SR
+    return (np.sin(2 * np.pi * 220 * t) * (0.3 + 0.2 * np.sin(2 * np.pi * 4 * t))).astype(np.float32)
+
+
+def echo_of(reference, delay_ms, coupling):
+    delay = SR * delay_ms // 1000
+    return coupling * np.concatenate([np.zeros(delay, dtype=np.float32), reference[:-delay]])
+
+
+def speech(n, level=0.1):
+    return np.random.default_rng(0).normal(0, level, n).astype(np.float32)
+
+
+def feed(detector, mic, block=FRAME):
+    """Capture blocks timestamped like the callback; returns the frame index that fired, or None."""
+    for i in range(0, len(mic), block):
+        if detector.process(mic[i:i + block], timestamp=START + (i + block) / SR):
+            return (i + block) // FRAME
+    return None
+
+
+def armed(reference, **config):
+    fired = []
+    detector = BargeInDetector(BargeInConfig(sample_rate=SR, **config), on_barge_in=lambda: fired.append(True))
+    detector.arm()
+    detector.push_reference(reference, SR, start_time=START)
+    return detector, fired
+
+
+@pytest.mark.parametrize("delay_ms, coupling", [(60, 0.8), (120, 1.5), (20, 0.3)])
+def test_echo_alone_never_triggers(delay_ms, coupling):
+    reference = playback()
+    detector, fired = armed(reference)
+    assert feed(detector, echo_of(reference, delay_ms, coupling)) is None
+    assert fired == []
+    assert detector.stats.echo_delay_ms == pytest.approx(delay_ms, abs=10)
+    assert detector.stats.echo_coupling == pytest.approx(coupling, rel=0.15)
+
+
+@pytest.mark.parametrize("block", [FRAME, 5 * FRAME])
+def test_near_end_speech_over_echo_triggers_within_min_frames(block):
+    reference = playback()
+    detector, fired = armed(reference, min_frames=2)
+    mic = echo_of(reference, 60, 0.8)
+    onset = SR  # Speech starts 1 s in, after calibration
+    mic[onset:] += speech(len(mic) - onset)
+
+    frame = feed(detector, mic, block)
+    assert fired == [True]
+    assert detector.stats.last_reaction_ms == pytest.approx(40)  # Two 20 ms frames from the onset
+    if block == FRAME:
+        assert frame == onset // FRAME + 2  # Fires on the second speech frame's callback
+
+
+def test_calibration_frames_never_trigger():
+    reference = playback()
+    detector, fired = armed(reference, calibration_ms=240)
+    mic = echo_of(reference, 60, 0.8) + speech(len(reference), level=0.3)
+    assert feed(detector, mic[:SR * 240 // 1000]) is None
+    assert fired == []
+
+
+def test_without_a_reference_threshold_is_raised():
+    detector, fired = armed(np.zeros(0, dtype=np.float32), threshold=0.03, no_reference_factor=3.0)
+    assert feed(detector, speech(SR, level=0.06)) is None    # Above threshold, below 3x
+    assert feed(detector, speech(SR, level=0.2)) is not None
+    assert fired == [True]
+
+
+def test_fires_once_per_arm_and_not_while_disarmed():
+    reference = playback()
+    detector, fired = armed(reference)
+    mic = echo_of(reference, 60, 0.8)
+    mic[SR:] += speech(len(mic) - SR)
+    feed(detector, mic)
+    feed(detector, mic)
+    assert fired == [True]
+
+    detector.disarm()
+    assert not detector.process(speech(FRAME, level=0.5))
+    detector.arm()
+    detector.push_reference(reference, SR, start_time=START)
+    assert feed(detector, mic) is not None
+    assert detector.stats.triggers == 2
@@ -0,0 +1,92 @@
+"""Shared-memory capture ring: read order across the wrap, overrun skip and counters."""
+
+import numpy as np
+import pytest
+
+from capture_process import _CALLBACKS, _OVERFLOWS, CaptureConfig, CaptureProcess, _write_ring
+
+BLOCK = 320  # 20 ms at 16 kHz
+
+
+@pytest.fixture
+def capture():
+    """A ring of 5 blocks, written in-process the way the capture callback does."""
+    capture = CaptureProcess(CaptureConfig(block_ms=20, buffer_s=0.1))
+    capture._allocate()
+    yield capture
+    capture.close()
+
+
+def write(capture, start, frames):
+    """Write frames numbered start, start+1, ... so read order can be checked."""
+    samples = (np.arange(start, start + frames) % 32768).astype(np.int16).reshape(-1, 1)
+    _write_ring(capture._header, capture._ring, samples)
+    return start + frames
+
+
+def numbers(blocks):
+    return np.concatenate([block[:, 0] for block in blocks]).tolist() if blocks else []
+
+
+def test_reads_whole_blocks_in_order_across_the_wrap(capture):
+    assert capture._capacity == 5 * BLOCK
+    n = 0
+    seen = []
+    for _ in range(4):                  # 12 blocks through a 5-block ring
+        n = write(capture, n, 3 * BLOCK)
+        blocks = capture.read()
+        assert all(block.shape == (BLOCK, 1) for block in blocks)
+        seen += numbers(blocks)
+    assert seen == list(range(12 * BLOCK))
+    assert capture._header[_CALLBACKS] == 4
+    assert capture.stats.frames == 12 * BLOCK and capture.stats.dropped_frames == 0
+
+
+def test_partial_and_odd_sized_writes(capture):
+    n = write(capture, 0, BLOCK + 100)
+    assert numbers(capture.read()) == list(range(BLOCK))   # The partial block waits
+    seen = []
+    for frames in [700, 900, 700, 450]:                       # Odd sizes wrap mid-block
+        n = write(capture, n, frames)
+        seen += numbers(capture.read())
+    assert seen == list(range(BLOCK, (n // BLOCK) * BLOCK))
+    assert capture.stats.dropped_frames == 0
+
+
+def test_overrun_skips_to_half_a_ring_behind_and_counts_drops(capture):
+    n = write(capture, 0, 2 * BLOCK)
+    assert len(capture.read()) == 2
+
+    n = write(capture, n, 5 * BLOCK)    # Reader is now 5 blocks behind: the oldest were overwritten
+    blocks = capture.read()
+    assert numbers(blocks) == list(range(n - 2 * BLOCK, n))
+    assert capture.stats.dropped_frames == 3 * BLOCK
+    assert capture.stats.frames == 4 * BLOCK
+
+    n = write(capture, n, BLOCK)        # Back in step
+    assert numbers(capture.read()) == list(range(n - BLOCK, n))
+    assert capture.stats.dropped_frames == 3 * BLOCK
+
+
+def test_overrun_after_odd_sizes_reads_a_block_straddling_the_end(capture):
+    n = write(capture, 0, BLOCK + 100)
+    capture.read()
+    n = write(capture, n, 5 * BLOCK)    # Skips to an unaligned position in the last block
+    blocks = capture.read()
+    assert numbers(blocks) == list(range(n - 2 * BLOCK, n))
+    assert capture.stats.dropped_frames == 3 * BLOCK + 100
+
+
+def test_four_blocks_behind_is_not_an_overrun(capture):
+    write(capture, 0, 4 * BLOCK)        # capacity - one block: the writer's block is untouched
+    assert len(capture.read()) == 4
+    assert capture.stats.dropped_frames == 0
+
+
+def test_counters_survive_close(capture):
+    write(capture, 0, 2 * BLOCK)
+    capture._header[_OVERFLOWS] = 3
+    capture.read()
+    capture.close()
+    assert capture.read() == []
+    assert (capture.stats.frames, capture.stats.input_overflows) == (2 * BLOCK, 3)
@@ -0,0 +1,111 @@
+"""Event bus: per-subscriber queues, drop policies, join and clear."""
+
+import asyncio
+
+import pytest
+
+from event_bus import DropPolicy, EventBus
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def publish_all(bus, events, kind="event"):
+    for event in events:
+        await bus.publish(kind, event)
+
+
+@pytest.mark.parametrize("policy, expected, dropped", [
+    (DropPolicy.DROP_OLDEST, [4, 5], 3),
+    (DropPolicy.DROP_NEWEST, [1, 2], 3),
+    (DropPolicy.BLOCK, [1, 2, 3, 4, 5], 0),
+])
+def test_full_queue_policies(policy, expected, dropped):
+    async def scenario():
+        bus = EventBus()
+        seen = []
+        bus.subscribe("sink", seen.append, maxsize=2, policy=policy)
+        await publish_all(bus, [1, 2, 3, 4, 5])  # Handler hasn't run yet
+        await bus.join()
+        bus.close()
+        return seen, bus.subscriptions["sink"].stats
+
+    seen, stats = run(scenario())
+    assert seen == expected
+    assert stats.dropped == dropped
+    assert stats.delivered == len(expected)
+    assert stats.max_depth == 2
+
+
+def test_join_waits_for_async_handlers_and_kinds_filter():
+    async def scenario():
+        bus = EventBus()
+        spoken, logged = [], []
+
+        async def speak(event):
+            await asyncio.sleep(0.01)
+            spoken.append(event)
+
+        bus.subscribe("speech", speak, kinds={"text"})
+        bus.subscribe("log", logged.append)
+        await bus.publish("text", "hello")
+        await bus.publish("result", "done")
+        await bus.join("speech")
+        assert spoken == ["hello"]
+        await bus.join()
+        bus.close()
+        return logged
+
+    assert run(scenario()) == ["hello", "done"]
+
+
+def test_clear_discards_queued_events():
+    async def scenario():
+        bus = EventBus()
+        seen = []
+        bus.subscribe("speech", seen.append)
+        await publish_all(bus, ["stale", "stale"])
+        bus.clear("speech")
+        await bus.publish("event", "fresh")
+        await bus.join()
+        bus.close()
+        return seen, bus.subscriptions["speech"].stats.dropped
+
+    assert run(scenario()) == (["fresh"], 2)
+
+
+def test_failing_handler_is_counted_and_delivery_continues():
+    async def scenario():
+        bus = EventBus()
+        seen = []
+
+        def handler(event):
+            if event == "bad":
+                raise RuntimeError("boom")
+            seen.append(event)
+
+        bus.subscribe("sink", handler)
+        await publish_all(bus, ["bad", "good"])
+        await bus.join()
+        bus.close()
+        return seen, bus.snapshot()["sink"]
+
+    seen, snapshot = run(scenario())
+    assert seen == ["good"]
+    assert snapshot["errors"] == 1 and snapshot["delivered"] == 1
+
+
+def test_duplicate_subscriber_rejected_and_unsubscribe():
+    async def scenario():
+        bus = EventBus()
+        seen = []
+        bus.subscribe("sink", seen.append)
+        with pytest.raises(ValueError):
+            bus.subscribe("sink", seen.append)
+        bus.unsubscribe("sink")
+        await bus.publish("event", 1)
+        await bus.join()
+        return seen, bus.subscriptions
+
+    assert run(scenario()) == ([], {})
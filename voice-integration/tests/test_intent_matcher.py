@@ -0,0 +1,94 @@
+"""Local intent fast-path: matching against the built-in command table."""
+
+import asyncio
+
+import pytest
+
+from intent_matcher import BUILTIN_INTENTS, IntentMatcher, normalize, register_local_actions
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    matcher = IntentMatcher()
+    for name, (phrases, exact) in BUILTIN_INTENTS.items():
+        matcher.register(name, phrases, lambda text, name=name: name, exact=exact)
+    register_local_actions(matcher, str(tmp_path))
+    return matcher
+
+
+def intent(matcher, text):
+    match = matcher.match(text)
+    return match.intent.name if match else None
+
+
+def test_normalize_drops_punctuation_and_fillers():
+    assert normalize("Okay Claude, please STOP!") == "stop"
+    assert normalize("um, uh") == ""
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Please stop.", "cancel"),
+    ("Never mind", "cancel"),
+    ("Start a new conversation.", "reset"),
+    ("Goodbye!", "quit"),
+    ("Resume the last session", "resume"),
+    ("Git status?", "git_status"),
+    ("What branch am I on?", "git_branch"),
+    ("List the files", "list_directory"),
+])
+def test_exact_phrases(matcher, text, expected):
+    assert intent(matcher, text) == expected
+
+
+def test_fuzzy_tolerates_transcription_errors(matcher):
+    match = matcher.match("git statis")
+    assert match.intent.name == "git_status"
+    assert 0.9 <= match.score < 1.0
+    assert intent(matcher, "nevermin") == "cancel"
+
+
+@pytest.mark.parametrize("text", [
+    "show stats",
+    "show file",
+    "show the file",
+    "start a conversation",
+    "start conversations",
+    "reset the tests",
+    "resume upload",
+    "stop using tabs in config.ts",
+    "what changed in the parser",
+    "exit code",
+])
+def test_near_misses_go_to_claude(matcher, text):
+    assert matcher.match(text) is None
+
+
+def test_destructive_intents_never_fuzzy_match(matcher):
+    assert intent(matcher, "new conversation") == "reset"
+    assert intent(matcher, "new conversations") is None
+    assert intent(matcher, "quitt") is None
+    assert intent(matcher, "resumes") is None
+
+
+def test_register_replaces_and_unregister_removes(matcher):
+    matcher.register("cancel", ["halt"], lambda text: "halted")
+    assert intent(matcher, "stop") is None
+    assert intent(matcher, "halt") == "cancel"
+
+    matcher.unregister("cancel")
+    assert intent(matcher, "halt") is None
+    assert "cancel" not in [i.name for i in matcher.intents]
+
+
+def test_execute_runs_sync_async_and_blocking_handlers():
+    matcher = IntentMatcher()
+
+    async def greet(text):
+        return f"hi {text}"
+
+    matcher.register("sync", ["one"], lambda text: "sync")
+    matcher.register("async", ["two"], greet)
+    matcher.register("blocking", ["three"], lambda text: "thread", blocking=True)
+
+    results = [asyncio.run(matcher.execute(matcher.match(text))) for text in ["one", "two", "three"]]
+    assert results == ["sync", "hi two", "thread"]
@@ -0,0 +1,159 @@
+"""Offline TTS worker: one engine thread, queued phrases, stop and close."""
+
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+import offline_tts
+from offline_tts import OfflineTTSConfig, OfflineTTSWorker
+
+
+class FakeEngine:
+    """pyttsx3-style engine: each utterance finishes after a few iterate() calls."""
+
+    def __init__(self, iterations=3, hold=None):
+        self.iterations = iterations
+        self.hold = hold or set()    # Texts that only end when stopped
+        self.spoken = []
+        self.threads = set()
+        self.properties = {}
+        self.loop_ended = False
+        self._callback = None
+        self._current = None         # [name, text, iterations left, wav path]
+
+    def _called(self):
+        self.threads.add(threading.get_ident())
+
+    def setProperty(self, name, value):
+        self._called()
+        self.properties[name] = value
+
+    def connect(self, topic, callback):
+        self._callback = callback
+
+    def startLoop(self, use_driver_loop):
+        self._called()
+
+    def endLoop(self):
+        self._called()
+        self.loop_ended = True
+
+    def say(self, text, name):
+        self._called()
+        self._current = [name, text, self.iterations, None]
+
+    def save_to_file(self, text, path, name):
+        self._called()
+        self._current = [name, text, self.iterations, path]
+
+    def stop(self):
+        self._called()
+        if self._current:
+            name = self._current[0]
+            self._current = None
+            self._callback(name, False)
+
+    def iterate(self):
+        self._called()
+        if self._current is None or self._current[1] in self.hold:
+            return
+        self._current[2] -= 1
+        if self._current[2] > 0:
+            return
+        name, text, _, path = self._current
+        self._current = None
+        if path:
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(22050)
+                wav.writeframes(np.full(len(text), 7, dtype=np.int16).tobytes())
+        self.spoken.append(text)
+        self._callback(name, True)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = FakeEngine()
+    monkeypatch.setattr(offline_tts, "PYTTSX3_AVAILABLE", True)
+    monkeypatch.setattr(offline_tts, "pyttsx3", type("pyttsx3", (), {"init": staticmethod(lambda: engine)}),
+                        raising=False)
+    return engine
+
+
+@pytest.fixture
+def worker(engine):
+    worker = OfflineTTSWorker(OfflineTTSConfig(rate=180, poll_interval=0.001))
+    worker.start()
+    yield worker
+    worker.close()
+
+
+def wait_until_speaking(engine):
+    deadline = time.monotonic() + 2
+    while engine._current is None:
+        assert time.monotonic() < deadline, "engine never got the phrase"
+        time.sleep(0.001)
+
+
+def test_phrases_play_in_order_on_one_engine_thread(worker, engine):
+    futures = [worker.speak(text) for text in ["one", "two", "three"]]
+    assert [f.result(timeout=2) for f in futures] == [True, True, True]
+    assert engine.spoken == ["one", "two", "three"]
+    assert engine.properties["rate"] == 180
+    assert engine.threads == {worker._thread.ident}
+
+
+def test_render_returns_pcm_and_removes_the_file(worker):
+    samples, sample_rate = worker.render("hello").result(timeout=2)
+    assert sample_rate == 22050 and samples.dtype == np.int16 and samples.tolist() == [7] * 5
+
+
+def test_stop_interrupts_the_current_phrase_and_cancels_pending_ones(worker, engine):
+    engine.hold.add("long answer")
+    current = worker.speak("long answer")
+    pending = worker.speak("never spoken")
+    wait_until_speaking(engine)
+
+    worker.stop()
+    assert current.result(timeout=2) is False
+    assert pending.cancelled()
+
+    assert worker.speak("after").result(timeout=2) is True
+    assert engine.spoken == ["after"]
+
+
+def test_stopped_render_raises(worker, engine):
+    engine.hold.add("slow")
+    future = worker.render("slow")
+    wait_until_speaking(engine)
+    worker.stop()
+    with pytest.raises(RuntimeError, match="Rendering stopped"):
+        future.result(timeout=2)
+
+
+def test_close_finishes_the_current_phrase_and_ends_the_loop(engine):
+    engine.hold.add("mid sentence")
+    worker = OfflineTTSWorker(OfflineTTSConfig(poll_interval=0.001))
+    worker.start()
+    current = worker.speak("mid sentence")
+    wait_until_speaking(engine)
+    thread = worker._thread
+
+    worker.close()
+    assert not thread.is_alive() and worker._thread is None
+    assert current.result(timeout=0) is False
+    assert engine.loop_ended
+
+
+def test_init_failure_is_reported(monkeypatch):
+    def broken():
+        raise OSError("no speech driver")
+
+    monkeypatch.setattr(offline_tts, "PYTTSX3_AVAILABLE", True)
+    monkeypatch.setattr(offline_tts, "pyttsx3", type("pyttsx3", (), {"init": staticmethod(broken)}), raising=False)
+    with pytest.raises(RuntimeError, match="no speech driver"):
+        OfflineTTSWorker().start()
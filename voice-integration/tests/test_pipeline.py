@@ -0,0 +1,143 @@
+"""Pipeline supervisor: restarts, bounded queues and cancellation."""
+
+import asyncio
+
+from pipeline import PipelineSupervisor, put_bounded
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def test_crashed_stage_is_restarted_and_keeps_its_queue():
+    async def scenario():
+        supervisor = PipelineSupervisor(restart_delay=0)
+        items = asyncio.Queue()
+        done = []
+
+        async def flaky(metrics):
+            while True:
+                item = await items.get()
+                with metrics.busy():
+                    if item == "bad":
+                        raise ValueError("bad item")
+                    done.append(item)
+                    if len(done) == 2:
+                        supervisor.stop()
+
+        metrics = supervisor.add_stage("flaky", flaky, input_queue=items)
+        for item in ["one", "bad", "two"]:
+            items.put_nowait(item)
+        await supervisor.run()
+        return done, metrics
+
+    done, metrics = run(scenario())
+    assert done == ["one", "two"]
+    assert (metrics.errors, metrics.restarts, metrics.items) == (1, 1, 3)
+    assert not metrics.active
+
+
+def test_stage_over_its_restart_limit_stops_the_pipeline():
+    async def scenario():
+        supervisor = PipelineSupervisor(restart_limit=2, restart_delay=0)
+        other_cancelled = asyncio.Event()
+
+        async def broken(metrics):
+            raise RuntimeError("no device")
+
+        async def other(metrics):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                other_cancelled.set()
+                raise
+
+        broken_metrics = supervisor.add_stage("broken", broken)
+        supervisor.add_stage("other", other)
+        await supervisor.run()
+        return broken_metrics, other_cancelled.is_set()
+
+    metrics, other_cancelled = run(scenario())
+    assert (metrics.errors, metrics.restarts) == (3, 2)
+    assert other_cancelled
+
+
+def test_stop_cancels_a_stage_mid_item_and_its_queue_is_drained():
+    async def scenario():
+        supervisor = PipelineSupervisor()
+        commands = asyncio.Queue(maxsize=3)
+        started = asyncio.Event()
+        cancelled = []
+
+        async def execute(metrics):
+            while True:
+                command = await commands.get()
+                with metrics.busy():
+                    started.set()
+                    try:
+                        await asyncio.sleep(60)    # A long CLI run
+                    except asyncio.CancelledError:
+                        cancelled.append(command)
+                        while not commands.empty():  # Queued commands die with the turn
+                            cancelled.append(commands.get_nowait())
+                        raise
+
+        async def stopper(metrics):
+            await started.wait()
+            supervisor.stop()
+
+        metrics = supervisor.add_stage("execute", execute, input_queue=commands)
+        supervisor.add_stage("stopper", stopper)
+        for command in ["first", "second", "third"]:
+            commands.put_nowait(command)
+        await supervisor.run()
+        return cancelled, metrics, commands
+
+    cancelled, metrics, commands = run(scenario())
+    assert cancelled == ["first", "second", "third"]
+    assert commands.empty() and metrics.depth == 0
+    assert not metrics.active and metrics.errors == 0 and metrics.restarts == 0
+
+
+def test_bounded_queue_backpressure():
+    async def scenario():
+        supervisor = PipelineSupervisor()
+        queue = asyncio.Queue(maxsize=2)
+        received = []
+
+        async def producer(metrics):
+            for i in range(10):
+                await queue.put(i)                 # Waits while the consumer is behind
+                stages["consumer"].max_depth = max(stages["consumer"].max_depth, queue.qsize())
+            await asyncio.Event().wait()           # A stage that returns ends the pipeline
+
+        async def consumer(metrics):
+            while len(received) < 10:
+                item = await queue.get()
+                with metrics.busy():
+                    await asyncio.sleep(0.001)
+                    received.append(item)
+            supervisor.stop()
+
+        stages = {"producer": supervisor.add_stage("producer", producer),
+                  "consumer": supervisor.add_stage("consumer", consumer, input_queue=queue)}
+        await supervisor.run()
+        return received, stages["consumer"]
+
+    received, consumer = run(scenario())
+    assert received == list(range(10))
+    assert consumer.max_depth == 2 and consumer.items == 10
+
+
+def test_put_bounded_drops_the_oldest_item():
+    async def scenario():
+        queue = asyncio.Queue(maxsize=2)
+        supervisor = PipelineSupervisor()
+        metrics = supervisor.add_stage("stt", lambda m: None, input_queue=queue)
+        kept = [await put_bounded(queue, i, metrics) for i in range(4)]
+        return kept, [queue.get_nowait() for _ in range(queue.qsize())], metrics
+
+    kept, remaining, metrics = run(scenario())
+    assert kept == [True, True, False, False]
+    assert remaining == [2, 3]
+    assert (metrics.dropped, metrics.max_depth) == (2, 2)
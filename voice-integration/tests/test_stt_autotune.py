@@ -0,0 +1,82 @@
+"""Model selection from a cached benchmark profile."""
+
+import numpy as np
+import pytest
+
+import stt_autotune
+import stt_backend
+import voice_v10
+from stt_autotune import BUNDLED_REFERENCE, TuneConfig, reference_audio, resolve_model, save_profile, select
+
+
+def result(model, threads, command_ms, dictation_ms):
+    return {"model": model, "threads": threads, "load_s": 1.0,
+            "latency_ms": {"command": command_ms, "dictation": dictation_ms}}
+
+
+@pytest.fixture
+def profile_path(tmp_path):
+    path = str(tmp_path / "profile.json")
+    save_profile({
+        "machine": stt_autotune.machine_id(),
+        "backend": "auto",
+        "results": [
+            result("tiny", 4, 300, 1500),
+            result("base", 2, 900, 3500),
+            result("base", 4, 700, 3000),
+            result("small", 4, 2500, 9000),
+        ],
+    }, path)
+    return path
+
+
+def test_select_picks_most_accurate_model_within_target_at_fastest_threads(profile_path):
+    profile = stt_autotune.load_profile("auto", profile_path)
+    choice = select(profile, "command")
+    assert (choice.model, choice.threads) == ("base", 4)
+    assert select(profile, "command", target_ms=100) is None
+
+
+def test_resolve_uses_fastest_configuration_when_nothing_meets_target(profile_path, monkeypatch):
+    monkeypatch.setitem(stt_autotune.USE_CASES, "command",
+                        stt_autotune.UseCase("command", clip_s=4.0, target_ms=100.0))
+    assert resolve_model("command", "base", "auto", profile_path) == ("tiny", 4)
+
+
+def test_resolve_falls_back_without_a_profile_for_this_machine(profile_path, tmp_path):
+    assert resolve_model("dictation", "small", "faster-whisper", profile_path) == ("small", 0)
+    assert resolve_model("dictation", "small", "auto", str(tmp_path / "missing.json")) == ("small", 0)
+
+
+@pytest.mark.parametrize("installed, saved, looked_up", [
+    (None, "whisper", "auto"),
+    (None, "auto", "whisper"),
+    (object, "auto", "faster-whisper"),
+    (object, "faster-whisper", "auto"),
+])
+def test_auto_and_the_installed_engine_share_a_profile(tmp_path, monkeypatch, installed, saved, looked_up):
+    monkeypatch.setattr(stt_backend, "WhisperModel", installed)
+    path = str(tmp_path / "profile.json")
+    save_profile({"machine": stt_autotune.machine_id(), "backend": saved,
+                  "results": [result("small", 4, 500, 2000)]}, path)
+    assert resolve_model("command", "base", looked_up, path) == ("small", 4)
+    other = "whisper" if installed else "faster-whisper"
+    assert resolve_model("command", "base", other, path) == ("base", 0)
+
+
+def test_bundled_reference_is_real_speech_by_default():
+    assert TuneConfig().reference == BUNDLED_REFERENCE
+    audio = reference_audio(20.0, BUNDLED_REFERENCE)
+    assert audio.shape == (20 * 16000,) and audio.dtype == np.float32
+    assert 0.05 < np.abs(audio).max() <= 1.0
+
+
+def test_voice_config_reads_the_profile_once_per_backend(monkeypatch):
+    calls = []
+    monkeypatch.setattr(voice_v10, "resolve_model",
+                        lambda use_case, fallback, backend: calls.append(backend) or ("small", 4))
+    config = voice_v10.VoiceConfig(whisper_model="auto", stt_backend="whisper")
+    assert (config.stt_config().model, config.stt_config().threads) == ("small", 4)
+    config.stt_backend = "faster-whisper"
+    config.stt_config()
+    assert calls == ["whisper", "faster-whisper"]
@@ -0,0 +1,118 @@
+"""Short-utterance fast path: no-speech gating with stub engines."""
+
+import contextlib
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import stt_backend
+from stt_backend import FasterWhisperBackend, STTConfig, TranscriptionResult, WhisperBackend
+
+
+def decode(text, no_speech_prob, avg_logprob):
+    return types.SimpleNamespace(text=text, language="en", no_speech_prob=no_speech_prob, avg_logprob=avg_logprob)
+
+
+@pytest.fixture
+def whisper_backend(monkeypatch):
+    """WhisperBackend over stub whisper/torch modules; returns (backend, queue of decode results)."""
+    results = []
+
+    class Tensor:
+        def to(self, device):
+            return self
+
+    fake_torch = types.SimpleNamespace(stack=lambda items: Tensor(), no_grad=contextlib.nullcontext)
+    fake_whisper = types.SimpleNamespace(
+        log_mel_spectrogram=lambda audio, n_mels: audio,
+        pad_or_trim=lambda audio: audio,
+        DecodingOptions=lambda **options: options,
+        decode=lambda model, features, options: results.pop(0),
+    )
+    monkeypatch.setitem(sys.modules, "torch", fake_torch)
+    monkeypatch.setattr(stt_backend, "whisper", fake_whisper)
+
+    backend = WhisperBackend.__new__(WhisperBackend)
+    backend.config = STTConfig()
+    backend._model = types.SimpleNamespace(dims=types.SimpleNamespace(n_mels=80), device="cpu",
+                                           embed_audio=lambda mels: mels)
+    return backend, results
+
+
+def test_whisper_short_path_drops_no_speech(whisper_backend):
+    backend, results = whisper_backend
+    results.append([decode(" Thank you.", no_speech_prob=0.9, avg_logprob=-1.4)])
+
+    result = backend.transcribe(np.zeros(16000, dtype=np.float32))
+
+    assert result.fast_path
+    assert result.text == ""
+    assert result.no_speech_prob == 0.9
+
+
+@pytest.mark.parametrize("no_speech_prob, avg_logprob", [(0.9, -0.3), (0.2, -1.4)])
+def test_whisper_short_path_keeps_text_unless_both_thresholds_hit(whisper_backend, no_speech_prob, avg_logprob):
+    backend, results = whisper_backend
+    results.append([decode(" Run the tests.", no_speech_prob, avg_logprob)])
+
+    assert backend.transcribe(np.zeros(16000, dtype=np.float32)).text == "Run the tests."
+
+
+def test_whisper_batch_gates_each_clip(whisper_backend):
+    backend, results = whisper_backend
+    results.append([decode(" you", 0.95, -1.2), decode(" git status", 0.01, -0.2)])
+
+    texts = [r.text for r in backend.transcribe_batch([np.zeros(8000, dtype=np.float32)] * 2)]
+
+    assert texts == ["", "git status"]
+
+
+def test_faster_whisper_batch_drops_no_speech(monkeypatch):
+    class Tokenizer:
+        eot = 100
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def encode(self, text):
+            return []
+
+        def decode(self, tokens):
+            return {1: " Thank you.", 2: " Open the config."}[tokens[0]]
+
+    monkeypatch.setitem(sys.modules, "faster_whisper", types.ModuleType("faster_whisper"))
+    monkeypatch.setitem(sys.modules, "faster_whisper.tokenizer", types.SimpleNamespace(Tokenizer=Tokenizer))
+
+    class FeatureExtractor:
+        n_samples = 480000
+        nb_max_frames = 3000
+
+        def __call__(self, audio):
+            return np.zeros((80, 3000), dtype=np.float32)
+
+    generated = [
+        types.SimpleNamespace(sequences_ids=[[1, 100]], scores=[-1.3], no_speech_prob=0.8),
+        types.SimpleNamespace(sequences_ids=[[2, 100]], scores=[-0.2], no_speech_prob=0.05),
+    ]
+    backend = FasterWhisperBackend.__new__(FasterWhisperBackend)
+    backend.config = STTConfig(backend="faster-whisper")
+    backend._model = types.SimpleNamespace(
+        feature_extractor=FeatureExtractor(),
+        encode=lambda features: features,
+        hf_tokenizer=None,
+        model=types.SimpleNamespace(is_multilingual=False, generate=lambda *args, **kwargs: generated),
+        get_prompt=lambda tokenizer, previous, without_timestamps: [],
+        max_length=448,
+    )
+
+    results = backend.transcribe_batch([np.zeros(8000, dtype=np.float32)] * 2)
+
+    assert [r.text for r in results] == ["", "Open the config."]
+
+
+def test_drop_no_speech_ignores_missing_scores():
+    backend = WhisperBackend.__new__(WhisperBackend)
+    result = backend._drop_no_speech(TranscriptionResult(text="hello"))
+    assert result.text == "hello"
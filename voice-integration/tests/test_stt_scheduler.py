@@ -0,0 +1,113 @@
+"""Shared transcription: round-robin across clients, batching and admission."""
+
+import numpy as np
+import pytest
+
+from stt_backend import SAMPLE_RATE, STTBackend, STTConfig, TranscriptionResult
+from stt_scheduler import SchedulerConfig, TranscriptionScheduler
+
+
+class RecordingBackend(STTBackend):
+    """Names each clip by its first sample and records every model pass."""
+    name = "recording"
+
+    def __init__(self, config=None):
+        super().__init__(config or STTConfig())
+        self.passes = []
+
+    def _transcribe_full(self, audio, language):
+        self.passes.append([int(audio[0])])
+        return TranscriptionResult(text=str(int(audio[0])))
+
+    def _transcribe_short(self, audio, language):
+        return self._transcribe_short_batch([audio], language)[0]
+
+    def _transcribe_short_batch(self, audios, language):
+        self.passes.append([int(audio[0]) for audio in audios])
+        return [TranscriptionResult(text=str(int(audio[0]))) for audio in audios]
+
+
+def clip(label, seconds=1.0):
+    return np.full(int(seconds * SAMPLE_RATE), label, dtype=np.float32)
+
+
+def drain(scheduler, futures):
+    """Queue everything first, then let the inference thread run."""
+    scheduler.start()
+    try:
+        return [future.result(timeout=5).text for future in futures]
+    finally:
+        scheduler.close()
+
+
+def test_round_robin_keeps_a_busy_client_from_starving_others():
+    backend = RecordingBackend()
+    scheduler = TranscriptionScheduler(backend, SchedulerConfig(max_batch=1))
+    futures = [scheduler.submit("busy", clip(label)) for label in (1, 2, 3)]
+    futures += [scheduler.submit("alice", clip(10)), scheduler.submit("bob", clip(20))]
+
+    assert drain(scheduler, futures) == ["1", "2", "3", "10", "20"]
+    assert backend.passes == [[1], [10], [20], [2], [3]]
+    assert scheduler.stats.batches == 5 and scheduler.stats.completed == 5
+
+
+def test_short_clips_from_different_clients_share_a_pass():
+    backend = RecordingBackend()
+    scheduler = TranscriptionScheduler(backend, SchedulerConfig(max_batch=3))
+    futures = [scheduler.submit("busy", clip(label)) for label in (1, 2)]
+    futures += [scheduler.submit("alice", clip(10)), scheduler.submit("bob", clip(20))]
+
+    assert drain(scheduler, futures) == ["1", "2", "10", "20"]
+    assert backend.passes == [[1, 10, 20], [2]]
+    assert scheduler.stats.largest_batch == 3 and scheduler.stats.avg_batch == 2.0
+
+
+def test_language_and_long_clips_are_not_batched():
+    backend = RecordingBackend(STTConfig(short_utterance_s=5.0))
+    scheduler = TranscriptionScheduler(backend, SchedulerConfig(max_batch=4))
+    futures = [
+        scheduler.submit("alice", clip(1), language="en"),
+        scheduler.submit("bob", clip(2), language="de"),
+        scheduler.submit("carol", clip(3, seconds=8.0), language="en"),
+    ]
+
+    assert drain(scheduler, futures) == ["1", "2", "3"]
+    assert backend.passes == [[1], [2], [3]]
+
+
+def test_admission_limits():
+    rejected = []
+    scheduler = TranscriptionScheduler(RecordingBackend(), SchedulerConfig(max_waiting=2, max_audio_s=2.0))
+    stt = scheduler.client("alice", on_rejected=lambda: rejected.append(True))
+    futures = [stt.submit(clip(label, seconds=3.0)) for label in (1, 2, 3)]
+
+    assert futures[2].result().timings == {"rejected": 1.0}
+    assert rejected == [True]
+    assert scheduler.stats.truncated == 3
+
+    assert drain(scheduler, futures[:2]) == ["1", "2"]
+    assert "queue_ms" in futures[0].result().timings
+
+
+def test_close_and_remove_client_cancel_queued_requests():
+    scheduler = TranscriptionScheduler(RecordingBackend())
+    gone = scheduler.submit("alice", clip(1))
+    scheduler.remove_client("alice")
+    queued = scheduler.submit("bob", clip(2))
+    scheduler.close()
+
+    assert gone.cancelled() and queued.cancelled()
+    assert scheduler.submit("bob", clip(3)).result().timings == {"rejected": 1.0}
+
+
+def test_backend_errors_reach_the_caller():
+    class FailingBackend(RecordingBackend):
+        def _transcribe_short_batch(self, audios, language):
+            raise RuntimeError("decoder crashed")
+
+    scheduler = TranscriptionScheduler(FailingBackend())
+    future = scheduler.submit("alice", clip(1))
+    scheduler.start()
+    with pytest.raises(RuntimeError, match="decoder crashed"):
+        future.result(timeout=5)
+    scheduler.close()
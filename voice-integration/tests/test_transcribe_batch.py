@@ -0,0 +1,92 @@
+"""Batch transcription: shard cutting at silences and the resume manifest."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from transcribe_batch import SAMPLE_RATE, FileJob, Manifest, plan_jobs, silence_shards
+
+SR = SAMPLE_RATE
+
+
+def speech(seconds, silences=()):
+    """Noise at speech level, with digital silence over the given (start, end) spans."""
+    audio = np.random.default_rng(0).normal(0, 3000, int(seconds * SR)).astype(np.int16)
+    for start, end in silences:
+        audio[int(start * SR):int(end * SR)] = 0
+    return audio
+
+
+def test_short_recordings_are_one_shard():
+    audio = speech(12)
+    assert silence_shards(audio, shard_s=10) == [(0, len(audio))]
+
+
+def test_cuts_land_in_the_silence_nearest_each_boundary():
+    audio = speech(25, silences=[(9.0, 9.2), (11.5, 11.6), (20.0, 20.3)])
+    shards = silence_shards(audio, shard_s=10, search_s=2)
+
+    assert shards[0][0] == 0 and shards[-1][1] == len(audio)
+    assert all(end == start for (_, end), (start, _) in zip(shards, shards[1:]))
+    cuts = [end / SR for _, end in shards[:-1]]
+    assert len(cuts) == 2
+    assert 9.0 <= cuts[0] <= 9.2
+    assert 20.0 <= cuts[1] <= 20.3
+
+
+def test_without_silence_cuts_at_the_target():
+    audio = np.full(30 * SR, 1000, dtype=np.int16)
+    shards = silence_shards(audio, shard_s=10, search_s=2)
+    assert [end / SR for _, end in shards] == pytest.approx([10.025, 20.025, 30.0])  # Mid-frame
+
+
+@pytest.fixture
+def job(tmp_path):
+    source = tmp_path / "talk.wav"
+    source.write_bytes(b"RIFF")
+    return plan_jobs([str(source)], str(tmp_path / "transcripts"))[0]
+
+
+def test_manifest_resumes_finished_shards(tmp_path, job):
+    path = str(tmp_path / "manifest.jsonl")
+    manifest = Manifest(path)
+    manifest.record(job, shard=0, start=0, end=100, text="hello")
+    manifest.record(job, shard=1, start=100, end=200, text="world")
+    manifest.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"source": "torn')
+
+    manifest = Manifest(path)
+    assert sorted(manifest.finished_shards(job)) == [(0, 100), (100, 200)]
+    assert not manifest.is_done(job)
+
+    edited = FileJob(job.source, job.output, job.size, job.mtime + 1)
+    assert manifest.finished_shards(edited) == {}
+    manifest.close()
+
+
+def test_manifest_done_needs_the_transcript(tmp_path, job):
+    path = str(tmp_path / "manifest.jsonl")
+    manifest = Manifest(path)
+    manifest.record(job, done=True, output=job.output)
+    manifest.close()
+
+    assert not Manifest(path).is_done(job)
+    os.makedirs(os.path.dirname(job.output))
+    with open(job.output, "w") as f:
+        f.write("hello world")
+    assert Manifest(path).is_done(job)
+    with open(path, encoding="utf-8") as f:
+        assert json.loads(f.readline())["size"] == 4
+
+
+def test_plan_jobs_disambiguates_same_named_inputs(tmp_path):
+    for folder in ["a", "b"]:
+        os.makedirs(tmp_path / folder)
+        (tmp_path / folder / "talk.mp4").write_bytes(b"")
+    jobs = plan_jobs([str(tmp_path / "a" / "talk.mp4"), str(tmp_path / "b" / "talk.mp4")], "out")
+    names = [os.path.basename(job.output) for job in jobs]
+    assert len(set(names)) == 2
+    assert all(name.startswith("talk-") and name.endswith(".txt") for name in names)
@@ -0,0 +1,70 @@
+"""Session history: writes through the writer thread, search and resume lookup."""
+
+import time
+
+import pytest
+
+from stream_parser import MessageType, ParsedMessage
+from transcript_store import MESSAGE, SPEECH, TRANSCRIPT, TranscriptStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TranscriptStore(str(tmp_path / "transcripts.db"), flush_interval_s=0.01)
+    yield store
+    store.close()
+
+
+def fill(store):
+    start = time.time() + 60  # Entries, not open_session(), decide which session is latest
+    store.open_session("old", working_directory="/repo", model="sonnet")
+    store.append("old", TRANSCRIPT, "run the migration", ts=start)
+    store.append("old", SPEECH, "The migration failed on users.", ts=start + 1)
+    store.open_session("other", working_directory="/elsewhere")
+    store.append("other", TRANSCRIPT, "check the migration log", ts=start + 100)
+    store.open_session("new", working_directory="/repo")
+    store.append("new", TRANSCRIPT, "fix the failed migration", ts=start + 200)
+    store.append("new", TRANSCRIPT, "then run tests", ts=start + 201)
+    store.flush()
+
+
+def test_sessions_and_resume_lookup(store):
+    fill(store)
+    assert [s.id for s in store.sessions()] == ["new", "other", "old"]
+
+    last = store.last_session("/repo")
+    assert (last.id, last.entries, last.title) == ("new", 2, "fix the failed migration")
+    assert store.last_session("/repo", exclude="new").id == "old"
+    assert store.last_session("/nowhere") is None
+
+
+def test_entries_newest_keeps_time_order(store):
+    fill(store)
+    recent = store.entries("old", kinds=[TRANSCRIPT, SPEECH], limit=1, newest=True)
+    assert [e.text for e in recent] == ["The migration failed on users."]
+    assert [e.kind for e in store.entries("old")] == [TRANSCRIPT, SPEECH]
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_search_matches_every_word_newest_first(store, fts):
+    fill(store)
+    store.has_fts = store.has_fts and fts
+    assert [e.session_id for e in store.search("migration failed")] == ["new", "old"]
+    assert [e.session_id for e in store.search("migration", limit=2)] == ["new", "other"]
+    assert [e.text for e in store.search("migration", session_id="old", kinds=[SPEECH])] == [
+        "The migration failed on users."]
+    assert store.search('users." OR "tests') == []
+
+
+def test_log_message_stores_tool_result_and_payload(store):
+    raw = {"type": "user", "content": [{"type": "tool_result", "content": "3 passed"}]}
+    store.log_message("s", ParsedMessage(MessageType.TOOL_RESULT, tool_name="Bash",
+                                         tool_result="3 passed", raw_data=raw), ts=5.0)
+    store.log_message("s", ParsedMessage(MessageType.TOOL_RESULT, tool_name="Bash",
+                                         tool_result="3 passed", raw_data=raw), ts=6.0)
+    store.flush()
+
+    entries = store.entries("s", tool="Bash")
+    assert [(e.kind, e.text) for e in entries] == [(MESSAGE, "3 passed")] * 2
+    assert store.payload(entries[0].payload_hash) == raw
+    assert store.stats()["payloads"] == 1
@@ -0,0 +1,83 @@
+"""TTS cache: memory LRU, size-bounded disk tier and restart."""
+
+import os
+
+import numpy as np
+
+import tts_cache
+
+from tts_cache import TTSCache, TTSCacheConfig
+
+VOICE, RATE = "en-US-GuyNeural", "+10%"
+
+
+def clip(value):
+    return np.full(24000, value, dtype=np.int16)  # 1 s, 48000 bytes
+
+
+def cache_in(tmp_path, **overrides):
+    return TTSCache(TTSCacheConfig(cache_dir=str(tmp_path), **overrides))
+
+
+def test_memory_lru_falls_back_to_disk(tmp_path):
+    cache = cache_in(tmp_path, memory_items=2)
+    for value, phrase in enumerate(["Goodbye!", "No files found", "Running npm"]):
+        cache.put(phrase, VOICE, RATE, clip(value), 24000)
+
+    samples, sample_rate = cache.get("Goodbye!", VOICE, RATE)  # Evicted from memory
+    assert sample_rate == 24000 and samples[0] == 0
+    assert cache.get("Running npm", VOICE, RATE)[0][0] == 2
+    assert cache.get("Goodbye!", VOICE, RATE) is not None  # Promoted back to memory
+    assert cache.get("Goodbye!", "other-voice", RATE) is None
+    assert (cache.stats.memory_hits, cache.stats.disk_hits, cache.stats.misses) == (2, 1, 1)
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = cache_in(tmp_path, memory_items=0, disk_limit_mb=0.1)
+    cache.put("one", VOICE, RATE, clip(1), 24000)
+    cache.put("two", VOICE, RATE, clip(2), 24000)
+    assert cache.get("one", VOICE, RATE) is not None
+    cache.put("three", VOICE, RATE, clip(3), 24000)
+
+    assert cache.stats.evictions == 1
+    assert not cache.contains("two", VOICE, RATE)
+    assert cache.contains("one", VOICE, RATE) and cache.contains("three", VOICE, RATE)
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_disk_index_survives_restart(tmp_path):
+    cache_in(tmp_path).put("Goodbye!", VOICE, RATE, clip(7), 22050)
+    (tmp_path / "stray.pcm").write_bytes(b"\0\0")
+
+    reopened = cache_in(tmp_path)
+    samples, sample_rate = reopened.get("Goodbye!", VOICE, RATE)
+    assert sample_rate == 22050 and samples.tolist() == clip(7).tolist()
+
+    reopened.clear()
+    assert not reopened.contains("Goodbye!", VOICE, RATE)
+    assert os.listdir(tmp_path) == ["stray.pcm"]
+
+
+def test_long_and_empty_phrases_are_not_cached():
+    cache = TTSCache(TTSCacheConfig(cache_dir=None, max_text_chars=20))
+    for text in ["", "   ", "a much longer answer than twenty characters"]:
+        cache.put(text, VOICE, RATE, clip(1), 24000)
+        assert cache.get(text, VOICE, RATE) is None
+    assert cache.stats.lookups == 0 and cache.stats.stores == 0
+
+    cache.put(" Goodbye! ", VOICE, RATE, clip(1), 24000)
+    assert cache.get("Goodbye!", VOICE, RATE) is not None
+
+
+def test_failed_write_leaves_no_clip_behind(tmp_path, monkeypatch):
+    (tmp_path / ("0" * 40 + "-24000.pcm.tmp")).write_bytes(b"\0")  # Torn write from a crash
+    cache = cache_in(tmp_path, memory_items=0)
+    assert os.listdir(tmp_path) == []
+
+    def full_disk(src, dst):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(tts_cache.os, "replace", full_disk)
+    cache.put("Goodbye!", VOICE, RATE, clip(1), 24000)
+    assert not cache.contains("Goodbye!", VOICE, RATE)
+    assert os.listdir(tmp_path) == []
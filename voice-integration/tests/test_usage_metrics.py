@@ -0,0 +1,73 @@
+"""Usage log: recording, alerts and aggregation over the JSONL file."""
+
+import json
+import time
+
+import pytest
+
+from stream_parser import ResultUsage
+from usage_metrics import TurnRecord, UsageConfig, UsageLog, UsageTotals
+
+
+def usage(model, cost, duration_ms, session_id="s1", **extra):
+    return ResultUsage(session_id=session_id, model=model, cost_usd=cost, duration_ms=duration_ms, **extra)
+
+
+@pytest.fixture
+def log(tmp_path):
+    return UsageLog(UsageConfig(path=str(tmp_path / "usage.jsonl")))
+
+
+def test_record_appends_and_reads_back(log):
+    log.record(usage("opus", 0.2, 4000, input_tokens=100, output_tokens=50),
+               requested_model="opus", wall_ms=4500)
+    log.record(usage(None, 0.01, 1000, session_id=None), requested_model="haiku", session_id="s2")
+
+    records = list(log.read())
+    assert [(r.model, r.requested_model, r.session_id) for r in records] == [
+        ("opus", "opus", "s1"), (None, "haiku", "s2")]
+    assert records[0].wall_ms == 4500 and records[0].output_tokens == 50
+    assert list(log.read(model="haiku"))[0].session_id == "s2"
+    assert set(log.snapshot()) == {"s1", "s2"}
+
+
+def test_aggregate_groups_and_filters(log):
+    for model, cost, duration in [("opus", 0.30, 8000), ("opus", 0.10, 2000), ("haiku", 0.01, 500)]:
+        log.record(usage(model, cost, duration, cache_read_tokens=300, input_tokens=100))
+
+    by_model = log.aggregate("model")
+    assert sorted(by_model) == ["haiku", "opus"]
+    opus = by_model["opus"]
+    assert opus.turns == 2 and opus.cost_usd == pytest.approx(0.40)
+    assert opus.cost_per_turn == pytest.approx(0.20)
+    assert opus.percentile(50) == 2000 and opus.percentile(95) == 8000
+    assert opus.cache_hit_ratio == pytest.approx(0.75)
+
+    assert list(log.aggregate("day")) == [time.strftime("%Y-%m-%d")]
+    assert log.aggregate("session", since=time.time() + 60) == {}
+    assert log.aggregate("model", model="haiku")["haiku"].to_dict()["p95_ms"] == 500
+
+
+def test_read_skips_torn_lines_and_unknown_fields(log):
+    log.record(usage("opus", 0.1, 1000))
+    with open(log.config.path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"timestamp": 1.0, "model": "sonnet", "future_field": 1}) + "\n")
+        f.write('{"timestamp": 2.0, "mod')
+    assert [r.model for r in log.read()] == ["opus", "sonnet"]
+
+
+def test_alerts_for_slow_and_expensive_turns():
+    alerts = []
+    log = UsageLog(UsageConfig(path=None, slow_turn_s=5, expensive_turn_usd=0.5),
+                   on_alert=lambda message, record: alerts.append(message))
+    log.record(usage("opus", 0.75, 9000))
+    log.record(usage("opus", 0.10, 1000))
+    assert alerts == ["slow turn: 9s (opus)", "expensive turn: $0.75 (opus)"]
+    assert list(log.read()) == []
+
+
+def test_empty_totals():
+    totals = UsageTotals()
+    assert totals.percentile(95) == 0.0 and totals.cache_hit_ratio == 0.0 and totals.cost_per_turn == 0.0
+    totals.add(TurnRecord(timestamp=0.0, is_error=True))
+    assert totals.errors == 1
@@ -0,0 +1,81 @@
+"""Energy-based utterance segmentation and offline silence compaction."""
+
+import numpy as np
+
+from vad import TimeMap, VADConfig, VADSegmenter, compact_speech
+
+SR = 16000
+BLOCK = SR // 50  # 20 ms
+
+
+def tone(blocks, level=0.1):
+    return [np.full(BLOCK, level, dtype=np.float32) for _ in range(blocks)]
+
+
+def quiet(blocks):
+    return [np.zeros(BLOCK, dtype=np.float32) for _ in range(blocks)]
+
+
+def segment(vad, blocks):
+    return [audio for audio in (vad.push(block) for block in blocks) if audio is not None]
+
+
+def test_is_speech_scales_int16_to_full_scale():
+    vad = VADSegmenter(VADConfig(threshold=0.02))
+    assert vad.is_speech(np.full((BLOCK, 1), 1000, dtype=np.int16))
+    assert not vad.is_speech(np.full((BLOCK, 1), 500, dtype=np.int16))
+    assert not vad.is_speech(np.zeros(0, dtype=np.int16))
+
+
+def test_utterance_ends_after_trailing_silence():
+    vad = VADSegmenter(VADConfig(silence_ms=100, min_speech_ms=100))
+    utterances = segment(vad, quiet(3) + tone(10) + quiet(5) + quiet(1) + quiet(3))
+    assert [len(u) for u in utterances] == [16 * BLOCK]
+    assert not vad.in_speech
+
+
+def test_short_blips_are_discarded():
+    vad = VADSegmenter(VADConfig(silence_ms=100, min_speech_ms=300))
+    assert segment(vad, tone(2) + quiet(6)) == []
+    assert not vad.in_speech
+
+
+def test_max_speech_splits_long_utterances():
+    vad = VADSegmenter(VADConfig(silence_ms=100, max_speech_ms=200))
+    utterances = segment(vad, tone(25))
+    assert [len(u) for u in utterances] == [10 * BLOCK, 10 * BLOCK]
+    assert len(vad.flush()) == 5 * BLOCK
+
+
+def test_is_speech_override_and_flush():
+    vad = VADSegmenter()
+    assert vad.push(quiet(1)[0], is_speech=True) is None
+    assert vad.in_speech
+    assert len(vad.flush()) == BLOCK
+    assert vad.flush() is None
+
+
+def test_compact_trims_edges_and_shortens_long_pauses():
+    audio = np.concatenate(quiet(50) + tone(10) + quiet(5) + tone(10) + quiet(100) + tone(10) + quiet(50))
+    compacted, time_map = compact_speech(audio, SR, threshold=0.02, gap_ms=280)
+
+    # 140 ms lead-in and tail, the 100 ms pause kept, the 2 s pause cut to 280 ms
+    assert len(compacted) == (7 + 10 + 5 + 10 + 14 + 10 + 7) * BLOCK
+    assert time_map.removed_s == (len(audio) - len(compacted)) / SR
+    np.testing.assert_allclose(time_map.original_starts, [0.86, 3.36])
+    np.testing.assert_allclose(time_map.to_original([0.0, 0.14, 0.8, 0.9]), [0.86, 1.0, 3.38, 3.48])
+
+
+def test_compact_keeps_dtype_and_handles_silence():
+    audio = (np.concatenate(quiet(20) + tone(10) + quiet(20)) * 32767).astype(np.int16)
+    compacted, _ = compact_speech(audio, SR)
+    assert compacted.dtype == np.int16 and len(compacted) == (7 + 10 + 7) * BLOCK
+
+    silent, time_map = compact_speech(np.zeros(SR, dtype=np.int16), SR, threshold=0.02)
+    assert len(silent) == 0 and time_map.removed_s == 1.0
+    assert time_map.to_original(0.5) == 0.5
+
+
+def test_time_map_without_spans_is_identity():
+    time_map = TimeMap(np.zeros(0), np.zeros(0))
+    assert time_map.to_original(1.25) == 1.25
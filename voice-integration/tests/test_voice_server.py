@@ -0,0 +1,67 @@
+"""Voice server handshake: the shared token and the loopback-only default."""
+
+import asyncio
+import json
+
+import pytest
+
+import voice_server
+import voice_v10
+from voice_protocol import EVENT, HELLO, read_frame, write_json
+from voice_server import ServerConfig, VoiceServer
+from voice_v10 import VoiceConfig
+
+
+class StubBackend:
+    name = "stub"
+    config = None
+
+
+@pytest.fixture
+def make_server(monkeypatch):
+    monkeypatch.setattr(voice_server, "create_stt_backend", lambda config: StubBackend())
+    monkeypatch.setattr(voice_v10, "edge_tts", voice_v10.edge_tts or object())
+
+    def make(**config):
+        return VoiceServer(ServerConfig(voice=VoiceConfig(tts_engine="edge", tts_cache=False), **config))
+    return make
+
+
+def handshake(server, hello):
+    """Connect, send a hello and return the server's first event."""
+    async def scenario():
+        listener = await asyncio.start_server(server._handle_client, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            write_json(writer, HELLO, hello)
+            kind, payload = await read_frame(reader)
+            writer.close()
+            return kind, json.loads(payload)
+    return asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+
+@pytest.mark.parametrize("host", ["0.0.0.0", "192.168.1.20", "", "voicebox.lan"])
+def test_non_loopback_bind_needs_a_token(make_server, host):
+    with pytest.raises(ValueError, match="without a token"):
+        make_server(host=host)
+    assert make_server(host=host, token="s3cret").config.host == host
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1", "::1", "localhost"])
+def test_loopback_bind_needs_no_token(make_server, host):
+    assert make_server(host=host).config.token is None
+
+
+@pytest.mark.parametrize("hello", [{"name": "alice"}, {"name": "alice", "token": "guess"},
+                                   {"name": "alice", "token": 42}])
+def test_hello_without_the_token_is_refused(make_server, hello):
+    server = make_server(host="0.0.0.0", token="s3cret")
+    assert handshake(server, hello) == (EVENT, {"type": "error", "message": "Invalid token"})
+    assert server.refused == 1 and not server.sessions
+
+
+def test_hello_with_the_token_is_admitted(make_server):
+    server = make_server(host="0.0.0.0", token="s3cret", max_sessions=0)  # Full: refused after the token check
+    kind, event = handshake(server, {"name": "alice", "token": "s3cret"})
+    assert event["message"] == "Server full (0 sessions)"
@@ -0,0 +1,157 @@
+"""Idle wake gate: energy, spectral and keyword tiers on synthetic audio."""
+
+import numpy as np
+import pytest
+
+from stt_backend import TranscriptionResult
+from vad import VADConfig, VADSegmenter
+from wake_gate import KeywordSpotter, WakeGate
+
+SR = 16000
+BLOCK = SR // 50  # 20 ms
+
+
+def pcm(signal):
+    return (np.clip(signal, -1, 1) * 32767).astype(np.int16).reshape(-1, 1)
+
+
+def seconds(s):
+    return np.arange(int(s * SR)) / SR
+
+
+def quiet(s):
+    return np.random.default_rng(1).normal(0, 0.002, len(seconds(s)))
+
+
+def tone(s, hz=300.0, level=0.2):
+    return level * np.sin(2 * np.pi * hz * seconds(s))
+
+
+def voice(s, pitch=140.0, level=0.1):
+    """Harmonic buzz with a gliding pitch, like a voiced vowel."""
+    t = seconds(s)
+    phase = 2 * np.pi * np.cumsum(pitch * (1 + 0.1 * np.sin(2 * np.pi * 3 * t))) / SR
+    return level * sum(np.sin(k * phase) / k for k in range(1, 20))
+
+
+INPUTS = {
+    "silence": lambda: quiet(1),
+    "hiss": lambda: np.random.default_rng(2).normal(0, 0.1, SR),
+    "hum": lambda: 0.2 * np.sin(2 * np.pi * 60 * seconds(1)) + 0.1 * np.sin(2 * np.pi * 120 * seconds(1)),
+    "tone": lambda: tone(1),
+}
+
+
+def run(gate, signal, block=BLOCK):
+    """Feed a signal in capture blocks; returns the samples passed on."""
+    audio = pcm(signal)
+    passed = []
+    for i in range(0, len(audio), block):
+        passed += gate.process(audio[i:i + block])
+    return sum(len(b) for b in passed)
+
+
+@pytest.mark.parametrize("name, rejected_by", [
+    ("silence", "energy"),
+    ("hiss", "spectral"),       # Too flat
+    ("hum", "spectral"),        # Below the voice band
+    ("tone", None),             # Passes both
+])
+def test_each_tier_rejects_its_input(name, rejected_by):
+    gate = WakeGate()
+    run(gate, np.concatenate([quiet(1), INPUTS[name]()]))
+    stats = gate.stats
+    if rejected_by == "energy":
+        assert stats.energy_candidates == 0
+    elif rejected_by == "spectral":
+        # A stray noise frame can look voiced; never enough of them to open
+        assert stats.energy_candidates > 0 and stats.spectral_candidates <= stats.energy_candidates // 2
+    else:
+        assert stats.spectral_candidates == stats.energy_candidates > 0
+    assert stats.opens == (rejected_by is None)
+
+
+def test_short_transient_does_not_open():
+    click = np.zeros(SR // 2)
+    click[:BLOCK] = tone(0.02, hz=1000, level=0.5)  # One loud 20 ms frame
+    gate = WakeGate()
+    assert run(gate, np.concatenate([quiet(1), click])) == 0
+    assert gate.stats.spectral_candidates == 1 and gate.stats.opens == 0
+
+
+@pytest.mark.parametrize("block", [BLOCK, 5 * BLOCK])
+def test_frames_are_scored_alike_for_any_block_size(block):
+    gate = WakeGate()
+    signal = np.concatenate([quiet(1), voice(0.5), quiet(2)])
+    audio = pcm(signal)
+    opened = closed = None
+    for i in range(0, len(audio), block):
+        gate.process(audio[i:i + block])
+        if gate.is_open and opened is None:
+            opened = i + block
+        if opened is not None and not gate.is_open and closed is None:
+            closed = i + block
+    assert opened == SR + 5 * BLOCK       # First batch with 80 ms of voice in it
+    assert 2 * SR <= closed <= 2.6 * SR     # hold_ms after the last loud frame
+
+
+def test_closed_gate_buffers_blocks_and_passes_the_preroll():
+    gate = WakeGate()
+    run(gate, quiet(1))
+    audio = pcm(voice(0.2))
+    results = [gate.process(audio[i:i + BLOCK]) for i in range(0, 5 * BLOCK, BLOCK)]
+    assert results[:4] == [[], [], [], []]
+    assert sum(len(b) for b in results[4]) >= 5 * BLOCK  # Pre-roll plus the whole batch
+    assert len(gate.process(audio[5 * BLOCK:6 * BLOCK])[0]) == BLOCK  # Open: straight through
+
+
+def test_hold_passes_blocks_buffered_before_it():
+    gate = WakeGate()
+    audio = pcm(quiet(0.1))
+    assert gate.process(audio[:BLOCK]) == []
+    gate.hold()
+    assert [len(b) for b in gate.process(audio[BLOCK:2 * BLOCK])] == [2 * BLOCK]
+    assert gate.stats.opens == 0
+
+
+class StubSTT:
+    """Records what it was asked to transcribe."""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def transcribe(self, audio, language=None):
+        self.calls += 1
+        return TranscriptionResult(text=self.text)
+
+
+@pytest.mark.parametrize("name, checks", [("silence", 0), ("hiss", 0), ("hum", 0), ("voice", 1)])
+def test_keyword_tier_only_sees_what_the_cheap_tiers_pass(name, checks):
+    """Gate -> VAD -> spotter, as in Voice V10: noise never costs a model pass."""
+    stt = StubSTT("hey claude run the tests")
+    spotter = KeywordSpotter("hey claude", stt)
+    gate = WakeGate()
+    vad = VADSegmenter(VADConfig(threshold=0.02, silence_ms=300))
+    signal = voice(0.6) if name == "voice" else INPUTS[name]()
+    audio = pcm(np.concatenate([quiet(1), signal, quiet(1.5)]))
+
+    heard = []
+    for i in range(0, len(audio), BLOCK):
+        for block in gate.process(audio[i:i + BLOCK]):
+            utterance = vad.push(block)
+            if utterance is not None:
+                heard.append(spotter.heard(utterance[:, 0] / 32768.0))
+    assert stt.calls == checks
+    assert heard == [True] * checks
+
+
+@pytest.mark.parametrize("text, heard, command", [
+    ("Hey Claude, run the tests.", True, "run the tests."),
+    ("Okay, hey Cloud run the tests", True, "run the tests"),
+    ("Run the tests", False, "Run the tests"),
+])
+def test_spotter_matches_and_strips_the_phrase(text, heard, command):
+    spotter = KeywordSpotter("hey claude", StubSTT(text))
+    assert spotter.heard(np.zeros(SR, dtype=np.float32)) is heard
+    assert spotter.strip(text) == command
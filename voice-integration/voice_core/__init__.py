@@ -15,9 +15,26 @@ Or programmatically:
 """
 
 from .cli_bridge import ClaudeCLIBridge, CLIConfig, execute_claude_command
-from .stream_parser import StreamParser, ParsedMessage, MessageType, parse_cli_message
+from .stream_parser import StreamParser, ParsedMessage, MessageType, ResultUsage, parse_cli_message
 from .tts_summarizer import TTSSummarizer, TTSConfig, summarize_for_speech
+from .stt_backend import STTBackend, STTConfig, TranscriptionResult, CascadeBackend, create_stt_backend
+from .intent_matcher import IntentMatcher, Intent, IntentMatch
+from .pipeline import PipelineSupervisor, StageMetrics
+from .barge_in import BargeInDetector, BargeInConfig
+from .tts_cache import TTSCache, TTSCacheConfig
+from .audio_io import AudioOutput, decode_audio
+from .offline_tts import OfflineTTSWorker, OfflineTTSConfig
+from .tracing import Tracer, TracerConfig, TurnTrace
+from .vad import VADSegmenter, VADConfig, TimeMap, compact_speech
+from .capture_process import CaptureProcess, CaptureConfig, CaptureStats
+from .stt_autotune import TuneConfig, Measurement, benchmark, select, resolve_model
+from .wake_gate import WakeGate, WakeGateConfig, GateStats, KeywordSpotter, IdleMeter
+from .usage_metrics import UsageLog, UsageConfig, TurnRecord, UsageTotals
+from .event_bus import EventBus, DropPolicy, Subscription
+from .transcript_store import TranscriptStore, SessionInfo, Entry
+from .stt_scheduler import TranscriptionScheduler, SchedulerConfig
 from .voice_v10 import VoiceV10, VoiceConfig, VoiceState
+from .voice_server import VoiceServer, ServerConfig, ClientSession
 
 __all__ = [
     # CLI Bridge
@@ -28,15 +45,86 @@ __all__ = [
     "StreamParser",
     "ParsedMessage",
     "MessageType",
+    "ResultUsage",
     "parse_cli_message",
     # TTS Summarizer
     "TTSSummarizer",
     "TTSConfig",
     "summarize_for_speech",
+    # STT Backend
+    "STTBackend",
+    "STTConfig",
+    "TranscriptionResult",
+    "CascadeBackend",
+    "create_stt_backend",
+    # Intent Matcher
+    "IntentMatcher",
+    "Intent",
+    "IntentMatch",
+    # Pipeline
+    "PipelineSupervisor",
+    "StageMetrics",
+    # Barge-in
+    "BargeInDetector",
+    "BargeInConfig",
+    # TTS Cache
+    "TTSCache",
+    "TTSCacheConfig",
+    # Audio I/O
+    "AudioOutput",
+    "decode_audio",
+    # Offline TTS
+    "OfflineTTSWorker",
+    "OfflineTTSConfig",
+    # Tracing
+    "Tracer",
+    "TracerConfig",
+    "TurnTrace",
+    # VAD
+    "VADSegmenter",
+    "VADConfig",
+    "TimeMap",
+    "compact_speech",
+    # Capture Process
+    "CaptureProcess",
+    "CaptureConfig",
+    "CaptureStats",
+    # STT Autotune
+    "TuneConfig",
+    "Measurement",
+    "benchmark",
+    "select",
+    "resolve_model",
+    # Wake Gate
+    "WakeGate",
+    "WakeGateConfig",
+    "GateStats",
+    "KeywordSpotter",
+    "IdleMeter",
+    # Usage Metrics
+    "UsageLog",
+    "UsageConfig",
+    "TurnRecord",
+    "UsageTotals",
+    # Event Bus
+    "EventBus",
+    "DropPolicy",
+    "Subscription",
+    # Transcript Store
+    "TranscriptStore",
+    "SessionInfo",
+    "Entry",
+    # STT Scheduler
+    "TranscriptionScheduler",
+    "SchedulerConfig",
     # Voice V10
     "VoiceV10",
     "VoiceConfig",
     "VoiceState",
+    # Voice Server
+    "VoiceServer",
+    "ServerConfig",
+    "ClientSession",
 ]
 
 __version__ = "10.0.0"
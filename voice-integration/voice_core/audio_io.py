@@ -0,0 +1,242 @@
+"""
+Audio I/O - In-memory audio decoding and playback for Voice V10.
+
+Decodes synthesised speech (MP3 from edge-tts) straight to PCM without temp
+files, using miniaudio (ffmpeg pipe as a last resort), and plays PCM clips
+through one persistent, pre-opened output stream.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+    import miniaudio
+    MINIAUDIO_AVAILABLE = True
+except ImportError:
+    MINIAUDIO_AVAILABLE = False
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    sd = None
+
+
+def decode_audio(data: bytes, sample_rate: int = 24000) -> tuple[np.ndarray, int]:
+    """
+    Decode compressed audio (MP3, WAV, ...) to mono int16 PCM.
+
+    Args:
+        data: Encoded audio bytes
+        sample_rate: Output sample rate (edge-tts voices are 24 kHz)
+
+    Returns:
+        (samples, sample_rate)
+
+    Raises:
+        RuntimeError: If no decoder is available or decoding fails
+    """
+    if MINIAUDIO_AVAILABLE:
+        try:
+            decoded = miniaudio.decode(
+                data,
+                output_format=miniaudio.SampleFormat.SIGNED16,
+                nchannels=1,
+                sample_rate=sample_rate,
+            )
+        except miniaudio.DecodeError as e:
+            raise RuntimeError(f"Audio decode failed: {e}")
+        return np.frombuffer(decoded.samples, dtype=np.int16), decoded.sample_rate
+
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+             "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+            input=data,
+            capture_output=True,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+        )
+    except OSError:
+        raise RuntimeError("No audio decoder available. Please install miniaudio: pip install miniaudio")
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Audio decode failed: {result.stderr.decode(errors='replace').strip()[:200]}")
+    return np.frombuffer(result.stdout, dtype=np.int16), sample_rate
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Linear-interpolation resample of int16 PCM (speech only, not hi-fi)."""
+    if from_rate == to_rate or len(samples) == 0:
+        return samples
+    n_out = int(len(samples) * to_rate / from_rate)
+    positions = np.linspace(0, len(samples) - 1, n_out)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+
+
+class AudioOutput:
+    """
+    Persistent output stream that plays PCM clips from memory.
+
+    The stream is opened once and outputs silence between clips, so a clip
+    starts on the next callback block with no device setup. stop() takes
+    effect at the next block boundary and reports exactly how many samples
+    were played.
+
+    Usage:
+        output = AudioOutput(sample_rate=24000)
+        output.start()
+        done = output.play(samples, 24000)
+        ...
+        played = output.stop()      # Barge-in
+        output.close()
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 24000,
+        block_ms: int = 20,
+        on_block: Optional[Callable[[np.ndarray, int, float], None]] = None,
+    ):
+        """
+        Args:
+            sample_rate: Stream sample rate; clips at other rates are resampled
+            block_ms: Callback block length (stop granularity)
+            on_block: Called from the audio thread with (samples, sample_rate,
+                monotonic time the block reaches the speaker), e.g. to feed
+                the barge-in detector's playback reference
+        """
+        self.sample_rate = sample_rate
+        self.blocksize = int(sample_rate * block_ms / 1000)
+        self.on_block = on_block
+
+        self._stream = None
+        self._lock = threading.Lock()
+        self._clip: Optional[np.ndarray] = None
+        self._pos = 0
+        self._on_start: Optional[Callable[[float], None]] = None
+        self._done = threading.Event()
+        self._done.set()
+        self.underflows = 0
+
+    @property
+    def playing(self) -> bool:
+        return not self._done.is_set()
+
+    def start(self) -> None:
+        """Open and start the output stream."""
+        if sd is None:
+            raise RuntimeError("Please install sounddevice: pip install sounddevice")
+        if self._stream is not None:
+            return
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype='int16',
+            blocksize=self.blocksize,
+            latency='low',
+            callback=self._callback,
+        )
+        self._stream.start()
+
+    def close(self) -> None:
+        """Stop playback and close the stream."""
+        self.stop()
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def play(self, samples: np.ndarray, sample_rate: int,
+             on_start: Optional[Callable[[float], None]] = None) -> threading.Event:
+        """
+        Start playing a clip, replacing any clip still playing.
+
+        Args:
+            on_start: Called from the audio thread with the monotonic time
+                the clip's first block reaches the speaker
+
+        Returns:
+            Event set when the clip finishes or is stopped
+        """
+        audio = np.asarray(samples)
+        if audio.ndim > 1:
+            audio = audio[:, 0]
+        if audio.dtype != np.int16:
+            audio = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        audio = resample(audio, sample_rate, self.sample_rate)
+
+        with self._lock:
+            self._done.set()  # Release anyone waiting on the previous clip
+            self._clip = audio
+            self._pos = 0
+            self._on_start = on_start
+            self._done = threading.Event()
+            return self._done
+
+    def stop(self) -> int:
+        """
+        Stop the current clip at the next block boundary.
+
+        Returns:
+            Number of samples of the clip that were played
+        """
+        with self._lock:
+            played = self._pos
+            self._clip = None
+            self._pos = 0
+            self._done.set()
+            return played
+
+    def _callback(self, outdata, frames, time_info, status) -> None:
+        if status and status.output_underflow:
+            self.underflows += 1
+
+        with self._lock:
+            clip = self._clip
+            if clip is None:
+                outdata.fill(0)
+                return
+            on_start = self._on_start if self._pos == 0 else None
+            chunk = clip[self._pos:self._pos + frames]
+            self._pos += len(chunk)
+            if self._pos >= len(clip):
+                self._clip = None
+                self._done.set()
+
+        outdata[:len(chunk), 0] = chunk
+        outdata[len(chunk):].fill(0)
+
+        if (self.on_block or on_start) and len(chunk):
+            # When this block reaches the speaker, on the time.monotonic() clock
+            try:
+                latency = max(0.0, time_info.outputBufferDacTime - time_info.currentTime)
+            except AttributeError:
+                latency = 0.0
+            at = time.monotonic() + latency
+            if on_start:
+                on_start(at)
+            if self.on_block:
+                self.on_block(chunk, self.sample_rate, at)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python audio_io.py <file.mp3>")
+        sys.exit(1)
+
+    with open(sys.argv[1], "rb") as f:
+        samples, sr = decode_audio(f.read())
+    print(f"Decoded {len(samples) / sr:.2f}s at {sr} Hz ({'miniaudio' if MINIAUDIO_AVAILABLE else 'ffmpeg'})")
+
+    output = AudioOutput(sample_rate=sr)
+    output.start()
+    start = time.perf_counter()
+    output.play(samples, sr).wait()
+    print(f"Played in {time.perf_counter() - start:.2f}s ({output.underflows} underflows)")
+    output.close()
@@ -0,0 +1,286 @@
+"""
+Barge-in Detector - Detect user speech during TTS playback for Voice V10.
+
+Runs on the live capture stream (called from the audio callback) instead of
+opening separate recordings. Each capture frame is scored by its RMS after
+subtracting (in the power domain) the expected echo of our own playback,
+estimated from the known playback signal. When enough consecutive frames
+score above threshold the cancel callback fires immediately, from the audio
+thread.
+"""
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+
+@dataclass
+class BargeInConfig:
+    """Configuration for barge-in detection."""
+    sample_rate: int = 16000
+    frame_ms: int = 20               # Scoring frame length
+    threshold: float = 0.03          # Residual RMS that counts as user speech
+    min_frames: int = 2              # Consecutive speech frames before firing
+    echo_coupling: float = 0.5       # Initial mic/playback level ratio (measured at runtime)
+    echo_delay_ms: int = 160         # Max playback -> microphone delay to search
+    calibration_ms: int = 240        # Echo-only calibration at playback start (no triggering)
+    echo_margin: float = 0.5         # Residual must also exceed this fraction of the echo
+    no_reference_factor: float = 3.0  # Threshold multiplier when playback signal is unknown
+
+
+@dataclass
+class BargeInStats:
+    """Counters for tuning barge-in detection."""
+    frames_scored: int = 0
+    triggers: int = 0
+    echo_delay_ms: float = 0.0       # Estimated playback -> microphone delay
+    echo_coupling: float = 0.0       # Estimated mic/playback level ratio
+    last_reaction_ms: float = 0.0    # Speech onset -> cancel signal, in stream time
+
+
+class BargeInDetector:
+    """
+    Frame-level barge-in detector with playback echo subtraction.
+
+    At the start of each playback the detector listens to its own echo for
+    calibration_ms, then fits the speaker-to-microphone delay and level
+    ratio by least squares. From then on each frame's expected echo is
+    removed before thresholding. The fit is kept across utterances, so later
+    phrases are calibrated from their first frame.
+
+    Usage:
+        detector = BargeInDetector(BargeInConfig(), on_barge_in=cancel)
+        detector.arm()                          # TTS started
+        detector.push_reference(pcm, 24000)     # Samples about to be played
+        detector.process(mic_block)             # From the capture callback
+        detector.disarm()                       # TTS finished
+    """
+
+    def __init__(self, config: Optional[BargeInConfig] = None, on_barge_in: Optional[Callable[[], None]] = None):
+        self.config = config or BargeInConfig()
+        self.on_barge_in = on_barge_in
+        self.stats = BargeInStats()
+
+        self._step = self.config.frame_ms / 1000
+        self._frame_len = int(self.config.sample_rate * self._step)
+        self._delays = np.arange(0, self.config.echo_delay_ms / 1000 + 1e-9, self._step / 4)  # Search grid
+        self._lock = threading.Lock()
+
+        self._armed = False
+        self._fired = False
+        self._pending = np.zeros(0, dtype=np.float32)
+
+        # Playback reference: per-frame RMS levels keyed by playback time
+        self._ref_times: list[float] = []
+        self._ref_levels: list[float] = []
+
+        # Echo model
+        self._calibrated = False
+        self._coupling = self.config.echo_coupling
+        self._delay = 0.0                 # Seconds
+        self._calibration: list[tuple[float, float]] = []  # (frame time, mic level)
+
+        # Trigger state
+        self._run = 0                     # Consecutive frames above threshold
+        self._onset: Optional[float] = None
+
+    @property
+    def armed(self) -> bool:
+        return self._armed
+
+    def arm(self) -> None:
+        """Start scoring capture frames (playback started)."""
+        with self._lock:
+            self._armed = True
+            self._fired = False
+            self._pending = np.zeros(0, dtype=np.float32)
+            self._ref_times.clear()
+            self._ref_levels.clear()
+            self._calibration = []
+            self._run = 0
+            self._onset = None
+
+    def disarm(self) -> None:
+        """Stop scoring (playback finished)."""
+        with self._lock:
+            self._armed = False
+
+    def push_reference(self, samples: np.ndarray, sample_rate: int, start_time: Optional[float] = None) -> None:
+        """
+        Register playback samples so their echo can be subtracted.
+
+        Args:
+            samples: Audio that is (about to be) played, int16 or float
+            sample_rate: Sample rate of the playback audio
+            start_time: time.monotonic() when playback of samples starts (default: now)
+        """
+        audio = self._to_float(samples)
+        frame_len = max(1, int(sample_rate * self._step))
+        n_frames = len(audio) // frame_len
+        if n_frames == 0:
+            return
+
+        levels = np.sqrt(np.mean(audio[:n_frames * frame_len].reshape(n_frames, frame_len) ** 2, axis=1))
+        start = start_time if start_time is not None else time.monotonic()
+
+        with self._lock:
+            # Drop reference frames too old to still be echoing
+            horizon = start - self.config.echo_delay_ms / 1000 - 2 * self._step
+            cut = bisect.bisect_left(self._ref_times, horizon)
+            if cut:
+                del self._ref_times[:cut]
+                del self._ref_levels[:cut]
+            # Reference frames are timestamped at frame end, like capture frames
+            self._ref_times.extend(start + (i + 1) * self._step for i in range(n_frames))
+            self._ref_levels.extend(float(level) for level in levels)
+
+    def process(self, block: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """
+        Score a capture block. Call from the audio callback.
+
+        Args:
+            block: Captured samples, int16 or float
+            timestamp: time.monotonic() of the block's last sample (default: now)
+
+        Returns:
+            True if barge-in fired during this block
+        """
+        if not self._armed or self._fired:
+            return False
+
+        audio = self._to_float(block)
+        with self._lock:
+            if len(self._pending):
+                audio = np.concatenate([self._pending, audio])
+            n_frames = len(audio) // self._frame_len
+            self._pending = audio[n_frames * self._frame_len:]
+            if n_frames == 0:
+                return False
+
+            frames = audio[:n_frames * self._frame_len].reshape(n_frames, self._frame_len)
+            levels = np.sqrt(np.mean(frames ** 2, axis=1))
+            end = timestamp if timestamp is not None else time.monotonic()
+
+            for i, level in enumerate(levels):
+                frame_time = end - (n_frames - 1 - i) * self._step
+                if self._score(float(level), frame_time):
+                    self._fired = True
+                    self.stats.triggers += 1
+                    self.stats.last_reaction_ms = (frame_time - self._onset) * 1000 + self.config.frame_ms
+                    break
+
+        if self._fired and self.on_barge_in:
+            self.on_barge_in()
+        return self._fired
+
+    def _score(self, level: float, frame_time: float) -> bool:
+        """Score one frame; returns True when barge-in should fire."""
+        self.stats.frames_scored += 1
+
+        if self._ref_times:
+            if not self._calibrated or len(self._calibration) < self._calibration_frames():
+                # Playback start: assume echo only and fit the echo model
+                self._calibration.append((frame_time, level))
+                if len(self._calibration) >= self._calibration_frames():
+                    self._fit_echo()
+                if not self._calibrated:
+                    return False
+
+            echo = self._coupling * self._reference_level(frame_time - self._delay)
+            # Speech and echo are uncorrelated, so their powers add
+            residual = float(np.sqrt(max(0.0, level ** 2 - echo ** 2)))
+            threshold = max(self.config.threshold, self.config.echo_margin * echo)
+        else:
+            residual = level
+            threshold = self.config.threshold * self.config.no_reference_factor
+
+        if residual > threshold:
+            if self._run == 0:
+                self._onset = frame_time
+            self._run += 1
+        else:
+            self._run = 0
+            self._onset = None
+
+        return self._run >= self.config.min_frames
+
+    def _calibration_frames(self) -> int:
+        return max(1, self.config.calibration_ms // self.config.frame_ms)
+
+    def _fit_echo(self) -> None:
+        """Least-squares fit of echo delay and coupling from calibration frames."""
+        times = [t for t, _ in self._calibration]
+        mic = np.array([level for _, level in self._calibration])
+
+        best = None
+        for delay in self._delays:
+            ref = np.array([self._reference_level(t - delay) for t in times])
+            energy = float(ref @ ref)
+            if energy < 1e-8:
+                continue
+            coupling = float(mic @ ref) / energy
+            error = float(np.sum((mic - coupling * ref) ** 2))
+            if best is None or error < best[0]:
+                best = (error, delay, coupling)
+
+        if best is None:
+            return  # Nothing audible played yet - keep listening
+
+        _, self._delay, coupling = best
+        self._coupling = min(4.0, max(0.0, coupling))
+        self._calibrated = True
+        self.stats.echo_delay_ms = self._delay * 1000
+        self.stats.echo_coupling = self._coupling
+
+    def _reference_level(self, at: float) -> float:
+        """Playback RMS over the frame ending at `at`, interpolated in power between frames."""
+        times = self._ref_times
+        if not times or at <= times[0] - self._step or at >= times[-1] + self._step:
+            return 0.0
+
+        i = bisect.bisect_left(times, at)
+        before = self._ref_levels[i - 1] ** 2 if i > 0 else 0.0
+        after = self._ref_levels[i] ** 2 if i < len(times) else 0.0
+        frac = (at - (times[i] - self._step)) / self._step if i < len(times) else (at - times[-1]) / self._step
+        frac = min(1.0, max(0.0, frac))
+        return float(np.sqrt(before + (after - before) * frac))
+
+    @staticmethod
+    def _to_float(samples: np.ndarray) -> np.ndarray:
+        audio = np.asarray(samples)
+        if audio.ndim > 1:
+            audio = audio[:, 0]
+        if audio.dtype == np.int16:
+            return audio.astype(np.float32) / 32768.0
+        return audio.astype(np.float32)
+
+
+if __name__ == "__main__":
+    # Simulate delayed playback echo with the user talking over it after 1 s
+    sr = 16000
+    fired = []
+    detector = BargeInDetector(BargeInConfig(sample_rate=sr), on_barge_in=lambda: fired.append(True))
+
+    t = np.arange(sr * 2)
+    playback = (np.sin(t * 2 * np.pi * 220 / sr) * (0.3 + 0.2 * np.sin(t * 2 * np.pi * 4 / sr))).astype(np.float32)
+    echo = np.concatenate([np.zeros(960), playback[:-960]]) * 0.8  # 60 ms delay
+
+    detector.arm()
+    start = time.monotonic()
+    detector.push_reference(playback, sr, start_time=start)
+
+    block = int(sr * 0.02)
+    for i in range(0, len(echo), block):
+        mic = echo[i:i + block]
+        if i >= sr:
+            mic = mic + np.random.randn(len(mic)).astype(np.float32) * 0.08  # User speech
+        if detector.process(mic, timestamp=start + (i + block) / sr):
+            print(f"Barge-in at {(i + block) / sr:.2f}s (reaction {detector.stats.last_reaction_ms:.0f} ms)")
+            break
+    else:
+        print("No barge-in detected")
+    print(detector.stats)
@@ -0,0 +1,692 @@
+"""
+Bench - Headless pipeline benchmarks for Voice V10.
+
+Runs VoiceV10 end to end with no audio hardware, network or Claude CLI:
+WAV fixtures are fed through a fake input device, speech is played into a
+fake output sink, a scripted CLI stand-in replays stream-json messages and
+a stub TTS renders tones. Reports per-stage latency and CPU time, and
+microbenchmarks the hot paths (StreamParser.parse_line,
+TTSSummarizer.summarize_for_speech, the VAD loop) against regression
+thresholds.
+
+Usage:
+    python bench.py                            # Synthetic fixtures + microbenchmarks
+    python bench.py --fixtures fixtures/       # *.wav, transcripts in matching *.txt
+    python bench.py --micro-only --baseline bench_baseline.json
+    python bench.py --save-baseline bench_baseline.json
+
+Exits with status 1 when a measurement exceeds its threshold.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import wave
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+import audio_io
+import voice_v10
+from audio_io import resample
+from cli_bridge import ClaudeCLIBridge
+from stream_parser import StreamParser
+from stt_backend import BACKENDS, STTBackend, STTConfig, TranscriptionResult, SAMPLE_RATE
+from tts_summarizer import TTSSummarizer
+from vad import VADSegmenter, VADConfig
+from voice_v10 import VoiceV10, VoiceConfig
+
+
+# Default ceilings (microseconds per call) when no baseline is given
+MICRO_THRESHOLDS_US = {
+    "parse_line": 20.0,
+    "summarize_for_speech": 150.0,
+    "vad_block": 30.0,          # One 20 ms capture block
+}
+
+# Pipeline intervals compared against a baseline (p95)
+PIPELINE_CHECKS = ("endpoint", "stt", "cli_spawn", "first_speakable", "tts", "response")
+PIPELINE_SLACK_MS = 20.0        # Absolute allowance on top of the relative tolerance
+
+# Spoken by the synthetic fixtures; the last one ends the session
+DEFAULT_UTTERANCES = [
+    "add input validation to the signup form",
+    "run the unit tests and summarise the failures",
+    "explain how the session cache works",
+    "goodbye",
+]
+
+
+@dataclass
+class Fixture:
+    """One utterance fed to the pipeline."""
+    name: str
+    audio: np.ndarray               # int16 mono at 16 kHz
+    transcript: str = ""            # What the scripted STT returns for it
+
+
+@dataclass
+class BenchOptions:
+    """Stand-in timings and run control for the pipeline benchmark."""
+    speed: float = 1.0              # Device clock multiplier (2.0 = twice real time)
+    gap_s: float = 1.5              # Silence after each utterance (must exceed vad_silence_ms)
+    settle_s: float = 0.3           # Pipeline must stay idle this long before the next utterance
+    stt_ms: float = 0.0             # Scripted STT decode time
+    cli_spawn_ms: float = 50.0      # Scripted CLI start-up time
+    cli_interval_ms: float = 50.0   # Scripted CLI delay between messages
+    tts_ms: float = 0.0             # Stub TTS synthesis time
+    tts_s_per_word: float = 0.08    # Stub TTS clip length
+    cli_script: Optional[list[dict]] = None  # Messages replayed for every prompt
+    timeout_s: float = 120.0
+    verbose: bool = False
+
+
+# ----------------------------------------------------------------------
+# Fixtures
+# ----------------------------------------------------------------------
+
+def load_wav(path: str) -> np.ndarray:
+    """Load a 16-bit WAV as int16 mono at 16 kHz."""
+    with wave.open(path, "rb") as wav:
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        frames = wav.readframes(wav.getnframes())
+
+    if width != 2:
+        raise RuntimeError(f"{path}: unsupported sample width {width * 8} bits (need 16)")
+    samples = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels)[:, 0]
+    return resample(samples, sample_rate, SAMPLE_RATE).copy()
+
+
+def save_wav(path: str, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> None:
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+
+
+def synth_utterance(text: str, seed: int = 0, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Speech-like test signal for a phrase: voiced harmonics with a syllable
+    envelope, about 0.35 s per word. Not intelligible - for scripted STT.
+    """
+    rng = np.random.default_rng(seed)
+    duration = max(0.5, 0.35 * len(text.split()))
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    pitch = 110 + 40 * rng.random()
+    voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+    syllables = 0.55 + 0.45 * np.sin(2 * np.pi * 4.0 * t + rng.random() * np.pi)
+    ramp = np.minimum(1.0, np.minimum(t, duration - t) / 0.05)
+    signal = (voiced * syllables + 0.05 * rng.standard_normal(len(t))) * ramp
+    return (signal / np.max(np.abs(signal)) * 8000).astype(np.int16)
+
+
+def write_synthetic_fixtures(directory: str, utterances: list[str] = DEFAULT_UTTERANCES) -> None:
+    """Write synthetic utterances as NN_name.wav with NN_name.txt transcripts."""
+    for i, text in enumerate(utterances):
+        stem = os.path.join(directory, f"{i:02d}_{'_'.join(text.split()[:3])}")
+        save_wav(stem + ".wav", synth_utterance(text, seed=i))
+        with open(stem + ".txt", "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+def load_fixtures(directory: str) -> list[Fixture]:
+    """Load *.wav in name order; transcripts come from a matching .txt or the file name."""
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(".wav"):
+            continue
+        stem = os.path.join(directory, name[:-4])
+        transcript = name[:-4].replace("_", " ")
+        if os.path.exists(stem + ".txt"):
+            with open(stem + ".txt", encoding="utf-8") as f:
+                transcript = f.read().strip()
+        fixtures.append(Fixture(name=name, audio=load_wav(stem + ".wav"), transcript=transcript))
+    return fixtures
+
+
+# ----------------------------------------------------------------------
+# Fake audio devices
+# ----------------------------------------------------------------------
+
+class FixtureFeed:
+    """
+    Capture source: each fixture followed by silence, then silence until the
+    pipeline has been idle for settle_s, like a user waiting for the answer.
+    """
+
+    def __init__(self, fixtures: list[Fixture], gap_s: float, settle_s: float, is_idle: Callable[[], bool]):
+        self._pending = list(fixtures)
+        self._gap = int(gap_s * SAMPLE_RATE)
+        self._settle_s = settle_s
+        self._is_idle = is_idle
+        self._buffer = np.zeros(0, dtype=np.int16)
+        self._idle_since: Optional[float] = None
+        self.done = threading.Event()   # All fixtures fed and answered
+
+    def read(self, frames: int) -> np.ndarray:
+        if len(self._buffer) < frames and not self.done.is_set() and self._ready_for_next():
+            if self._pending:
+                fixture = self._pending.pop(0)
+                self._buffer = np.concatenate([self._buffer, fixture.audio, np.zeros(self._gap, np.int16)])
+            else:
+                self.done.set()
+
+        block = np.zeros(frames, dtype=np.int16)
+        n = min(frames, len(self._buffer))
+        block[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return block.reshape(-1, 1)
+
+    def _ready_for_next(self) -> bool:
+        if len(self._buffer):
+            return False
+        if not self._is_idle():
+            self._idle_since = None
+            return False
+        now = time.monotonic()
+        if self._idle_since is None:
+            self._idle_since = now
+        return now - self._idle_since >= self._settle_s
+
+
+class _FakeStream:
+    """Paced callback thread shared by the fake input and output streams."""
+
+    def __init__(self, samplerate, blocksize, callback, speed: float = 1.0, **kwargs):
+        self.samplerate = samplerate
+        self.blocksize = blocksize or int(samplerate * 0.02)
+        self.callback = callback
+        self.speed = speed
+        self.blocks = 0
+        self.cpu_s = 0.0                # Thread CPU time spent in the callback
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        period = self.blocksize / self.samplerate / self.speed
+        deadline = time.monotonic()
+        while not self._stopped.is_set():
+            start = time.thread_time()
+            self._tick()
+            self.cpu_s += time.thread_time() - start
+            self.blocks += 1
+            # Pace against a running deadline so the device clock doesn't drift
+            deadline += period
+            self._stopped.wait(max(0.0, deadline - time.monotonic()))
+
+    def _tick(self) -> None:
+        raise NotImplementedError
+
+
+class FakeInputStream(_FakeStream):
+    """sounddevice.InputStream stand-in reading blocks from a FixtureFeed."""
+
+    def __init__(self, feed: FixtureFeed, **kwargs):
+        super().__init__(**kwargs)
+        self.feed = feed
+
+    def _tick(self) -> None:
+        self.callback(self.feed.read(self.blocksize), self.blocksize, None, None)
+
+
+class FakeOutputStream(_FakeStream):
+    """sounddevice.OutputStream stand-in that discards audio, counting what was played."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.played_samples = 0
+        self._time_info = types.SimpleNamespace(currentTime=0.0, outputBufferDacTime=0.0)
+
+    def _tick(self) -> None:
+        outdata = np.zeros((self.blocksize, 1), dtype=np.int16)
+        self.callback(outdata, self.blocksize, self._time_info, None)
+        self.played_samples += int(np.count_nonzero(outdata))
+
+
+class FakeSoundDevice:
+    """The parts of the sounddevice module VoiceV10 uses, backed by fake streams."""
+
+    def __init__(self, feed: FixtureFeed, speed: float = 1.0):
+        self.feed = feed
+        self.speed = speed
+        self.inputs: list[FakeInputStream] = []
+        self.outputs: list[FakeOutputStream] = []
+
+    def InputStream(self, **kwargs) -> FakeInputStream:
+        stream = FakeInputStream(self.feed, speed=self.speed, **kwargs)
+        self.inputs.append(stream)
+        return stream
+
+    def OutputStream(self, **kwargs) -> FakeOutputStream:
+        stream = FakeOutputStream(speed=self.speed, **kwargs)
+        self.outputs.append(stream)
+        return stream
+
+
+@contextlib.contextmanager
+def fake_devices(device: FakeSoundDevice):
+    """Route VoiceV10's capture and playback through fake devices."""
+    saved = voice_v10.sd, audio_io.sd
+    voice_v10.sd = audio_io.sd = device
+    try:
+        yield device
+    finally:
+        voice_v10.sd, audio_io.sd = saved
+
+
+# ----------------------------------------------------------------------
+# Stand-ins for STT, the Claude CLI and TTS
+# ----------------------------------------------------------------------
+
+class ScriptedSTT(STTBackend):
+    """STT stand-in returning fixture transcripts in order."""
+
+    name = "scripted"
+
+    def __init__(self, config: STTConfig):
+        super().__init__(config)
+        self.transcripts: list[str] = []
+        self.decode_s = 0.0
+        self.cpu_s = 0.0
+
+    def _transcribe_full(self, audio, language) -> TranscriptionResult:
+        return self._next()
+
+    def _transcribe_short(self, audio, language) -> TranscriptionResult:
+        return self._next()
+
+    def _next(self) -> TranscriptionResult:
+        if self.decode_s:
+            time.sleep(self.decode_s)
+        text = self.transcripts.pop(0) if self.transcripts else ""
+        return TranscriptionResult(text=text, language=self.config.language)
+
+
+BACKENDS[ScriptedSTT.name] = ScriptedSTT
+
+
+def default_cli_script(prompt: str) -> list[dict]:
+    """A typical stream-json turn: a tool call, its result and an answer."""
+    return [
+        {"type": "system", "subtype": "init", "session_id": "bench"},
+        {"type": "assistant", "message": {"content": [{"type": "text", "text": f"Let me look into that: {prompt}."}]}},
+        {"type": "tool_use", "tool": "Read", "input": {"file_path": "/repo/src/session/cache.py"}},
+        {"type": "tool_result", "result": "\n".join(f"    line {i}: value = compute({i})" for i in range(60))},
+        {"type": "tool_use", "tool": "Grep", "input": {"pattern": "SessionCache"}},
+        {"type": "tool_result", "result": "src/session/cache.py:12: class SessionCache:\nsrc/app.py:40: cache = SessionCache()"},
+        {"type": "assistant", "message": {"content": [{"type": "text", "text": (
+            "The session cache keeps recent sessions in memory and writes them through to Redis. "
+            "Entries expire after thirty minutes.\n```python\ncache.get(key)\n```\nWant me to add tests?"
+        )}]}},
+        {"type": "result", "subtype": "success", "result": "Done.", "duration_ms": 4200},
+    ]
+
+
+class ScriptedCLI(ClaudeCLIBridge):
+    """Claude CLI stand-in replaying stream-json messages with fixed delays."""
+
+    def __init__(self, script: Optional[list[dict]] = None, spawn_s: float = 0.05, interval_s: float = 0.05):
+        super().__init__(session_id="bench")
+        self.script = script
+        self.spawn_s = spawn_s
+        self.interval_s = interval_s
+        self.runs = 0
+        self._active = False
+
+    async def execute(self, prompt: str):
+        self._cancelled = False
+        self.spawned_at = None
+        self.first_output_at = None
+        self.runs += 1
+        self._active = True
+        try:
+            await asyncio.sleep(self.spawn_s)
+            self.spawned_at = time.monotonic()
+            for message in self.script or default_cli_script(prompt):
+                await asyncio.sleep(self.interval_s)
+                if self._cancelled:
+                    break
+                if self.first_output_at is None:
+                    self.first_output_at = time.monotonic()
+                yield message
+        finally:
+            self._active = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    @property
+    def is_running(self) -> bool:
+        return self._active
+
+
+class HeadlessVoice(VoiceV10):
+    """VoiceV10 with scripted STT, a scripted CLI and a stub TTS rendering tones."""
+
+    def __init__(self, config: VoiceConfig, fixtures: list[Fixture], options: BenchOptions):
+        self._options = options
+        super().__init__(config)
+        self._pipeline.track_cpu = True
+        self._cli = ScriptedCLI(
+            script=options.cli_script,
+            spawn_s=options.cli_spawn_ms / 1000,
+            interval_s=options.cli_interval_ms / 1000,
+        )
+        if isinstance(self._stt, ScriptedSTT):
+            self._stt.transcripts = [f.transcript for f in fixtures]
+            self._stt.decode_s = options.stt_ms / 1000
+
+        # STT runs in the executor: time the calling thread's CPU
+        self.stt_cpu_s = 0.0
+        transcribe = self._stt.transcribe
+
+        def timed_transcribe(*args, **kwargs):
+            start = time.thread_time()
+            try:
+                return transcribe(*args, **kwargs)
+            finally:
+                self.stt_cpu_s += time.thread_time() - start
+
+        self._stt.transcribe = timed_transcribe
+
+    def _init_tts(self) -> None:
+        self._tts_engine = "stub"
+        self._render_audio = True
+
+    async def _render(self, text: str) -> tuple[np.ndarray, int]:
+        if self._options.tts_ms:
+            await asyncio.sleep(self._options.tts_ms / 1000)
+        sample_rate = self.config.tts_sample_rate
+        duration = min(2.0, max(0.2, self._options.tts_s_per_word * len(text.split())))
+        t = np.arange(int(duration * sample_rate)) / sample_rate
+        return (np.sin(2 * np.pi * 220 * t) * 6000).astype(np.int16), sample_rate
+
+
+# ----------------------------------------------------------------------
+# Pipeline benchmark
+# ----------------------------------------------------------------------
+
+async def run_pipeline(fixtures: list[Fixture], options: BenchOptions, config: Optional[VoiceConfig] = None) -> dict:
+    """
+    Feed fixtures through a HeadlessVoice and collect latency and CPU metrics.
+
+    Returns:
+        Results dict: tracer snapshot (latency percentiles, per-stage pipeline
+        metrics), CPU seconds per component and run totals
+    """
+    config = config or VoiceConfig(
+        stt_backend=ScriptedSTT.name,
+        tts_cache=False,
+        enable_barge_in=False,      # The fake sink has no echo path to cancel
+        local_intents=False,        # Keep fixture prompts on the CLI path
+        usage_path=None,            # Scripted turns stay out of the user's usage log
+        transcript_path=None,       # ...and out of their session history
+    )
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if options.verbose else output):
+        voice = HeadlessVoice(config, fixtures, options)
+    feed = FixtureFeed(fixtures, options.gap_s, options.settle_s, voice._idle.is_set)
+    device = FakeSoundDevice(feed, speed=options.speed)
+
+    async def stop_when_fed():
+        while not feed.done.is_set():
+            await asyncio.sleep(0.05)
+        voice.stop()
+
+    wall = time.monotonic()
+    cpu = time.process_time()
+    timed_out = False
+    with fake_devices(device):
+        watcher = asyncio.create_task(stop_when_fed())
+        try:
+            with contextlib.redirect_stdout(sys.stdout if options.verbose else output):
+                await asyncio.wait_for(voice.run(), options.timeout_s)
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            watcher.cancel()
+    wall = time.monotonic() - wall
+    cpu = time.process_time() - cpu
+
+    snapshot = voice._tracer.snapshot()
+    stages = snapshot.pop("pipeline", {})
+    return {
+        "fixtures": len(fixtures),
+        "timed_out": timed_out,
+        "wall_s": round(wall, 3),
+        "process_cpu_s": round(cpu, 4),
+        "cli_runs": voice._cli.runs,
+        "played_s": round(sum(s.played_samples for s in device.outputs) / config.tts_sample_rate, 2),
+        "cpu_s": {
+            **{f"stage:{name}": m["cpu_s"] for name, m in stages.items()},
+            "capture_callback": round(sum(s.cpu_s for s in device.inputs), 4),
+            "output_callback": round(sum(s.cpu_s for s in device.outputs), 4),
+            "stt_thread": round(voice.stt_cpu_s, 4),
+        },
+        "stages": stages,
+        **snapshot,
+    }
+
+
+# ----------------------------------------------------------------------
+# Microbenchmarks
+# ----------------------------------------------------------------------
+
+def _per_call_us(fn: Callable[[], int], repeat: int = 5, min_time: float = 0.1) -> float:
+    """Best-of-repeat microseconds per item; fn runs one batch and returns its item count."""
+    best = float("inf")
+    for _ in range(repeat):
+        items = 0
+        start = time.perf_counter()
+        while True:
+            items += fn()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / items * 1e6)
+    return best
+
+
+def run_microbenchmarks() -> dict[str, float]:
+    """Microseconds per call for the per-message and per-block hot paths."""
+    parser = StreamParser()
+    summarizer = TTSSummarizer()
+    messages = default_cli_script("benchmark the summariser") + [
+        {"type": "tool_result", "result": "\n".join(f"src/module_{i}/file_{i}.py" for i in range(40))},
+        {"type": "tool_result", "result": "FAILED tests/test_api.py::test_login - AssertionError", "is_error": True},
+        {"type": "tool_use", "tool": "Bash", "input": {"command": "npm test -- --run"}},
+    ]
+    parsed = [parser.parse_line(m) for m in messages]
+
+    def parse_batch() -> int:
+        for m in messages:
+            parser.parse_line(m)
+        return len(messages)
+
+    def summarize_batch() -> int:
+        for p in parsed:
+            summarizer.summarize_for_speech(p)
+        return len(parsed)
+
+    # 10 s of capture: speech bursts and pauses in 20 ms blocks
+    block = SAMPLE_RATE // 50
+    speech = synth_utterance("one two three four five six")
+    stream = np.concatenate([speech, np.zeros(SAMPLE_RATE, np.int16)] * 4)
+    blocks = [stream[i:i + block].reshape(-1, 1) for i in range(0, len(stream) - block + 1, block)]
+    vad = VADSegmenter(VADConfig())
+
+    def vad_batch() -> int:
+        vad.reset()
+        for b in blocks:
+            vad.push(b)
+        return len(blocks)
+
+    return {
+        "parse_line": _per_call_us(parse_batch),
+        "summarize_for_speech": _per_call_us(summarize_batch),
+        "vad_block": _per_call_us(vad_batch),
+    }
+
+
+# ----------------------------------------------------------------------
+# Thresholds and reporting
+# ----------------------------------------------------------------------
+
+def check_regressions(micro: dict, pipeline: Optional[dict], baseline: Optional[dict], tolerance: float) -> list[str]:
+    """
+    Compare results with the baseline (or the default ceilings).
+
+    Returns:
+        One message per measurement over its threshold
+    """
+    failures = []
+    base_micro = (baseline or {}).get("micro_us", {})
+    for name, us in micro.items():
+        limit = base_micro[name] * (1 + tolerance) if name in base_micro else MICRO_THRESHOLDS_US.get(name)
+        if limit is not None and us > limit:
+            failures.append(f"{name}: {us:.2f} us > {limit:.2f} us")
+
+    base_latency = (baseline or {}).get("latency_p95_ms", {})
+    if pipeline:
+        if pipeline["timed_out"]:
+            failures.append("pipeline: timed out")
+        for name in PIPELINE_CHECKS:
+            stats = pipeline["latency_ms"].get(name)
+            if stats and name in base_latency:
+                limit = base_latency[name] * (1 + tolerance) + PIPELINE_SLACK_MS
+                if stats["p95"] > limit:
+                    failures.append(f"{name} p95: {stats['p95']:.0f} ms > {limit:.0f} ms")
+    return failures
+
+
+def make_baseline(micro: dict, pipeline: Optional[dict]) -> dict:
+    baseline = {"micro_us": {name: round(us, 3) for name, us in micro.items()}}
+    if pipeline:
+        baseline["latency_p95_ms"] = {
+            name: stats["p95"] for name, stats in pipeline["latency_ms"].items() if name in PIPELINE_CHECKS
+        }
+    return baseline
+
+
+def format_report(micro: dict, pipeline: Optional[dict]) -> str:
+    lines = []
+    if pipeline:
+        lines.append(
+            f"Pipeline: {pipeline['fixtures']} fixtures, {pipeline['turns']} turns, "
+            f"{pipeline['cli_runs']} CLI runs, {pipeline['played_s']:.1f}s played, "
+            f"{pipeline['wall_s']:.1f}s wall, {pipeline['process_cpu_s']:.2f}s CPU"
+            + (" (TIMED OUT)" if pipeline["timed_out"] else "")
+        )
+        lines.append(f"\n  {'latency (ms)':16} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for name, s in pipeline["latency_ms"].items():
+            lines.append(f"  {name:16} {s['count']:5} {s['p50']:8.1f} {s['p95']:8.1f} {s['p99']:8.1f}")
+        lines.append(f"\n  {'CPU':16} {'ms':>8}")
+        for name, seconds in pipeline["cpu_s"].items():
+            lines.append(f"  {name:16} {seconds * 1000:8.1f}")
+        lines.append("")
+
+    lines.append(f"  {'microbenchmark':22} {'us/call':>9} {'ceiling':>9}")
+    for name, us in micro.items():
+        ceiling = MICRO_THRESHOLDS_US.get(name)
+        lines.append(f"  {name:22} {us:9.2f} {ceiling:9.1f}" if ceiling else f"  {name:22} {us:9.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless Voice V10 pipeline benchmarks")
+    parser.add_argument("--fixtures", help="Directory of 16-bit WAV fixtures (default: synthetic)")
+    parser.add_argument("--cli-script", help="JSONL of stream-json messages replayed for every prompt")
+    parser.add_argument("--speed", type=float, default=1.0, help="Device clock multiplier")
+    parser.add_argument("--stt-ms", type=float, default=0.0, help="Scripted STT decode time")
+    parser.add_argument("--cli-ms", type=float, default=50.0, help="Scripted CLI delay per message")
+    parser.add_argument("--tts-ms", type=float, default=0.0, help="Stub TTS synthesis time")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--micro-only", action="store_true", help="Skip the pipeline run")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", help="Write results as a new baseline")
+    parser.add_argument("--json", help="Write full results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's console output")
+    args = parser.parse_args(argv)
+
+    pipeline = None
+    if not args.micro_only:
+        options = BenchOptions(
+            speed=args.speed,
+            stt_ms=args.stt_ms,
+            cli_interval_ms=args.cli_ms,
+            tts_ms=args.tts_ms,
+            timeout_s=args.timeout,
+            verbose=args.verbose,
+        )
+        if args.cli_script:
+            with open(args.cli_script, encoding="utf-8") as f:
+                options.cli_script = [json.loads(line) for line in f if line.strip()]
+
+        if args.fixtures:
+            fixtures = load_fixtures(args.fixtures)
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                write_synthetic_fixtures(tmp)
+                fixtures = load_fixtures(tmp)
+        if not fixtures:
+            print("No fixtures found")
+            return 1
+        pipeline = asyncio.run(run_pipeline(fixtures, options))
+
+    micro = run_microbenchmarks()
+    print(format_report(micro, pipeline))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    failures = check_regressions(micro, pipeline, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(make_baseline(micro, pipeline), f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"micro_us": micro, "pipeline": pipeline}, f, indent=2)
+
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Capture Process - Microphone capture outside the inference process for Voice V10.
+
+The sounddevice callback normally runs on a thread of the process that also
+runs Whisper, so it competes for the GIL with transcription; when it loses,
+PortAudio reports input overflow and frames are dropped. Here the stream
+lives in a small dedicated process that copies each block into a
+multiprocessing.shared_memory ring buffer. The main process reads blocks as
+numpy views straight out of the ring - nothing is pickled or piped - and
+keeps up whenever it gets a moment, since the ring holds buffer_s of audio.
+
+Layout of the shared segment:
+    header  8 x int64: write position (frames), input overflows,
+            input underflows, callbacks
+    ring    capacity frames x channels of int16 (a whole number of blocks)
+"""
+
+import multiprocessing as mp
+import sys
+from dataclasses import dataclass, asdict
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+_WRITE_POS = 0
+_OVERFLOWS = 1
+_UNDERFLOWS = 2
+_CALLBACKS = 3
+_HEADER_WORDS = 8
+
+
+@dataclass
+class CaptureConfig:
+    """Configuration for the capture process."""
+    sample_rate: int = 16000
+    channels: int = 1
+    block_ms: int = 20               # Callback block; reads are whole blocks
+    buffer_s: float = 10.0           # Ring size: how far the reader may fall behind
+    device: Optional[int] = None     # sounddevice input device (None = default)
+    high_priority: bool = True       # Raise the capture process's scheduling priority
+
+    @property
+    def block_frames(self) -> int:
+        return self.sample_rate * self.block_ms // 1000
+
+
+@dataclass
+class CaptureStats:
+    """Counters for the capture ring."""
+    frames: int = 0                  # Frames handed to the reader
+    input_overflows: int = 0         # PortAudio: input arrived faster than the callback ran
+    input_underflows: int = 0        # PortAudio: callback ran without enough input
+    dropped_frames: int = 0          # Overwritten before the reader got to them
+
+    def summary(self) -> str:
+        return (
+            f"{self.frames} frames read, {self.input_overflows} overflows, "
+            f"{self.input_underflows} underflows, {self.dropped_frames} frames dropped"
+        )
+
+
+def _raise_priority() -> None:
+    """Best effort: capture should win the CPU over inference."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            HIGH_PRIORITY_CLASS = 0x00000080
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), HIGH_PRIORITY_CLASS)
+        else:
+            import os
+            os.nice(-5)
+    except (OSError, AttributeError):
+        pass
+
+
+def _write_ring(header: np.ndarray, ring: np.ndarray, indata: np.ndarray) -> None:
+    """Append a captured block to the ring, wrapping at its end, then publish it."""
+    capacity = len(ring)
+    frames = len(indata)
+    pos = int(header[_WRITE_POS])
+    start = pos % capacity
+    first = min(frames, capacity - start)
+    ring[start:start + first] = indata[:first]
+    if first < frames:
+        ring[:frames - first] = indata[first:]
+    header[_CALLBACKS] += 1
+    header[_WRITE_POS] = pos + frames  # Publish only after the data is in place
+
+
+def _capture_main(shm_name: str, config: CaptureConfig, capacity: int, stop, status) -> None:
+    """Capture process entry point: stream the microphone into the ring until stop is set."""
+    try:
+        import sounddevice as sd
+    except (ImportError, OSError):
+        status.put("Please install sounddevice: pip install sounddevice")
+        return
+
+    if config.high_priority:
+        _raise_priority()
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+    ring = np.ndarray((capacity, config.channels), dtype=np.int16, buffer=shm.buf, offset=header.nbytes)
+
+    def callback(indata, frames, time_info, flags):
+        if flags.input_overflow:
+            header[_OVERFLOWS] += 1
+        if flags.input_underflow:
+            header[_UNDERFLOWS] += 1
+        _write_ring(header, ring, indata)
+
+    try:
+        stream = sd.InputStream(
+            samplerate=config.sample_rate,
+            channels=config.channels,
+            dtype='int16',
+            blocksize=config.block_frames,
+            device=config.device,
+            callback=callback,
+        )
+        stream.start()
+    except Exception as e:
+        status.put(f"Could not open microphone: {e}")
+        del header, ring
+        shm.close()
+        return
+
+    status.put(None)
+    try:
+        stop.wait()
+    finally:
+        stream.stop()
+        stream.close()
+        del header, ring
+        shm.close()
+
+
+class CaptureProcess:
+    """
+    Microphone capture in a child process, read zero-copy from shared memory.
+
+    Usage:
+        capture = CaptureProcess(CaptureConfig(sample_rate=16000))
+        capture.start()
+        for block in capture.read():     # Views into the ring, frames x channels
+            process(block)
+        print(capture.stats.summary())
+        capture.close()
+    """
+
+    def __init__(self, config: Optional[CaptureConfig] = None):
+        self.config = config or CaptureConfig()
+        self._block = self.config.block_frames
+        blocks = max(2, int(self.config.buffer_s * 1000 / self.config.block_ms))
+        self._capacity = blocks * self._block
+        self._read_pos = 0
+        self._dropped = 0
+        self._final: Optional[CaptureStats] = None  # Counters kept after close()
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._header: Optional[np.ndarray] = None
+        self._ring: Optional[np.ndarray] = None
+        self._process = None
+        self._stop = None
+
+    def start(self, timeout: float = 10.0) -> None:
+        """
+        Start the capture process and wait for the stream to open.
+
+        Raises:
+            RuntimeError: sounddevice missing or the device could not be opened
+        """
+        self._allocate()
+        ctx = mp.get_context("spawn")  # Same behaviour on Windows and POSIX; no inherited model
+        self._stop = ctx.Event()
+        status = ctx.Queue(1)
+        self._process = ctx.Process(
+            target=_capture_main,
+            args=(self._shm.name, self.config, self._capacity, self._stop, status),
+            name="voice-capture",
+            daemon=True,
+        )
+        self._process.start()
+        try:
+            error = status.get(timeout=timeout)
+        except Exception:
+            error = "Capture process did not start"
+        if error:
+            self.close()
+            raise RuntimeError(error)
+
+    def _allocate(self) -> None:
+        """Create the shared segment, zero the header and map the ring."""
+        header_bytes = _HEADER_WORDS * 8
+        ring_bytes = self._capacity * self.config.channels * 2
+        self._shm = shared_memory.SharedMemory(create=True, size=header_bytes + ring_bytes)
+        self._header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=self._shm.buf)
+        self._header[:] = 0
+        self._ring = np.ndarray((self._capacity, self.config.channels), dtype=np.int16,
+                                buffer=self._shm.buf, offset=header_bytes)
+        self._read_pos = 0
+        self._dropped = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def read(self) -> list[np.ndarray]:
+        """
+        Take every complete block written since the last read.
+
+        Returns:
+            Blocks as (block_frames, channels) int16 views into the ring.
+            A view stays valid until the writer comes round again (buffer_s);
+            copy anything kept longer.
+        """
+        if self._header is None:
+            return []
+        write = int(self._header[_WRITE_POS])
+        # Leave the block after the write position alone: the writer may be filling it
+        if write - self._read_pos > self._capacity - self._block:
+            skip_to = write - (self._capacity // 2 // self._block) * self._block
+            self._dropped += skip_to - self._read_pos
+            self._read_pos = skip_to
+
+        blocks = []
+        while write - self._read_pos >= self._block:
+            start = self._read_pos % self._capacity
+            if start + self._block <= self._capacity:
+                blocks.append(self._ring[start:start + self._block])
+            else:  # Straddles the end (only if the driver delivered odd-sized blocks)
+                head = self._capacity - start
+                blocks.append(np.concatenate([self._ring[start:], self._ring[:self._block - head]]))
+            self._read_pos += self._block
+        return blocks
+
+    @property
+    def stats(self) -> CaptureStats:
+        if self._header is None:
+            return self._final or CaptureStats()
+        return CaptureStats(
+            frames=self._read_pos - self._dropped,
+            input_overflows=int(self._header[_OVERFLOWS]),
+            input_underflows=int(self._header[_UNDERFLOWS]),
+            dropped_frames=self._dropped,
+        )
+
+    def snapshot(self) -> dict:
+        """Counters as a JSON-friendly dict (for the metrics endpoint)."""
+        return {**asdict(self.stats), "alive": self.alive}
+
+    def close(self) -> None:
+        """Stop the capture process and release the shared memory."""
+        if self._stop is not None:
+            self._stop.set()
+        if self._process is not None:
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if self._shm is not None:
+            final = self.stats
+            self._header = self._ring = None  # Views must go before the segment can close
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            self._final = final
+
+    def __enter__(self) -> "CaptureProcess":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    import time
+
+    # Read while the main process hogs the CPU; the capture process keeps up
+    with CaptureProcess(CaptureConfig(buffer_s=5.0)) as capture:
+        print("Capturing 5 s with a busy reader...")
+        end = time.monotonic() + 5
+        peak = 0.0
+        while time.monotonic() < end:
+            burn = time.monotonic() + 0.5
+            while time.monotonic() < burn:
+                sum(i * i for i in range(1000))
+            for block in capture.read():
+                peak = max(peak, float(np.abs(block).max()) / 32768)
+        print(f"Peak level {peak:.2f}; {capture.stats.summary()}")
@@ -7,6 +7,7 @@ Supports session management and barge-in interruption.
 
 import asyncio
 import json
+import time
 import uuid
 from typing import AsyncIterator, Optional
 from dataclasses import dataclass
@@ -39,6 +40,10 @@ class ClaudeCLIBridge:
         self._process: Optional[asyncio.subprocess.Process] = None
         self._cancelled = False
 
+        # time.monotonic() of the current execution's spawn and first output line
+        self.spawned_at: Optional[float] = None
+        self.first_output_at: Optional[float] = None
+
     async def execute(self, prompt: str) -> AsyncIterator[dict]:
         """
         Execute a prompt via Claude CLI and stream JSON responses.
@@ -50,6 +55,8 @@ class ClaudeCLIBridge:
             Parsed JSON messages from CLI output (assistant, tool_use, tool_result, result)
         """
         self._cancelled = False
+        self.spawned_at = None
+        self.first_output_at = None
 
         # Build command
         cmd = [
@@ -88,6 +95,8 @@ class ClaudeCLIBridge:
                     cwd=self.config.working_directory,
                 )
 
+            self.spawned_at = time.monotonic()
+
             # Stream stdout line by line
             while True:
                 if self._cancelled:
@@ -96,6 +105,8 @@ class ClaudeCLIBridge:
                 line = await self._process.stdout.readline()
                 if not line:
                     break
+                if self.first_output_at is None:
+                    self.first_output_at = time.monotonic()
 
                 # Parse JSON line
                 try:
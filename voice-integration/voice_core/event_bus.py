@@ -0,0 +1,231 @@
+"""
+Event Bus - Parse-once fan-out of CLI stream messages for Voice V10.
+
+The CLI reader parses each stream-json line once and publishes it; every
+consumer (console output, speech, usage accounting, a UI, a logger) is a
+subscriber with its own bounded queue and task. A subscriber's drop policy
+decides what happens when it falls behind: only subscribers that should
+hold back the stream (speech, for backpressure) block the publisher; the
+rest drop messages rather than stall TTS or stdout reading. Each
+subscriber's queue depth, drops and lag (publish to handling) are tracked.
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional, Union
+
+
+class DropPolicy(Enum):
+    """What publish() does when a subscriber's queue is full."""
+    BLOCK = "block"                  # Wait for room (backpressure on the publisher)
+    DROP_OLDEST = "drop_oldest"      # Discard the oldest queued event
+    DROP_NEWEST = "drop_newest"      # Discard the event being published
+
+
+@dataclass
+class SubscriberStats:
+    """Delivery counters for one subscriber."""
+    delivered: int = 0
+    dropped: int = 0
+    errors: int = 0
+    max_depth: int = 0
+    lag_ms: float = 0.0              # Publish -> handler start, most recent event
+    max_lag_ms: float = 0.0
+    busy_s: float = 0.0              # Time spent in the handler
+
+
+Handler = Callable[[Any], Union[None, Awaitable[None]]]
+
+
+class Subscription:
+    """One subscriber: a bounded queue drained by its own task."""
+
+    def __init__(self, name: str, handler: Handler, maxsize: int, policy: DropPolicy,
+                 kinds: Optional[set[str]]):
+        self.name = name
+        self.handler = handler
+        self.policy = policy
+        self.kinds = kinds
+        self.stats = SubscriberStats()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.task: Optional[asyncio.Task] = None
+        self._is_async = inspect.iscoroutinefunction(handler)
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def wants(self, kind: Optional[str]) -> bool:
+        return self.kinds is None or kind in self.kinds
+
+    async def run(self) -> None:
+        """Deliver queued events to the handler until cancelled."""
+        while True:
+            published_at, event = await self.queue.get()
+            start = time.monotonic()
+            lag = (start - published_at) * 1000
+            self.stats.lag_ms = lag
+            self.stats.max_lag_ms = max(self.stats.max_lag_ms, lag)
+            try:
+                result = self.handler(event)
+                if self._is_async:
+                    await result
+                self.stats.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.errors += 1
+                print(f"\n[Event subscriber '{self.name}' failed: {e}]")
+            finally:
+                self.stats.busy_s += time.monotonic() - start
+                self.queue.task_done()
+
+    def snapshot(self) -> dict:
+        return {
+            "policy": self.policy.value,
+            "queue_depth": self.depth,
+            "max_queue_depth": self.stats.max_depth,
+            "delivered": self.stats.delivered,
+            "dropped": self.stats.dropped,
+            "errors": self.stats.errors,
+            "lag_ms": round(self.stats.lag_ms, 1),
+            "max_lag_ms": round(self.stats.max_lag_ms, 1),
+            "busy_s": round(self.stats.busy_s, 3),
+        }
+
+
+class EventBus:
+    """
+    Async publish/subscribe with per-subscriber bounded queues.
+
+    Usage:
+        bus = EventBus()
+        bus.subscribe("speech", speak, maxsize=4, policy=DropPolicy.BLOCK)
+        bus.subscribe("log", write_log, kinds={"result", "error"})
+        await bus.publish("assistant", parsed)
+        await bus.join("speech")         # Wait until speech has seen everything
+        bus.close()
+    """
+
+    def __init__(self):
+        self.subscriptions: dict[str, Subscription] = {}
+
+    def subscribe(self, name: str, handler: Handler, maxsize: int = 100,
+                  policy: DropPolicy = DropPolicy.DROP_OLDEST,
+                  kinds: Optional[set[str]] = None) -> Subscription:
+        """
+        Add a subscriber (sync or async handler, called with each event).
+
+        Args:
+            name: Unique subscriber name (shown in metrics)
+            maxsize: Queue bound
+            policy: What to do when the queue is full
+            kinds: Only events published with one of these kinds (None = all)
+
+        The delivery task starts on the running loop, or on the next publish.
+        """
+        if name in self.subscriptions:
+            raise ValueError(f"Subscriber '{name}' already exists")
+        subscription = Subscription(name, handler, maxsize, policy, kinds)
+        self.subscriptions[name] = subscription
+        self._start(subscription)
+        return subscription
+
+    def unsubscribe(self, name: str) -> None:
+        subscription = self.subscriptions.pop(name, None)
+        if subscription and subscription.task:
+            subscription.task.cancel()
+
+    def _start(self, subscription: Subscription) -> None:
+        if subscription.task is None or subscription.task.done():
+            try:
+                subscription.task = asyncio.get_running_loop().create_task(
+                    subscription.run(), name=f"bus:{subscription.name}")
+            except RuntimeError:
+                pass  # No loop yet
+
+    async def publish(self, kind: Optional[str], event: Any) -> None:
+        """
+        Deliver an event to every interested subscriber.
+
+        Only waits when a BLOCK subscriber's queue is full.
+        """
+        published_at = time.monotonic()
+        for subscription in list(self.subscriptions.values()):
+            if not subscription.wants(kind):
+                continue
+            self._start(subscription)
+            queue = subscription.queue
+            if queue.full():
+                if subscription.policy == DropPolicy.BLOCK:
+                    await queue.put((published_at, event))
+                    continue
+                subscription.stats.dropped += 1
+                if subscription.policy == DropPolicy.DROP_NEWEST:
+                    continue
+                queue.get_nowait()
+                queue.task_done()
+            queue.put_nowait((published_at, event))
+            subscription.stats.max_depth = max(subscription.stats.max_depth, queue.qsize())
+
+    async def join(self, *names: str) -> None:
+        """Wait until the named subscribers (default: all) have handled everything published."""
+        for name in names or list(self.subscriptions):
+            subscription = self.subscriptions.get(name)
+            if subscription and subscription.task and not subscription.task.done():
+                await subscription.queue.join()
+
+    def clear(self, name: str) -> None:
+        """Discard a subscriber's queued events (e.g. speech for a cancelled turn)."""
+        subscription = self.subscriptions.get(name)
+        while subscription and not subscription.queue.empty():
+            subscription.queue.get_nowait()
+            subscription.queue.task_done()
+            subscription.stats.dropped += 1
+
+    def close(self) -> None:
+        """Stop every delivery task; queued events are discarded."""
+        for subscription in self.subscriptions.values():
+            if subscription.task:
+                subscription.task.cancel()
+                subscription.task = None
+
+    def snapshot(self) -> dict:
+        """Per-subscriber lag and drops (for the metrics endpoint)."""
+        return {name: s.snapshot() for name, s in self.subscriptions.items()}
+
+    def summary(self) -> str:
+        return "\n".join(
+            f"  {name:<10} {s.stats.delivered:5d} delivered {s.stats.dropped:4d} dropped "
+            f"{s.stats.errors:3d} errors  lag max {s.stats.max_lag_ms:7.1f} ms  "
+            f"queue max {s.stats.max_depth}/{s.queue.maxsize}"
+            for name, s in self.subscriptions.items()
+        )
+
+
+if __name__ == "__main__":
+    async def demo():
+        bus = EventBus()
+        spoken = []
+
+        async def speak(event):
+            await asyncio.sleep(0.01)        # Playback-paced
+            spoken.append(event)
+
+        async def slow_disk(event):
+            await asyncio.sleep(0.2)         # Much slower than the stream
+
+        bus.subscribe("speech", speak, maxsize=2, policy=DropPolicy.BLOCK)
+        bus.subscribe("log", slow_disk, maxsize=5)
+        start = time.monotonic()
+        for i in range(50):
+            await bus.publish("assistant", i)
+        await bus.join("speech")
+        print(f"Published 50 in {time.monotonic() - start:.2f}s (paced by speech, not the log)")
+        print(bus.summary())
+        bus.close()
+
+    asyncio.run(demo())
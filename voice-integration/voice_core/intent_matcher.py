@@ -0,0 +1,272 @@
+"""
+Intent Matcher - Local command fast-path for Voice V10.
+
+Matches transcriptions against a precompiled command table so built-in
+commands ("please stop", "start a new conversation") and simple local
+actions (list files, git branch/status) are answered in-process instead of
+going through a Claude CLI round trip.
+
+Intents that end or discard a conversation (quit, reset, resume) match
+only a whole phrase exactly; the rest also tolerate small transcription
+errors, but only over an utterance the same length as the phrase.
+"""
+
+import asyncio
+import difflib
+import inspect
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+# Words ignored when matching ("please stop" == "stop")
+FILLER_WORDS = {
+    "please", "hey", "ok", "okay", "claude", "now", "just", "so",
+    "can", "could", "would", "you", "thanks", "thank", "um", "uh", "the", "a",
+}
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip punctuation and filler words."""
+    words = re.sub(r"[^\w\s]", "", text.lower()).split()
+    return " ".join(w for w in words if w not in FILLER_WORDS)
+
+
+# Built-in voice commands: name -> (phrases, exact-only)
+BUILTIN_INTENTS = {
+    "quit": (["quit", "goodbye", "exit", "bye", "good bye", "stop listening", "exit voice mode"], True),
+    "reset": (["new conversation", "start over", "reset", "clear", "start a new conversation",
+               "reset the conversation", "clear context", "new session"], True),
+    "resume": (["resume", "resume the last session", "continue the last session",
+                "resume the last conversation", "pick up where we left off"], True),
+    "cancel": (["stop", "cancel", "nevermind", "never mind", "stop that", "cancel that",
+                "forget it", "abort"], False),
+}
+
+
+@dataclass
+class Intent:
+    """A locally handled command."""
+    name: str
+    phrases: list[str]
+    # Handler receives the transcription and returns text to speak (or None).
+    # May be sync or async.
+    handler: Callable[[str], Optional[str]]
+    blocking: bool = False  # Run sync handler in a thread (subprocess, disk I/O)
+    exact: bool = False     # Only an exact (normalized) phrase matches - for destructive commands
+
+
+@dataclass
+class IntentMatch:
+    """Result of matching a transcription against the command table."""
+    intent: Intent
+    score: float
+    text: str
+
+
+class IntentMatcher:
+    """
+    Fuzzy matcher over a precompiled command table.
+
+    Phrases are normalized once at registration. Matching tries an exact
+    lookup first, then fuzzy matching against the non-exact intents'
+    phrases with the same number of words, so that longer requests ("stop
+    using tabs in config.ts") and near misses ("show stats") still go to
+    Claude.
+
+    Usage:
+        matcher = IntentMatcher()
+        matcher.register("cancel", ["stop", "cancel"], handler)
+        match = matcher.match("Please stop.")
+        if match:
+            speech = await matcher.execute(match)
+    """
+
+    def __init__(self, threshold: float = 0.9):
+        self.threshold = threshold
+        self._intents: dict[str, Intent] = {}
+        self._table: dict[str, Intent] = {}  # normalized phrase -> intent
+
+    def register(
+        self,
+        name: str,
+        phrases: list[str],
+        handler: Callable[[str], Optional[str]],
+        blocking: bool = False,
+        exact: bool = False,
+    ) -> Intent:
+        """Register (or replace) an intent."""
+        if name in self._intents:
+            self.unregister(name)
+
+        intent = Intent(name=name, phrases=phrases, handler=handler, blocking=blocking, exact=exact)
+        self._intents[name] = intent
+        for phrase in phrases:
+            key = normalize(phrase)
+            if key:
+                self._table[key] = intent
+        return intent
+
+    def unregister(self, name: str) -> None:
+        """Remove an intent and its phrases."""
+        self._intents.pop(name, None)
+        self._table = {k: v for k, v in self._table.items() if v.name != name}
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        """
+        Match a transcription to a registered intent.
+
+        Args:
+            text: Transcribed utterance
+
+        Returns:
+            IntentMatch, or None if the text should go to Claude
+        """
+        key = normalize(text)
+        if not key:
+            return None
+
+        intent = self._table.get(key)
+        if intent:
+            return IntentMatch(intent=intent, score=1.0, text=text)
+
+        # Fuzzy-match the whole utterance against phrases of the same length
+        words = len(key.split())
+        candidates = [k for k, intent in self._table.items()
+                      if not intent.exact and len(k.split()) == words]
+        close = difflib.get_close_matches(key, candidates, n=1, cutoff=self.threshold)
+        if not close:
+            return None
+
+        score = difflib.SequenceMatcher(None, key, close[0]).ratio()
+        return IntentMatch(intent=self._table[close[0]], score=score, text=text)
+
+    async def execute(self, match: IntentMatch) -> Optional[str]:
+        """Run the matched intent's handler and return text to speak."""
+        handler = match.intent.handler
+        if match.intent.blocking and not inspect.iscoroutinefunction(handler):
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, handler, match.text)
+
+        result = handler(match.text)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    @property
+    def intents(self) -> list[Intent]:
+        return list(self._intents.values())
+
+
+# ---------------------------------------------------------------------------
+# Local actions
+# ---------------------------------------------------------------------------
+
+def _run_git(args: list[str], cwd: str) -> Optional[str]:
+    """Run a git command, returning stdout or None on failure."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def list_directory(working_directory: str, max_names: int = 5) -> str:
+    """Describe the working directory contents for speech."""
+    try:
+        entries = sorted(e for e in os.listdir(working_directory) if not e.startswith("."))
+    except OSError as e:
+        return f"I couldn't list the folder: {e.strerror}"
+
+    dirs = [e for e in entries if os.path.isdir(os.path.join(working_directory, e))]
+    files = [e for e in entries if e not in dirs]
+
+    if not entries:
+        return "The folder is empty"
+
+    summary = f"{len(files)} files and {len(dirs)} folders"
+    names = ", ".join((dirs + files)[:max_names])
+    return f"There are {summary}, including {names}"
+
+
+def git_branch(working_directory: str) -> str:
+    """Speak the current git branch."""
+    out = _run_git(["rev-parse", "--abbrev-ref", "HEAD"], working_directory)
+    if out is None:
+        return "This folder is not a git repository"
+    return f"You're on branch {out.strip()}"
+
+
+def git_status(working_directory: str) -> str:
+    """Summarize git status for speech."""
+    out = _run_git(["status", "--porcelain", "--branch"], working_directory)
+    if out is None:
+        return "This folder is not a git repository"
+
+    lines = out.splitlines()
+    branch = lines[0][3:].split("...")[0] if lines and lines[0].startswith("##") else "unknown"
+    changes = [l for l in lines[1:] if l.strip()]
+
+    if not changes:
+        return f"On branch {branch}, working tree is clean"
+
+    untracked = sum(1 for l in changes if l.startswith("??"))
+    modified = len(changes) - untracked
+    parts = []
+    if modified:
+        parts.append(f"{modified} changed")
+    if untracked:
+        parts.append(f"{untracked} untracked")
+    noun = "file" if len(changes) == 1 else "files"
+    return f"On branch {branch}, {' and '.join(parts)} {noun}"
+
+
+def register_local_actions(matcher: IntentMatcher, working_directory: str) -> None:
+    """Register the built-in local actions on a matcher."""
+    matcher.register(
+        "list_directory",
+        ["list files", "list directory", "list the files", "what files are here",
+         "what's in this folder"],
+        lambda text: list_directory(working_directory),
+        blocking=True,
+    )
+    matcher.register(
+        "git_branch",
+        ["what branch am I on", "which branch", "current branch", "git branch"],
+        lambda text: git_branch(working_directory),
+        blocking=True,
+    )
+    matcher.register(
+        "git_status",
+        ["git status", "what's the git status", "what changed"],
+        lambda text: git_status(working_directory),
+        blocking=True,
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    matcher = IntentMatcher()
+    for name, (phrases, exact) in BUILTIN_INTENTS.items():
+        matcher.register(name, phrases, lambda text, name=name: name.capitalize(), exact=exact)
+    register_local_actions(matcher, os.getcwd())
+
+    for utterance in ["Please stop.", "Start a new conversation.", "Start a conversation", "Git status?",
+                      "Git statis", "Show stats", "What branch am I on?", "Stop using tabs in config.ts"]:
+        start = time.perf_counter()
+        match = matcher.match(utterance)
+        speech = asyncio.run(matcher.execute(match)) if match else None
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{utterance!r:40} -> {match.intent.name if match else 'claude':15} {speech or ''} ({elapsed:.1f} ms)")
@@ -0,0 +1,227 @@
+"""
+Offline TTS - Persistent pyttsx3 worker for Voice V10.
+
+pyttsx3 engines are not thread-safe and runAndWait() cannot be interrupted,
+so one long-lived thread owns the engine: it initialises it once, drives it
+with a non-blocking event loop (startLoop(False) + iterate()), and takes
+queued phrases and stop requests from other threads. Phrases can be spoken
+directly or rendered to PCM for the shared output stream.
+"""
+
+import os
+import queue
+import tempfile
+import threading
+import wave
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+try:
+    import pyttsx3
+    PYTTSX3_AVAILABLE = True
+except ImportError:
+    PYTTSX3_AVAILABLE = False
+
+
+@dataclass
+class OfflineTTSConfig:
+    """Configuration for the offline TTS worker."""
+    rate: int = 0                    # Words per minute (0 = engine default)
+    voice: Optional[str] = None      # Engine voice id (None = default)
+    volume: float = 1.0
+    poll_interval: float = 0.02      # Engine loop iteration / stop latency
+
+
+class OfflineTTSWorker:
+    """
+    Long-lived thread owning a pyttsx3 engine.
+
+    Usage:
+        worker = OfflineTTSWorker()
+        worker.start()
+        done = worker.speak("Hello")           # concurrent.futures.Future
+        worker.stop()                          # Interrupt immediately
+        samples, sr = worker.render("Hello").result()
+        worker.close()
+    """
+
+    def __init__(self, config: Optional[OfflineTTSConfig] = None):
+        if not PYTTSX3_AVAILABLE:
+            raise ImportError("Please install pyttsx3: pip install pyttsx3")
+
+        self.config = config or OfflineTTSConfig()
+        self._requests: queue.Queue = queue.Queue()
+        self._stop_requested = threading.Event()
+        self._closing = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._init_error: Optional[Exception] = None
+
+        # Worker thread state
+        self._engine = None
+        self._current: Optional[tuple[str, Future, Optional[str]]] = None  # (kind, future, wav path)
+        self._utterance = 0              # Name of the current utterance, to ignore late events
+
+    def start(self, timeout: float = 10.0) -> None:
+        """Start the worker and wait for the engine to initialise."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="offline-tts", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        if self._init_error:
+            raise RuntimeError(f"pyttsx3 init failed: {self._init_error}")
+
+    def close(self) -> None:
+        """Stop speaking and shut the worker down."""
+        self._closing.set()
+        self.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def speak(self, text: str) -> Future:
+        """Queue a phrase for direct playback; the future completes when it ends."""
+        future: Future = Future()
+        self._requests.put(("speak", text, future))
+        return future
+
+    def render(self, text: str) -> Future:
+        """Queue a phrase for rendering; the future yields (int16 samples, sample_rate)."""
+        future: Future = Future()
+        self._requests.put(("render", text, future))
+        return future
+
+    def stop(self) -> None:
+        """Interrupt the current phrase and drop queued ones (any thread)."""
+        while True:
+            try:
+                _, _, future = self._requests.get_nowait()
+                future.cancel()
+            except queue.Empty:
+                break
+        self._stop_requested.set()
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            self._engine = pyttsx3.init()
+            if self.config.rate:
+                self._engine.setProperty("rate", self.config.rate)
+            if self.config.voice:
+                self._engine.setProperty("voice", self.config.voice)
+            self._engine.setProperty("volume", self.config.volume)
+            self._engine.connect("finished-utterance", self._on_finished)
+            self._engine.startLoop(False)
+        except Exception as e:
+            self._init_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        try:
+            while not self._closing.is_set():
+                if self._stop_requested.is_set():
+                    self._stop_requested.clear()
+                    if self._current:
+                        self._engine.stop()
+                    if self._current:  # Some drivers report the stop synchronously
+                        self._finish(completed=False)
+
+                if self._current is None:
+                    self._next_request()
+
+                self._engine.iterate()
+                self._closing.wait(self.config.poll_interval)
+        finally:
+            if self._current:
+                self._finish(completed=False)
+            try:
+                self._engine.endLoop()
+            except Exception:
+                pass
+
+    def _next_request(self) -> None:
+        try:
+            kind, text, future = self._requests.get_nowait()
+        except queue.Empty:
+            return
+        if not future.set_running_or_notify_cancel():
+            return
+
+        self._utterance += 1
+        name = str(self._utterance)
+        if kind == "render":
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            self._current = (kind, future, path)
+            self._engine.save_to_file(text, path, name)
+        else:
+            self._current = (kind, future, None)
+            self._engine.say(text, name)
+
+    def _on_finished(self, name, completed) -> None:
+        # A stopped utterance can report after the next one has started
+        if self._current and name == str(self._utterance):
+            self._finish(completed=bool(completed))
+
+    def _finish(self, completed: bool) -> None:
+        kind, future, path = self._current
+        self._current = None
+
+        if kind == "render":
+            try:
+                if not completed:
+                    raise RuntimeError("Rendering stopped")
+                future.set_result(self._read_wav(path))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+        else:
+            future.set_result(completed)
+
+    @staticmethod
+    def _read_wav(path: str) -> tuple[np.ndarray, int]:
+        """Load a rendered WAV as mono int16."""
+        with wave.open(path, "rb") as wav:
+            sample_rate = wav.getframerate()
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            frames = wav.readframes(wav.getnframes())
+
+        if width != 2:
+            raise RuntimeError(f"Unsupported sample width: {width * 8} bits")
+        samples = np.frombuffer(frames, dtype=np.int16)
+        if channels > 1:
+            samples = samples.reshape(-1, channels)[:, 0].copy()
+        return samples, sample_rate
+
+
+if __name__ == "__main__":
+    import time
+
+    worker = OfflineTTSWorker()
+    worker.start()
+
+    start = time.perf_counter()
+    worker.speak("Offline text to speech is ready.").result()
+    print(f"Spoke in {time.perf_counter() - start:.2f}s")
+
+    done = worker.speak("This sentence is interrupted after half a second, like a barge-in would.")
+    time.sleep(0.5)
+    worker.stop()
+    print(f"Stopped: completed={done.result()}")
+
+    samples, sr = worker.render("Rendered to memory.").result()
+    print(f"Rendered {len(samples) / sr:.2f}s at {sr} Hz")
+    worker.close()
@@ -0,0 +1,211 @@
+"""
+Pipeline - Supervised concurrent stages for Voice V10.
+
+Runs long-lived asyncio stage coroutines (capture, STT, execution, TTS)
+joined by bounded queues. The supervisor restarts a stage that crashes and
+tracks per-stage occupancy so bottlenecks are visible, optionally with the
+CPU time each stage spends on the event loop.
+"""
+
+import asyncio
+import collections.abc
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+
+@dataclass
+class StageMetrics:
+    """Occupancy and throughput of one pipeline stage."""
+    name: str
+    input_queue: Optional[asyncio.Queue] = None
+    items: int = 0
+    dropped: int = 0
+    errors: int = 0
+    restarts: int = 0
+    busy_s: float = 0.0
+    cpu_s: float = 0.0              # Event-loop CPU time (PipelineSupervisor.track_cpu)
+    max_depth: int = 0
+    active: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+    on_change: Optional[Callable[[], None]] = None
+
+    @property
+    def depth(self) -> int:
+        """Current number of items waiting in the input queue."""
+        return self.input_queue.qsize() if self.input_queue is not None else 0
+
+    @property
+    def occupancy(self) -> float:
+        """Fraction of wall time the stage spent working."""
+        elapsed = time.monotonic() - self.started_at
+        return min(1.0, self.busy_s / elapsed) if elapsed > 0 else 0.0
+
+    @contextmanager
+    def busy(self):
+        """Mark the stage busy for the duration of one item."""
+        self.active = True
+        if self.on_change:
+            self.on_change()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.busy_s += time.monotonic() - start
+            self.items += 1
+            self.active = False
+            if self.on_change:
+                self.on_change()
+
+    def snapshot(self) -> dict:
+        return {
+            "items": self.items,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "restarts": self.restarts,
+            "busy_s": round(self.busy_s, 3),
+            "cpu_s": round(self.cpu_s, 4),
+            "occupancy": round(self.occupancy, 3),
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "active": self.active,
+        }
+
+
+async def put_bounded(q: asyncio.Queue, item, metrics: Optional[StageMetrics] = None) -> bool:
+    """
+    Put an item on a bounded queue, dropping the oldest item when full.
+
+    Returns:
+        False if an item had to be dropped
+    """
+    dropped = False
+    while q.full():
+        try:
+            q.get_nowait()
+            dropped = True
+            if metrics:
+                metrics.dropped += 1
+        except asyncio.QueueEmpty:
+            break
+    await q.put(item)
+    if metrics:
+        metrics.max_depth = max(metrics.max_depth, q.qsize())
+    return not dropped
+
+
+StageFactory = Callable[[StageMetrics], Awaitable[None]]
+
+
+class _CPUTimed(collections.abc.Coroutine):
+    """Wraps a stage coroutine, adding the thread CPU time of each step to its metrics."""
+
+    def __init__(self, coro, metrics: StageMetrics):
+        self._coro = coro
+        self._metrics = metrics
+
+    def send(self, value):
+        start = time.thread_time()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._metrics.cpu_s += time.thread_time() - start
+
+    def throw(self, *args):
+        start = time.thread_time()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._metrics.cpu_s += time.thread_time() - start
+
+    def close(self):
+        self._coro.close()
+
+    def __await__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+
+class PipelineSupervisor:
+    """
+    Runs pipeline stages concurrently and restarts crashed stages.
+
+    Usage:
+        supervisor = PipelineSupervisor()
+        supervisor.add_stage("stt", stt_stage, input_queue=utterances)
+        await supervisor.run()  # Until stop() is called
+    """
+
+    def __init__(self, restart_limit: int = 3, restart_delay: float = 0.5, track_cpu: bool = False):
+        self.restart_limit = restart_limit
+        self.restart_delay = restart_delay
+        self.track_cpu = track_cpu  # Measure per-stage CPU time (StageMetrics.cpu_s)
+        self._stages: dict[str, tuple[StageFactory, StageMetrics]] = {}
+        self._stopping = asyncio.Event()
+        self.on_change: Optional[Callable[[], None]] = None
+
+    def add_stage(self, name: str, factory: StageFactory, input_queue: Optional[asyncio.Queue] = None) -> StageMetrics:
+        """Register a stage coroutine factory, called with its StageMetrics."""
+        metrics = StageMetrics(name=name, input_queue=input_queue, on_change=self._notify)
+        self._stages[name] = (factory, metrics)
+        return metrics
+
+    def _notify(self) -> None:
+        if self.on_change:
+            self.on_change()
+
+    async def run(self) -> None:
+        """Run all stages until stop() is called or a stage exceeds its restart limit."""
+        self._stopping.clear()
+        tasks = {
+            asyncio.create_task(self._supervise(name, factory, metrics), name=name)
+            for name, (factory, metrics) in self._stages.items()
+        }
+        stop_task = asyncio.create_task(self._stopping.wait())
+
+        try:
+            await asyncio.wait(tasks | {stop_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks | {stop_task}:
+                task.cancel()
+            await asyncio.gather(*tasks, stop_task, return_exceptions=True)
+
+    async def _supervise(self, name: str, factory: StageFactory, metrics: StageMetrics) -> None:
+        while not self._stopping.is_set():
+            try:
+                coro = factory(metrics)
+                await (_CPUTimed(coro, metrics) if self.track_cpu else coro)
+                return  # Stage finished normally
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.errors += 1
+                metrics.active = False
+                if metrics.restarts >= self.restart_limit:
+                    print(f"\n[Stage {name} failed: {e} - stopping]")
+                    return
+                metrics.restarts += 1
+                print(f"\n[Stage {name} crashed: {e} - restarting]")
+                await asyncio.sleep(self.restart_delay)
+
+    def stop(self) -> None:
+        """Stop all stages."""
+        self._stopping.set()
+
+    @property
+    def stages(self) -> dict[str, StageMetrics]:
+        return {name: metrics for name, (_, metrics) in self._stages.items()}
+
+    def metrics(self) -> dict[str, dict]:
+        """Snapshot of per-stage metrics."""
+        return {name: metrics.snapshot() for name, metrics in self.stages.items()}
+
+    def summary(self) -> str:
+        return "\n".join(
+            f"  {name:8} {m.items:4} items  {m.occupancy:6.1%} busy  "
+            f"queue {m.depth}/{m.max_depth} max  {m.dropped} dropped"
+            for name, m in self.stages.items()
+        )
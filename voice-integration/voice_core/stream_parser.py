@@ -2,7 +2,8 @@
 Stream Parser - Parse Claude CLI stream-json output for Voice V10.
 
 Handles message types: assistant, tool_use, tool_result, result, error.
-Extracts text content blocks and identifies tool operations.
+Extracts text content blocks and identifies tool operations, and the
+usage, cost and duration fields of the final result message.
 """
 
 from dataclasses import dataclass, field
@@ -22,6 +23,23 @@ class MessageType(Enum):
     UNKNOWN = "unknown"
 
 
+@dataclass
+class ResultUsage:
+    """Token, cost and duration accounting from a CLI result message."""
+    session_id: Optional[str] = None
+    model: Optional[str] = None      # Model that did most of the work (by cost)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost_usd: float = 0.0
+    duration_ms: float = 0.0         # CLI's own wall time for the run
+    duration_api_ms: float = 0.0     # Time spent waiting on the API
+    num_turns: int = 0               # Agentic turns (model calls) in the run
+    is_error: bool = False
+    model_costs: dict[str, float] = field(default_factory=dict)  # Model -> USD
+
+
 @dataclass
 class ParsedMessage:
     """Parsed message from Claude CLI stream output."""
@@ -32,6 +50,7 @@ class ParsedMessage:
     tool_result: Optional[str] = None
     is_error: bool = False
     raw_data: dict = field(default_factory=dict)
+    usage: Optional[ResultUsage] = None  # RESULT messages only
 
     @property
     def has_text(self) -> bool:
@@ -166,7 +185,33 @@ class StreamParser:
         return ParsedMessage(
             type=MessageType.RESULT,
             text=result if isinstance(result, str) else str(result),
-            raw_data=data
+            is_error=bool(data.get("is_error", False)),
+            raw_data=data,
+            usage=self._parse_usage(data),
+        )
+
+    def _parse_usage(self, data: dict) -> ResultUsage:
+        """Extract usage, cost and duration fields (absent ones stay zero)."""
+        usage = data.get("usage") or {}
+        model_costs = {}
+        for model, stats in (data.get("modelUsage") or {}).items():
+            if isinstance(stats, dict):
+                model_costs[model] = float(stats.get("costUSD", 0.0) or 0.0)
+        model = data.get("model") or (max(model_costs, key=model_costs.get) if model_costs else None)
+
+        return ResultUsage(
+            session_id=data.get("session_id"),
+            model=model,
+            input_tokens=int(usage.get("input_tokens", 0) or 0),
+            output_tokens=int(usage.get("output_tokens", 0) or 0),
+            cache_read_tokens=int(usage.get("cache_read_input_tokens", 0) or 0),
+            cache_write_tokens=int(usage.get("cache_creation_input_tokens", 0) or 0),
+            cost_usd=float(data.get("total_cost_usd", data.get("cost_usd", 0.0)) or 0.0),
+            duration_ms=float(data.get("duration_ms", 0.0) or 0.0),
+            duration_api_ms=float(data.get("duration_api_ms", 0.0) or 0.0),
+            num_turns=int(data.get("num_turns", 0) or 0),
+            is_error=bool(data.get("is_error", False)),
+            model_costs=model_costs,
         )
 
     def _parse_system(self, data: dict) -> ParsedMessage:
@@ -250,6 +295,11 @@ if __name__ == "__main__":
         {"type": "tool_use", "tool": "Read", "input": {"file_path": "/path/to/README.md"}},
         {"type": "tool_result", "result": "# README\n\nThis is a test file."},
         {"type": "error", "error": "File not found"},
+        {"type": "result", "result": "Done.", "session_id": "abc", "duration_ms": 5120,
+         "duration_api_ms": 4300, "num_turns": 2, "total_cost_usd": 0.0123,
+         "usage": {"input_tokens": 12, "output_tokens": 240, "cache_read_input_tokens": 15000,
+                   "cache_creation_input_tokens": 800},
+         "modelUsage": {"claude-sonnet-4": {"costUSD": 0.0118}, "claude-haiku": {"costUSD": 0.0005}}},
     ]
 
     for msg in test_messages:
@@ -257,4 +307,6 @@ if __name__ == "__main__":
         print(f"Type: {parsed.type.value}")
         print(f"Text: {parsed.text}")
         print(f"Tool: {parsed.tool_name}")
+        if parsed.usage:
+            print(f"Usage: {parsed.usage}")
         print("-" * 40)
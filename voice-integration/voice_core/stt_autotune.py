@@ -0,0 +1,324 @@
+"""
+STT Autotune - Pick the Whisper model and thread count for this machine.
+
+Benchmarks each candidate model and thread count on reference audio,
+measuring load time and decode latency for each use case, caches the
+results per machine, and selects the most accurate configuration that meets
+the use case's target latency. VoiceV10 (use case "command") and dictate.py
+("dictation") use the cached choice when their model is "auto".
+
+The reference audio is a bundled recording of real conversational speech
+(data/reference_speech.wav), so decoder timings reflect realistic token
+counts; --reference substitutes your own WAV. Synthetic voiced audio is
+used only if the recording is missing - it exercises the encoder like
+speech but decodes to fewer tokens, underestimating decoder time.
+
+Usage:
+    python stt_autotune.py                      # Benchmark and cache
+    python stt_autotune.py --models tiny base small --reference me.wav
+"""
+
+import gc
+import json
+import os
+import platform
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+DEFAULT_PROFILE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "voice_v10", "stt_profile.json")
+
+# 12 s of English debate speech (VoxConverse, CC BY 4.0 - see data/README.md)
+BUNDLED_REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reference_speech.wav")
+
+# Least to most accurate
+MODEL_ORDER = ["tiny", "base", "small", "medium", "large"]
+
+
+@dataclass
+class UseCase:
+    """A reference clip and the latency it must be transcribed within."""
+    name: str
+    clip_s: float
+    target_ms: float
+    language: Optional[str] = "en"
+
+
+USE_CASES = {
+    # Voice commands: short utterances, the reply should start within a second
+    "command": UseCase("command", clip_s=4.0, target_ms=1000.0),
+    # Dictation: a paragraph, language auto-detected, text within a few seconds of Enter
+    "dictation": UseCase("dictation", clip_s=20.0, target_ms=4000.0, language=None),
+}
+
+
+def default_thread_counts() -> list[int]:
+    cores = os.cpu_count() or 1
+    return sorted({max(1, cores // 4), max(1, cores // 2), cores})
+
+
+def default_reference() -> Optional[str]:
+    """The bundled speech recording, or None (synthetic) if it is missing."""
+    return BUNDLED_REFERENCE if os.path.exists(BUNDLED_REFERENCE) else None
+
+
+@dataclass
+class TuneConfig:
+    """What to benchmark."""
+    backend: str = "auto"            # STT backend, as in STTConfig
+    compute_type: str = "int8"       # faster-whisper quantisation
+    models: list[str] = field(default_factory=lambda: ["tiny", "base", "small", "medium"])
+    threads: list[int] = field(default_factory=default_thread_counts)
+    repeats: int = 2                 # Timed runs per clip (median is kept)
+    reference: Optional[str] = field(default_factory=default_reference)  # 16-bit WAV (None = synthetic)
+    give_up_factor: float = 3.0      # Skip larger models once one misses every target by this much
+
+
+@dataclass
+class Measurement:
+    """One model and thread count on this machine."""
+    model: str
+    threads: int
+    load_s: float
+    latency_ms: dict[str, float]     # Use case -> median transcription time
+
+    def rtf(self, use_case: str) -> float:
+        """Real-time factor: seconds of compute per second of audio."""
+        return self.latency_ms[use_case] / 1000 / USE_CASES[use_case].clip_s
+
+
+def machine_id() -> str:
+    """Identifies the hardware a profile was measured on."""
+    return "|".join([platform.node(), platform.machine(), platform.processor(), str(os.cpu_count())])
+
+
+def reference_audio(seconds: float, path: Optional[str] = None) -> np.ndarray:
+    """
+    Float32 mono audio at 16 kHz, seconds long.
+
+    Args:
+        seconds: Clip length
+        path: 16-bit WAV to cut the clip from (looped if shorter); None =
+            deterministic synthetic voiced audio
+    """
+    n = int(seconds * SAMPLE_RATE)
+    if path:
+        import wave
+
+        with wave.open(path, "rb") as wav:
+            rate = wav.getframerate()
+            channels = wav.getnchannels()
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{path}: expected 16-bit PCM")
+            data = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        audio = data.reshape(-1, channels).mean(axis=1).astype(np.float32) / 32768.0
+        if rate != SAMPLE_RATE:
+            positions = np.arange(int(len(audio) * SAMPLE_RATE / rate)) * rate / SAMPLE_RATE
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+        return np.resize(audio, n)
+
+    # Syllable-length bursts of a harmonic voice with wandering pitch, separated by short gaps
+    rng = np.random.default_rng(1234)
+    audio = np.zeros(n, dtype=np.float32)
+    pos = int(0.2 * SAMPLE_RATE)
+    while pos < n:
+        length = int(rng.uniform(0.12, 0.3) * SAMPLE_RATE)
+        t = np.arange(length) / SAMPLE_RATE
+        f0 = rng.uniform(100, 200) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(2, 5) * t))
+        phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        formants = rng.uniform(0.2, 1.0, size=8)
+        voice = sum(a * np.sin(k * phase) / k for k, a in enumerate(formants, start=1))
+        envelope = np.sin(np.pi * np.arange(length) / length) ** 2
+        burst = (0.2 * voice * envelope).astype(np.float32)
+        end = min(n, pos + length)
+        audio[pos:end] = burst[:end - pos]
+        pos = end + int(rng.choice([0.05, 0.08, 0.3], p=[0.6, 0.3, 0.1]) * SAMPLE_RATE)
+    return audio
+
+
+def benchmark(config: Optional[TuneConfig] = None,
+              on_result: Optional[Callable[[Measurement], None]] = None) -> dict:
+    """
+    Measure every candidate model and thread count.
+
+    Models are tried from least to most accurate; once a model misses every
+    use case's target by give_up_factor at its best thread count, larger
+    models are skipped.
+
+    Returns:
+        Profile dict (see save_profile)
+    """
+    from stt_backend import STTConfig, create_stt_backend, resolve_backend_name
+
+    config = config or TuneConfig()
+    clips = {name: reference_audio(case.clip_s, config.reference) for name, case in USE_CASES.items()}
+    models = [m for m in MODEL_ORDER if m in config.models]
+    results: list[Measurement] = []
+
+    for model in models:
+        for threads in config.threads:
+            start = time.perf_counter()
+            stt = create_stt_backend(STTConfig(
+                backend=config.backend,
+                model=model,
+                threads=threads,
+                compute_type=config.compute_type,
+            ))
+            load_s = time.perf_counter() - start
+
+            stt.transcribe(clips["command"][:SAMPLE_RATE], language="en")  # Warm-up
+            latency = {}
+            for name, case in USE_CASES.items():
+                runs = []
+                for _ in range(config.repeats):
+                    start = time.perf_counter()
+                    stt.transcribe(clips[name], language=case.language)
+                    runs.append((time.perf_counter() - start) * 1000)
+                latency[name] = float(np.median(runs))
+
+            measurement = Measurement(model, threads, load_s, latency)
+            results.append(measurement)
+            if on_result:
+                on_result(measurement)
+            del stt
+            gc.collect()
+
+        best = {name: min(m.latency_ms[name] for m in results if m.model == model) for name in USE_CASES}
+        if all(best[name] > case.target_ms * config.give_up_factor for name, case in USE_CASES.items()):
+            break
+
+    return {
+        "machine": machine_id(),
+        "backend": resolve_backend_name(config.backend),
+        "compute_type": config.compute_type,
+        "reference": config.reference or "synthetic",
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": [asdict(m) for m in results],
+    }
+
+
+def select(profile: dict, use_case: str, target_ms: Optional[float] = None) -> Optional[Measurement]:
+    """
+    The most accurate model that meets the target, at its fastest thread count.
+
+    Returns:
+        Measurement, or None if no candidate meets the target
+    """
+    target = target_ms if target_ms is not None else USE_CASES[use_case].target_ms
+    fits = [Measurement(**m) for m in profile.get("results", []) if m["latency_ms"][use_case] <= target]
+    if not fits:
+        return None
+    return max(fits, key=lambda m: (MODEL_ORDER.index(m.model), -m.latency_ms[use_case]))
+
+
+def fastest(profile: dict, use_case: str) -> Optional[Measurement]:
+    """The lowest-latency measured configuration for a use case."""
+    results = [Measurement(**m) for m in profile.get("results", [])]
+    return min(results, key=lambda m: m.latency_ms[use_case], default=None)
+
+
+def save_profile(profile: dict, path: str = DEFAULT_PROFILE_PATH) -> None:
+    """Store a profile; one per engine, alongside any others for this machine."""
+    from stt_backend import resolve_backend_name
+
+    profiles = _load_profiles(path)
+    profiles[resolve_backend_name(profile["backend"])] = profile
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_profile(backend: str = "auto", path: str = DEFAULT_PROFILE_PATH) -> Optional[dict]:
+    """
+    The cached profile for backend, if it was measured on this machine.
+
+    "auto" is resolved to the installed engine first, so a profile measured
+    as "-b auto" is found as "whisper" and vice versa.
+    """
+    from stt_backend import resolve_backend_name
+
+    profile = _load_profiles(path).get(resolve_backend_name(backend))
+    if profile is None or profile.get("machine") != machine_id():
+        return None
+    return profile
+
+
+def _load_profiles(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def resolve_model(use_case: str, fallback: str, backend: str = "auto",
+                  path: str = DEFAULT_PROFILE_PATH) -> tuple[str, int]:
+    """
+    Model and thread count to use when the model is "auto".
+
+    Returns:
+        (model, threads) from this machine's profile - the fastest measured
+        configuration when nothing meets the target - or (fallback, 0)
+        when the machine has no profile
+    """
+    profile = load_profile(backend, path)
+    if profile is None:
+        return fallback, 0
+    choice = select(profile, use_case) or fastest(profile, use_case)
+    if choice is None:
+        return fallback, 0
+    return choice.model, choice.threads
+
+
+def format_profile(profile: dict) -> str:
+    """Results table plus the choice for each use case."""
+    names = list(USE_CASES)
+    lines = [f"  {'model':<8}{'threads':>8}{'load s':>9}"
+             + "".join(f"{name + ' ms':>15}{'rtf':>7}" for name in names)]
+    for m in (Measurement(**r) for r in profile["results"]):
+        lines.append(f"  {m.model:<8}{m.threads:>8}{m.load_s:>9.1f}"
+                     + "".join(f"{m.latency_ms[n]:>15.0f}{m.rtf(n):>7.2f}" for n in names))
+    lines.append("")
+    for name, case in USE_CASES.items():
+        choice = select(profile, name)
+        if choice:
+            picked = f"{choice.model} x {choice.threads} threads"
+        else:
+            choice = fastest(profile, name)
+            picked = (f"nothing meets it - using the fastest, {choice.model} x {choice.threads} threads "
+                      f"({choice.latency_ms[name]:.0f} ms)" if choice else "nothing measured")
+        lines.append(f"  {name} (target {case.target_ms:.0f} ms for {case.clip_s:.0f}s): {picked}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark Whisper models on this machine and cache the best fit")
+    parser.add_argument("--backend", default="auto", help="STT backend: whisper, faster-whisper, auto")
+    parser.add_argument("--compute-type", default="int8", help="faster-whisper compute type")
+    parser.add_argument("--models", nargs="+", default=TuneConfig().models, choices=MODEL_ORDER)
+    parser.add_argument("--threads", nargs="+", type=int, default=default_thread_counts())
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--reference", default=default_reference(),
+                        help="16-bit WAV of real speech (default: the bundled recording)")
+    parser.add_argument("--synthetic", action="store_true", help="Use synthetic voiced audio as the reference")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE_PATH, help="Where to cache the result")
+    args = parser.parse_args()
+
+    print(f"Benchmarking {', '.join(args.models)} x {args.threads} threads ({args.backend})...")
+    print("Models not yet downloaded are fetched on first load.\n")
+    profile = benchmark(
+        TuneConfig(backend=args.backend, compute_type=args.compute_type, models=args.models,
+                   threads=args.threads, repeats=args.repeats,
+                   reference=None if args.synthetic else args.reference),
+        on_result=lambda m: print(f"  {m.model} x {m.threads}: load {m.load_s:.1f}s, "
+                                  + ", ".join(f"{n} {ms:.0f} ms" for n, ms in m.latency_ms.items())),
+    )
+    save_profile(profile, args.profile)
+    print(f"\n{format_profile(profile)}\n\nSaved to {args.profile}")
@@ -0,0 +1,543 @@
+"""
+STT Backend - Pluggable speech-to-text engines for Voice V10.
+
+Wraps the available Whisper implementations behind one interface so that
+VoiceV10 and dictate.py can switch engines without code changes:
+
+    whisper         - openai-whisper (PyTorch, fp32 on CPU). Default.
+    faster-whisper  - CTranslate2 engine with int8 quantised CPU inference.
+    auto            - faster-whisper when installed, otherwise whisper.
+
+Short in-memory clips (voice commands) take a fast path: a single greedy
+decode of one window with no temperature fallback and no conditioning on
+previous text, instead of the full long-form transcribe loop.
+
+With cascade_model set, utterances are decoded by that small model first and
+only re-decoded by the configured model when confidence is low.
+
+transcribe_batch() decodes several short clips in one padded encoder and
+decoder batch, for servers transcribing for many sessions at once.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field, replace
+from typing import Optional, Union
+
+import numpy as np
+
+# Engines are optional - each backend checks for its module when created
+try:
+    import whisper
+except ImportError:
+    whisper = None
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+
+SAMPLE_RATE = 16000  # Whisper expects 16 kHz mono audio
+
+AudioInput = Union[str, np.ndarray]
+
+
+@dataclass
+class STTConfig:
+    """Configuration for STT backend selection."""
+    backend: str = "whisper"        # whisper, faster-whisper, auto
+    model: str = "base"             # tiny, base, small, medium, large
+    language: Optional[str] = "en"
+    threads: int = 0                # CPU threads for inference (0 = engine default)
+    compute_type: str = "int8"      # faster-whisper only: int8, int8_float32, float32
+    device: str = "cpu"
+    short_utterance_s: float = 10.0  # Clips up to this length use the fast path (0 = never)
+    initial_prompt: Optional[str] = None  # Project vocabulary to bias decoding
+
+    # Cascade: decode with cascade_model first, escalate to model when unsure
+    cascade_model: Optional[str] = None   # e.g. "tiny" (None = single model)
+    cascade_logprob_threshold: float = -0.5   # Accept if avg_logprob >= this
+    cascade_no_speech_threshold: float = 0.5  # ...and no_speech_prob <= this
+
+
+@dataclass
+class TranscriptionResult:
+    """Result of a transcription, normalised across backends."""
+    text: str
+    language: Optional[str] = None
+    avg_logprob: Optional[float] = None    # Mean token log-probability over segments
+    no_speech_prob: Optional[float] = None  # Highest no-speech probability over segments
+    segments: list = field(default_factory=list)
+    fast_path: bool = False
+    timings: dict = field(default_factory=dict)  # Per-stage milliseconds
+
+
+class STTBackend:
+    """
+    Base class for speech-to-text engines.
+
+    Subclasses load their model in __init__ and implement _transcribe_full()
+    and _transcribe_short(). Audio is either a file path or a float32 numpy
+    array at 16 kHz.
+    """
+
+    name = "base"
+
+    # Whether the encoder accepts inputs shorter than the 30 s window.
+    # Neither openai-whisper nor CTranslate2 does, so short clips are padded.
+    supports_trimmed_input = False
+
+    # A window counts as silence when both hold - the thresholds
+    # transcribe() applies in openai-whisper and faster-whisper
+    no_speech_threshold = 0.6
+    logprob_threshold = -1.0
+
+    def __init__(self, config: STTConfig):
+        self.config = config
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None) -> TranscriptionResult:
+        """
+        Transcribe audio, using the fast path for short in-memory clips.
+
+        Args:
+            audio: File path or float32 array at 16 kHz
+            language: Override for config.language
+
+        Returns:
+            TranscriptionResult with per-stage timings
+        """
+        language = language or self.config.language
+        start = time.perf_counter()
+
+        if self.is_short(audio):
+            result = self._transcribe_short(audio, language)
+            result.fast_path = True
+        else:
+            result = self._transcribe_full(audio, language)
+
+        result.timings["total_ms"] = (time.perf_counter() - start) * 1000
+        return result
+
+    def transcribe_batch(self, audios: list[AudioInput], language: Optional[str] = None) -> list[TranscriptionResult]:
+        """
+        Transcribe several clips, batching the short in-memory ones.
+
+        Short clips share one encoder and decoder pass (where the engine
+        supports it); files and long clips are transcribed one by one.
+
+        Args:
+            audios: File paths or float32 arrays at 16 kHz
+            language: Override for config.language (shared by the batch)
+
+        Returns:
+            One TranscriptionResult per input, in order; batched results
+            carry the batch's total_ms and batch_size
+        """
+        language = language or self.config.language
+        results: list[Optional[TranscriptionResult]] = [None] * len(audios)
+
+        short = [i for i, audio in enumerate(audios) if self.is_short(audio)]
+        if len(short) > 1:
+            start = time.perf_counter()
+            batch = self._transcribe_short_batch([audios[i] for i in short], language)
+            total_ms = (time.perf_counter() - start) * 1000
+            for i, result in zip(short, batch):
+                result.fast_path = True
+                result.timings["total_ms"] = total_ms
+                result.timings["batch_size"] = len(short)
+                results[i] = result
+
+        for i, audio in enumerate(audios):
+            if results[i] is None:
+                results[i] = self.transcribe(audio, language)
+        return results
+
+    def is_short(self, audio: AudioInput) -> bool:
+        """Check if audio qualifies for the short-utterance fast path."""
+        if isinstance(audio, str) or self.config.short_utterance_s <= 0:
+            return False
+        return len(audio) <= self.config.short_utterance_s * SAMPLE_RATE
+
+    def _transcribe_full(self, audio: AudioInput, language: Optional[str]) -> TranscriptionResult:
+        raise NotImplementedError
+
+    def _transcribe_short(self, audio: np.ndarray, language: Optional[str]) -> TranscriptionResult:
+        raise NotImplementedError
+
+    def _transcribe_short_batch(self, audios: list[np.ndarray], language: Optional[str]) -> list[TranscriptionResult]:
+        """Decode short clips together (default: one at a time)."""
+        return [self._transcribe_short(audio, language) for audio in audios]
+
+    def _drop_no_speech(self, result: TranscriptionResult) -> TranscriptionResult:
+        """
+        Blank the text of a greedy decode that is probably not speech.
+
+        The short path bypasses transcribe()'s no-speech check, so without
+        this, breath or keyboard noise decodes to text like "Thank you."
+        """
+        if (result.no_speech_prob is not None and result.avg_logprob is not None
+                and result.no_speech_prob > self.no_speech_threshold
+                and result.avg_logprob < self.logprob_threshold):
+            result.text = ""
+        return result
+
+    @staticmethod
+    def _summarize_segments(segments: list) -> tuple[Optional[float], Optional[float]]:
+        """Compute (avg_logprob, no_speech_prob) from (avg_logprob, no_speech_prob) pairs."""
+        if not segments:
+            return None, None
+        avg_logprob = sum(s[0] for s in segments) / len(segments)
+        no_speech_prob = max(s[1] for s in segments)
+        return avg_logprob, no_speech_prob
+
+
+class WhisperBackend(STTBackend):
+    """openai-whisper engine (PyTorch, fp32 on CPU)."""
+
+    name = "whisper"
+
+    def __init__(self, config: STTConfig):
+        super().__init__(config)
+        if whisper is None:
+            raise ImportError("Please install openai-whisper: pip install openai-whisper")
+
+        if config.threads > 0:
+            import torch
+            torch.set_num_threads(config.threads)
+
+        self._model = whisper.load_model(config.model, device=config.device)
+
+    def _transcribe_full(self, audio: AudioInput, language: Optional[str]) -> TranscriptionResult:
+        result = self._model.transcribe(
+            audio,
+            language=language,
+            initial_prompt=self.config.initial_prompt,
+            fp16=False,  # Use fp32 for CPU
+        )
+
+        segments = result.get("segments", [])
+        avg_logprob, no_speech_prob = self._summarize_segments(
+            [(s["avg_logprob"], s["no_speech_prob"]) for s in segments]
+        )
+
+        return TranscriptionResult(
+            text=result.get("text", "").strip(),
+            language=result.get("language"),
+            avg_logprob=avg_logprob,
+            no_speech_prob=no_speech_prob,
+            segments=segments,
+        )
+
+    def _transcribe_short(self, audio: np.ndarray, language: Optional[str]) -> TranscriptionResult:
+        return self._transcribe_short_batch([audio], language)[0]
+
+    def _transcribe_short_batch(self, audios: list[np.ndarray], language: Optional[str]) -> list[TranscriptionResult]:
+        import torch
+
+        timings = {}
+
+        start = time.perf_counter()
+        # The encoder's positional embedding is fixed at 30 s, so pad each clip
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(audio.astype(np.float32)), n_mels=self._model.dims.n_mels)
+            for audio in audios
+        ]).to(self._model.device)
+        timings["mel_ms"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with torch.no_grad():
+            audio_features = self._model.embed_audio(mels)
+        timings["encode_ms"] = (time.perf_counter() - start) * 1000
+
+        # Greedy single pass: no temperature fallback, no previous-text conditioning
+        start = time.perf_counter()
+        decoded = whisper.decode(self._model, audio_features, whisper.DecodingOptions(
+            language=language,
+            temperature=0.0,
+            without_timestamps=True,
+            prompt=self.config.initial_prompt,
+            fp16=False,
+        ))
+        timings["decode_ms"] = (time.perf_counter() - start) * 1000
+
+        return [
+            self._drop_no_speech(TranscriptionResult(
+                text=d.text.strip(),
+                language=d.language,
+                avg_logprob=d.avg_logprob,
+                no_speech_prob=d.no_speech_prob,
+                timings=dict(timings),
+            ))
+            for d in decoded
+        ]
+
+
+class FasterWhisperBackend(STTBackend):
+    """faster-whisper engine (CTranslate2, int8 quantised on CPU)."""
+
+    name = "faster-whisper"
+
+    def __init__(self, config: STTConfig):
+        super().__init__(config)
+        if WhisperModel is None:
+            raise ImportError("Please install faster-whisper: pip install faster-whisper")
+
+        self._model = WhisperModel(
+            config.model,
+            device=config.device,
+            compute_type=config.compute_type,
+            cpu_threads=config.threads,
+        )
+
+    def _transcribe_full(self, audio: AudioInput, language: Optional[str]) -> TranscriptionResult:
+        return self._run(audio, language, initial_prompt=self.config.initial_prompt)
+
+    def _transcribe_short(self, audio: np.ndarray, language: Optional[str]) -> TranscriptionResult:
+        # Greedy single pass: no temperature fallback, no previous-text conditioning
+        return self._run(
+            audio.astype(np.float32),
+            language,
+            initial_prompt=self.config.initial_prompt,
+            beam_size=1,
+            best_of=1,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            without_timestamps=True,
+        )
+
+    def _transcribe_short_batch(self, audios: list[np.ndarray], language: Optional[str]) -> list[TranscriptionResult]:
+        if language is None:
+            # Language detection is per clip - decode one at a time
+            return super()._transcribe_short_batch(audios, language)
+
+        from faster_whisper.tokenizer import Tokenizer
+
+        timings = {}
+        extractor = self._model.feature_extractor
+
+        start = time.perf_counter()
+        # Pad each clip to the 30 s window, as the encoder expects
+        features = np.stack([
+            extractor(np.pad(audio.astype(np.float32), (0, max(0, extractor.n_samples - len(audio)))))
+            [:, :extractor.nb_max_frames]
+            for audio in audios
+        ])
+        timings["features_ms"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        encoder_output = self._model.encode(features)
+        timings["encode_ms"] = (time.perf_counter() - start) * 1000
+
+        # Greedy single pass over the whole batch, without timestamps
+        start = time.perf_counter()
+        tokenizer = Tokenizer(self._model.hf_tokenizer, self._model.model.is_multilingual,
+                              task="transcribe", language=language)
+        previous = tokenizer.encode(" " + self.config.initial_prompt.strip()) if self.config.initial_prompt else []
+        prompt = self._model.get_prompt(tokenizer, previous, without_timestamps=True)
+        decoded = self._model.model.generate(
+            encoder_output,
+            [prompt] * len(audios),
+            beam_size=1,
+            max_length=self._model.max_length,
+            return_scores=True,
+            return_no_speech_prob=True,
+            suppress_blank=True,
+            suppress_tokens=[-1],
+        )
+        timings["decode_ms"] = (time.perf_counter() - start) * 1000
+
+        return [
+            self._drop_no_speech(TranscriptionResult(
+                text=tokenizer.decode([t for t in d.sequences_ids[0] if t < tokenizer.eot]).strip(),
+                language=language,
+                avg_logprob=d.scores[0],  # Length-normalised log-probability
+                no_speech_prob=d.no_speech_prob,
+                timings=dict(timings),
+            ))
+            for d in decoded
+        ]
+
+    def _run(self, audio: AudioInput, language: Optional[str], **options) -> TranscriptionResult:
+        timings = {}
+
+        # Feature extraction and language detection happen up front
+        start = time.perf_counter()
+        segments_iter, info = self._model.transcribe(audio, language=language, **options)
+        timings["features_ms"] = (time.perf_counter() - start) * 1000
+
+        # Segments are generated lazily - decoding happens here
+        start = time.perf_counter()
+        segments = list(segments_iter)
+        timings["decode_ms"] = (time.perf_counter() - start) * 1000
+
+        avg_logprob, no_speech_prob = self._summarize_segments(
+            [(s.avg_logprob, s.no_speech_prob) for s in segments]
+        )
+
+        return TranscriptionResult(
+            text="".join(s.text for s in segments).strip(),
+            language=info.language,
+            avg_logprob=avg_logprob,
+            no_speech_prob=no_speech_prob,
+            segments=segments,
+            timings=timings,
+        )
+
+
+@dataclass
+class CascadeStats:
+    """Escalation rate and per-tier latency of a CascadeBackend."""
+    utterances: int = 0
+    escalations: int = 0
+    fast_tier_ms: float = 0.0      # Total time spent in the fast tier
+    accurate_tier_ms: float = 0.0  # Total time spent in the accurate tier
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalations / self.utterances if self.utterances else 0.0
+
+    @property
+    def avg_fast_tier_ms(self) -> float:
+        return self.fast_tier_ms / self.utterances if self.utterances else 0.0
+
+    @property
+    def avg_accurate_tier_ms(self) -> float:
+        return self.accurate_tier_ms / self.escalations if self.escalations else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.utterances} utterances, {self.escalation_rate:.0%} escalated, "
+            f"fast tier {self.avg_fast_tier_ms:.0f} ms avg, "
+            f"accurate tier {self.avg_accurate_tier_ms:.0f} ms avg"
+        )
+
+
+class CascadeBackend(STTBackend):
+    """
+    Two-tier transcription with confidence gating.
+
+    Every utterance is decoded by the fast (small) model. The result is
+    accepted when its average log-probability and no-speech probability
+    clear the configured thresholds; otherwise the utterance is re-decoded
+    by the accurate model. Both models stay resident.
+    """
+
+    name = "cascade"
+
+    def __init__(self, config: STTConfig, fast: STTBackend, accurate: STTBackend):
+        super().__init__(config)
+        self.fast = fast
+        self.accurate = accurate
+        self.stats = CascadeStats()
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None) -> TranscriptionResult:
+        self.stats.utterances += 1
+
+        result = self.fast.transcribe(audio, language)
+        fast_ms = result.timings.get("total_ms", 0.0)
+        self.stats.fast_tier_ms += fast_ms
+
+        if self.is_confident(result):
+            result.timings["fast_tier_ms"] = fast_ms
+            return result
+
+        self.stats.escalations += 1
+        escalated = self.accurate.transcribe(audio, language)
+        accurate_ms = escalated.timings.get("total_ms", 0.0)
+        self.stats.accurate_tier_ms += accurate_ms
+
+        escalated.timings["fast_tier_ms"] = fast_ms
+        escalated.timings["accurate_tier_ms"] = accurate_ms
+        escalated.timings["total_ms"] = fast_ms + accurate_ms
+        return escalated
+
+    def transcribe_batch(self, audios: list[AudioInput], language: Optional[str] = None) -> list[TranscriptionResult]:
+        """Batch the fast tier, then re-decode the unconfident results as one accurate-tier batch."""
+        self.stats.utterances += len(audios)
+        results = self.fast.transcribe_batch(audios, language)
+        fast_ms = max((r.timings.get("total_ms", 0.0) for r in results), default=0.0)
+        self.stats.fast_tier_ms += fast_ms * len(audios)
+        for result in results:
+            result.timings["fast_tier_ms"] = fast_ms
+
+        unsure = [i for i, result in enumerate(results) if not self.is_confident(result)]
+        if not unsure:
+            return results
+
+        self.stats.escalations += len(unsure)
+        escalated = self.accurate.transcribe_batch([audios[i] for i in unsure], language)
+        accurate_ms = max((r.timings.get("total_ms", 0.0) for r in escalated), default=0.0)
+        self.stats.accurate_tier_ms += accurate_ms * len(unsure)
+        for i, result in zip(unsure, escalated):
+            result.timings["fast_tier_ms"] = fast_ms
+            result.timings["accurate_tier_ms"] = accurate_ms
+            result.timings["total_ms"] = fast_ms + accurate_ms
+            results[i] = result
+        return results
+
+    def is_confident(self, result: TranscriptionResult) -> bool:
+        """Check if a fast-tier result clears both confidence thresholds."""
+        if result.avg_logprob is None:
+            return False
+        if result.avg_logprob < self.config.cascade_logprob_threshold:
+            return False
+        return (result.no_speech_prob or 0.0) <= self.config.cascade_no_speech_threshold
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def available_backends() -> list[str]:
+    """List backends whose engine module is installed."""
+    available = []
+    if whisper is not None:
+        available.append(WhisperBackend.name)
+    if WhisperModel is not None:
+        available.append(FasterWhisperBackend.name)
+    return available
+
+
+def resolve_backend_name(name: str) -> str:
+    """The engine a backend name selects ("auto" prefers the int8 engine when installed)."""
+    if name == "auto":
+        return FasterWhisperBackend.name if WhisperModel is not None else WhisperBackend.name
+    return name
+
+
+def create_stt_backend(config: Optional[STTConfig] = None) -> STTBackend:
+    """
+    Create an STT backend from config.
+
+    Args:
+        config: Backend selection; "auto" prefers the int8 engine when installed
+
+    Returns:
+        Loaded STTBackend ready to transcribe
+    """
+    config = config or STTConfig()
+    backend_cls = BACKENDS.get(resolve_backend_name(config.backend))
+    if backend_cls is None:
+        raise ValueError(f"Unknown STT backend '{config.backend}'. Choose from: auto, {', '.join(BACKENDS)}")
+
+    if config.cascade_model and config.cascade_model != config.model:
+        fast = backend_cls(replace(config, model=config.cascade_model, cascade_model=None))
+        accurate = backend_cls(replace(config, cascade_model=None))
+        return CascadeBackend(config, fast, accurate)
+
+    return backend_cls(config)
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(f"Available backends: {', '.join(available_backends()) or 'none'}")
+    if len(sys.argv) > 1:
+        backend = create_stt_backend(STTConfig(backend=os.environ.get("STT_BACKEND", "auto")))
+        print(f"Using {backend.name}")
+        result = backend.transcribe(sys.argv[1])
+        print(result.text)
+        print(", ".join(f"{k}={v:.0f}" for k, v in result.timings.items()))
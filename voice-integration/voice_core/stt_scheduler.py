@@ -0,0 +1,288 @@
+"""
+STT Scheduler - Shared transcription for Voice V10 servers.
+
+One resident STT model serves many sessions. Requests are queued per
+client and served round-robin from a single inference thread that owns the
+model, so the model is loaded once, never entered concurrently, and one
+busy client can't starve the others.
+
+Short requests from different clients arriving within max_wait_ms of each
+other are decoded as one batch (up to max_batch), so throughput grows with
+the number of users instead of collapsing into competing batch-of-one
+passes. Inference only ever runs on the scheduler's thread, with the
+engine's intra-op thread count set once at model load (STTConfig.threads).
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from stt_backend import STTBackend, TranscriptionResult, AudioInput, SAMPLE_RATE
+
+
+@dataclass
+class SchedulerConfig:
+    """Admission limits for shared transcription."""
+    max_audio_s: float = 30.0        # Longer utterances are truncated
+    max_waiting: int = 16            # Requests queued across all clients before new ones are rejected
+    max_batch: int = 4               # Short clips decoded together (1 = no batching)
+    max_wait_ms: float = 30.0        # How long the first request waits for others to batch with
+
+
+@dataclass
+class SchedulerStats:
+    """Counters for the transcription scheduler."""
+    requests: int = 0
+    completed: int = 0
+    rejected: int = 0
+    truncated: int = 0
+    batches: int = 0                 # Model passes (a batch of one counts)
+    largest_batch: int = 0
+    busy_s: float = 0.0
+    queue_s: float = 0.0             # Total time requests waited for the model
+
+    @property
+    def avg_batch(self) -> float:
+        return self.completed / self.batches if self.batches else 0.0
+
+    def summary(self) -> str:
+        avg_wait = self.queue_s / self.completed * 1000 if self.completed else 0.0
+        return (
+            f"{self.completed}/{self.requests} transcribed in {self.batches} passes "
+            f"(avg batch {self.avg_batch:.1f}, max {self.largest_batch}), {self.rejected} rejected, "
+            f"{self.truncated} truncated, {avg_wait:.0f} ms avg queue wait, {self.busy_s:.1f}s busy"
+        )
+
+
+@dataclass
+class _Request:
+    client: str
+    audio: AudioInput
+    language: Optional[str]
+    future: Future
+    queued_at: float
+
+
+class TranscriptionScheduler:
+    """
+    Serves transcription requests from many clients with one STT backend.
+
+    Usage:
+        scheduler = TranscriptionScheduler(create_stt_backend(config))
+        scheduler.start()
+        stt = scheduler.client("alice")        # Pass to VoiceV10(stt=...)
+        result = stt.transcribe(audio)
+        scheduler.close()
+    """
+
+    def __init__(self, backend: STTBackend, config: Optional[SchedulerConfig] = None):
+        self.backend = backend
+        self.config = config or SchedulerConfig()
+        self.stats = SchedulerStats()
+        self._queues: OrderedDict[str, deque[_Request]] = OrderedDict()  # Rotation order
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stt-scheduler", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the inference thread; queued requests are cancelled."""
+        with self._cond:
+            self._closing = True
+            for client in list(self._queues):
+                self._drop_client(client)
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def client(self, client: str, on_rejected: Optional[Callable[[], None]] = None) -> "ClientTranscriber":
+        """STTBackend-compatible handle that submits on behalf of one client."""
+        return ClientTranscriber(self, client, on_rejected)
+
+    def remove_client(self, client: str) -> None:
+        """Forget a client, cancelling its queued requests."""
+        with self._cond:
+            self._drop_client(client)
+
+    def submit(self, client: str, audio: AudioInput, language: Optional[str] = None) -> Future:
+        """
+        Queue audio for transcription.
+
+        Returns:
+            Future resolving to a TranscriptionResult; rejected requests
+            (queue full) resolve to an empty result with timings["rejected"]
+        """
+        future: Future = Future()
+        if isinstance(audio, np.ndarray):
+            limit = int(self.config.max_audio_s * SAMPLE_RATE)
+            if len(audio) > limit:
+                audio = audio[:limit]
+                self.stats.truncated += 1
+
+        with self._cond:
+            self.stats.requests += 1
+            if self._closing or self._waiting >= self.config.max_waiting:
+                self.stats.rejected += 1
+                future.set_result(TranscriptionResult(text="", timings={"rejected": 1.0}))
+                return future
+            self._queues.setdefault(client, deque()).append(
+                _Request(client, audio, language, future, time.monotonic()))
+            self._waiting += 1
+            self._cond.notify()
+        return future
+
+    def _drop_client(self, client: str) -> None:
+        for request in self._queues.pop(client, ()):
+            request.future.cancel()
+            self._waiting -= 1
+
+    def _next_request(self, like: Optional[_Request] = None) -> Optional[_Request]:
+        """
+        Oldest request of the next client in rotation (caller holds the lock).
+
+        Args:
+            like: Only take a request that can share a batch with this one
+        """
+        for client, queue in self._queues.items():
+            if queue and (like is None or self._batchable(queue[0], like)):
+                self._queues.move_to_end(client)  # Served: back of the rotation
+                self._waiting -= 1
+                return queue.popleft()
+        return None
+
+    def _batchable(self, request: _Request, like: _Request) -> bool:
+        return (request.language == like.language
+                and self.backend.is_short(request.audio)
+                and self.backend.is_short(like.audio))
+
+    def _next_batch(self) -> list[_Request]:
+        """Block for the next request, then gather batch partners (caller holds the lock)."""
+        first = self._next_request()
+        while first is None and not self._closing:
+            self._cond.wait()
+            first = self._next_request()
+        if first is None:
+            return []
+
+        batch = [first]
+        # Sessions transcribe one utterance at a time, so only wait when others are connected
+        if self.config.max_batch <= 1 or len(self._queues) <= 1 or not self.backend.is_short(first.audio):
+            return batch
+
+        deadline = first.queued_at + self.config.max_wait_ms / 1000
+        while len(batch) < self.config.max_batch and not self._closing:
+            request = self._next_request(like=first)
+            if request is not None:
+                batch.append(request)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                batch = self._next_batch()
+                if not batch:
+                    return
+
+            batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            start = time.monotonic()
+            try:
+                if len(batch) == 1:
+                    results = [self.backend.transcribe(batch[0].audio, language=batch[0].language)]
+                else:
+                    results = self.backend.transcribe_batch([r.audio for r in batch], language=batch[0].language)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            finally:
+                self.stats.busy_s += time.monotonic() - start
+
+            self.stats.batches += 1
+            self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+            for request, result in zip(batch, results):
+                queued = start - request.queued_at
+                result.timings["queue_ms"] = queued * 1000
+                self.stats.queue_s += queued
+                self.stats.completed += 1
+                request.future.set_result(result)
+
+
+class ClientTranscriber:
+    """The scheduler seen as one client's STT backend (blocking transcribe, like STTBackend)."""
+
+    def __init__(self, scheduler: TranscriptionScheduler, client: str,
+                 on_rejected: Optional[Callable[[], None]] = None):
+        self.scheduler = scheduler
+        self.client = client
+        self.on_rejected = on_rejected
+        self.config = scheduler.backend.config
+        self.name = f"shared {scheduler.backend.name}"
+
+    def submit(self, audio: AudioInput, language: Optional[str] = None) -> Future:
+        """Queue audio without blocking; the future resolves to a TranscriptionResult."""
+        future = self.scheduler.submit(self.client, audio, language)
+        if self.on_rejected:
+            def check(f: Future) -> None:
+                if not f.cancelled() and f.exception() is None and f.result().timings.get("rejected"):
+                    self.on_rejected()
+            future.add_done_callback(check)
+        return future
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None) -> TranscriptionResult:
+        return self.submit(audio, language).result()
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    class SlowBackend(STTBackend):
+        """100 ms per pass, however many clips it decodes."""
+        name = "slow"
+
+        def _transcribe_short(self, audio, language):
+            return self._transcribe_short_batch([audio], language)[0]
+
+        def _transcribe_short_batch(self, audios, language):
+            time.sleep(0.1)
+            return [TranscriptionResult(text=f"{len(audio)} samples") for audio in audios]
+
+    from stt_backend import STTConfig
+
+    scheduler = TranscriptionScheduler(SlowBackend(STTConfig()))
+    scheduler.start()
+    order = []
+
+    def client_requests(name: str, count: int) -> None:
+        stt = scheduler.client(name)
+        for _ in range(count):
+            stt.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+            order.append(name)
+
+    # A chatty client doesn't starve the others
+    with ThreadPoolExecutor(4) as pool:
+        pool.submit(client_requests, "busy", 6)
+        time.sleep(0.05)
+        pool.submit(client_requests, "alice", 2)
+        pool.submit(client_requests, "bob", 2)
+
+    print(" ".join(order))
+    print(scheduler.stats.summary())
+    scheduler.close()
@@ -0,0 +1,257 @@
+"""
+Tracing - Per-turn latency traces for Voice V10.
+
+Each utterance gets a TurnTrace that stages mark as it moves through the
+pipeline (speech onset -> transcript -> CLI -> first audio out -> turn
+complete). All marks use time.monotonic(). Finished traces are appended to
+a JSONL file and folded into rolling p50/p95/p99 latency windows, which
+can also be served as JSON from a local HTTP endpoint.
+"""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+# Span marks, in pipeline order
+MARKS = (
+    "speech_onset",       # VAD detected speech
+    "speech_end",         # Last voiced block
+    "endpoint",           # VAD declared end of utterance (after trailing silence)
+    "transcript_ready",
+    "cli_spawned",
+    "first_stdout",       # First line from the CLI
+    "first_speakable",    # First text queued for TTS
+    "first_audio_out",    # First block of speech reaches the speaker
+    "cli_done",           # CLI exited
+    "turn_complete",      # CLI exited and all its speech played or dropped
+    "cancel_requested",
+    "cancel_done",        # Cancelled turn's CLI stopped and its speech silenced
+)
+
+# Reported intervals: (name, from mark, to mark)
+INTERVALS = (
+    ("endpoint", "speech_end", "endpoint"),
+    ("stt", "endpoint", "transcript_ready"),
+    ("cli_spawn", "transcript_ready", "cli_spawned"),
+    ("first_stdout", "cli_spawned", "first_stdout"),
+    ("first_speakable", "transcript_ready", "first_speakable"),
+    ("tts", "first_speakable", "first_audio_out"),
+    ("response", "speech_end", "first_audio_out"),   # What the user waits for
+    ("turn", "speech_onset", "turn_complete"),
+    ("cancel", "cancel_requested", "cancel_done"),
+)
+
+
+@dataclass
+class TracerConfig:
+    """Configuration for latency tracing."""
+    trace_path: Optional[str] = None  # JSONL file (None = don't write traces)
+    window: int = 200                 # Turns kept for rolling percentiles
+    metrics_port: int = 0             # Local HTTP metrics endpoint (0 = off)
+
+
+@dataclass
+class TurnTrace:
+    """Monotonic timestamps for one utterance's trip through the pipeline."""
+    id: int
+    marks: dict[str, float] = field(default_factory=dict)
+    turn: Optional[int] = None        # CLI turn (None for local intents)
+    label: str = "cli"                # "cli", "intent:<name>", "empty", "dropped"
+    text: str = ""
+    cancelled: bool = False
+    pending_speech: int = 0           # Phrases queued but not yet played
+    finished: bool = False
+
+    def mark(self, name: str, at: Optional[float] = None) -> None:
+        """Record a mark; the first recording wins."""
+        if name not in self.marks:
+            self.marks[name] = at if at is not None else time.monotonic()
+
+    def has(self, name: str) -> bool:
+        return name in self.marks
+
+    def intervals(self) -> dict[str, float]:
+        """Interval durations in ms, for intervals whose marks were both recorded."""
+        return {
+            name: (self.marks[end] - self.marks[start]) * 1000
+            for name, start, end in INTERVALS
+            if start in self.marks and end in self.marks
+        }
+
+    def to_dict(self) -> dict:
+        origin = self.marks.get("speech_onset", min(self.marks.values(), default=0.0))
+        return {
+            "id": self.id,
+            "turn": self.turn,
+            "label": self.label,
+            "text": self.text,
+            "cancelled": self.cancelled,
+            "origin": round(origin, 6),
+            "marks_ms": {name: round((t - origin) * 1000, 1) for name, t in self.marks.items()},
+            "intervals_ms": {name: round(ms, 1) for name, ms in self.intervals().items()},
+        }
+
+
+class RollingPercentiles:
+    """Percentiles over the last `window` samples."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile (0 if empty)."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[rank]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "p50": round(self.percentile(50), 1),
+            "p95": round(self.percentile(95), 1),
+            "p99": round(self.percentile(99), 1),
+        }
+
+
+class Tracer:
+    """
+    Creates, finishes and aggregates turn traces.
+
+    Usage:
+        tracer = Tracer(TracerConfig(trace_path="traces.jsonl"))
+        trace = tracer.begin()
+        trace.mark("speech_onset")
+        ...
+        tracer.finish(trace)
+        print(tracer.summary())
+    """
+
+    def __init__(self, config: Optional[TracerConfig] = None):
+        self.config = config or TracerConfig()
+        self.latency = {name: RollingPercentiles(self.config.window) for name, _, _ in INTERVALS}
+        self.turns = 0
+        self.cancelled = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.extra_metrics: Optional[Callable[[], dict]] = None  # Merged into the endpoint output
+
+        if self.config.trace_path:
+            try:
+                self._file = open(self.config.trace_path, "a", encoding="utf-8")
+            except OSError as e:
+                print(f"Trace file disabled: {e}")
+
+    def begin(self) -> TurnTrace:
+        """Start a new trace."""
+        with self._lock:
+            self._next_id += 1
+            return TurnTrace(id=self._next_id)
+
+    def finish(self, trace: Optional[TurnTrace]) -> None:
+        """Record a finished trace (idempotent)."""
+        if trace is None or trace.finished:
+            return
+        trace.finished = True
+
+        with self._lock:
+            self.turns += 1
+            if trace.cancelled:
+                self.cancelled += 1
+            for name, ms in trace.intervals().items():
+                self.latency[name].add(ms)
+
+            if self._file:
+                self._file.write(json.dumps(trace.to_dict()) + "\n")
+                self._file.flush()
+
+    def snapshot(self) -> dict:
+        """Rolling latency percentiles (ms) per interval."""
+        with self._lock:
+            metrics = {
+                "turns": self.turns,
+                "cancelled": self.cancelled,
+                "latency_ms": {name: stats.snapshot() for name, stats in self.latency.items() if stats.count},
+            }
+        if self.extra_metrics:
+            metrics.update(self.extra_metrics())
+        return metrics
+
+    def summary(self) -> str:
+        lines = [f"  {'interval':16} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8}"]
+        for name, stats in self.latency.items():
+            if stats.count:
+                s = stats.snapshot()
+                lines.append(f"  {name:16} {s['count']:5} {s['p50']:8.0f} {s['p95']:8.0f} {s['p99']:8.0f}")
+        return "\n".join(lines)
+
+    def serve(self, port: Optional[int] = None) -> None:
+        """Serve snapshot() as JSON on http://127.0.0.1:<port>/metrics."""
+        port = port or self.config.metrics_port
+        if not port or self._server:
+            return
+
+        tracer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(tracer.snapshot(), indent=2).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep the console for the conversation
+
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        except OSError as e:
+            print(f"Metrics endpoint disabled: {e}")
+            return
+        threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        print(f"Metrics: http://127.0.0.1:{port}/metrics")
+
+    def close(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+if __name__ == "__main__":
+    import random
+
+    tracer = Tracer()
+    for _ in range(50):
+        trace = tracer.begin()
+        t = time.monotonic()
+        for name, offset in [("speech_onset", 0.0), ("speech_end", 1.2), ("endpoint", 2.0),
+                             ("transcript_ready", 2.3), ("cli_spawned", 2.35), ("first_stdout", 3.5),
+                             ("first_speakable", 4.0), ("first_audio_out", 4.6), ("turn_complete", 8.0)]:
+            trace.mark(name, t + offset + random.uniform(0, 0.2))
+        tracer.finish(trace)
+
+    print(tracer.summary())
+    print(json.dumps(trace.to_dict(), indent=2))
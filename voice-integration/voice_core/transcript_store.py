@@ -0,0 +1,443 @@
+"""
+Transcript Store - Indexed, compressed session history for Voice V10.
+
+Conversation state otherwise lives only inside the CLI, keyed by session id.
+This keeps a local, append-only record of every session: what the user said
+(transcripts), what the CLI sent (parsed messages) and what was spoken back.
+
+Everything lives in one SQLite file:
+    sessions     one row per CLI session: time span, entry count, title
+    entries      one row per item; text zlib-compressed
+    payloads     raw CLI message JSON, compressed, stored once per distinct
+                 payload (entries refer to it by hash)
+    entries_fts  contentless FTS5 index over entry text
+with indexes on (session, time), time and tool, so listing and resuming the
+last session is a single index lookup and full-text search over months of
+sessions stays in the milliseconds.
+
+Writes are queued to a writer thread and committed in batches, so callers
+on the event loop never wait on the disk.
+
+Usage:
+    python transcript_store.py list
+    python transcript_store.py show [SESSION]      # Default: the last session
+    python transcript_store.py search "migration failed"
+"""
+
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from stream_parser import ParsedMessage, MessageType
+
+DEFAULT_TRANSCRIPT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "voice_v10", "transcripts.db")
+
+# Entry kinds
+TRANSCRIPT = "transcript"            # User speech, as transcribed
+MESSAGE = "message"                  # Parsed CLI stream message
+SPEECH = "speech"                    # Text spoken back to the user
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started REAL NOT NULL,
+    last REAL NOT NULL,
+    entries INTEGER NOT NULL DEFAULT 0,
+    working_directory TEXT,
+    model TEXT,
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_last ON sessions (last);
+CREATE TABLE IF NOT EXISTS payloads (
+    hash BLOB PRIMARY KEY,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    msg_type TEXT,
+    tool TEXT,
+    text BLOB,
+    payload BLOB
+);
+CREATE INDEX IF NOT EXISTS entries_session_ts ON entries (session_id, ts);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);
+CREATE INDEX IF NOT EXISTS entries_tool ON entries (tool, ts) WHERE tool IS NOT NULL;
+"""
+
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(text, content='')"
+
+
+@dataclass
+class SessionInfo:
+    """Summary of one stored session."""
+    id: str
+    started: float                   # time.time()
+    last: float
+    entries: int
+    working_directory: Optional[str] = None
+    model: Optional[str] = None
+    title: Optional[str] = None      # First thing the user said
+
+
+@dataclass
+class Entry:
+    """One stored item."""
+    id: int
+    session_id: str
+    ts: float
+    kind: str                        # TRANSCRIPT, MESSAGE or SPEECH
+    text: str
+    msg_type: Optional[str] = None   # MessageType value, for MESSAGE entries
+    tool: Optional[str] = None
+    payload_hash: Optional[bytes] = None
+
+
+def _compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def _decompress(data: Optional[bytes]) -> str:
+    return zlib.decompress(data).decode("utf-8") if data else ""
+
+
+def _fts_query(query: str) -> str:
+    """Every word must match; words are quoted so punctuation can't break the syntax."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+class TranscriptStore:
+    """
+    Append-only session history with full-text search.
+
+    Usage:
+        store = TranscriptStore()
+        store.open_session(session_id, working_directory=cwd, model="sonnet")
+        store.append(session_id, TRANSCRIPT, "run the tests")
+        store.log_message(session_id, parsed)
+        last = store.last_session()
+        hits = store.search("migration failed")
+        store.close()
+    """
+
+    def __init__(self, path: str = DEFAULT_TRANSCRIPT_PATH, flush_interval_s: float = 0.2):
+        """
+        Args:
+            path: SQLite file (":memory:" is not supported: reader and
+                writer use separate connections)
+            flush_interval_s: Longest a write waits in the batch before commit
+        """
+        self.path = path
+        self.flush_interval_s = flush_interval_s
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._db = self._connect()
+        self._db.executescript(_SCHEMA)
+        try:
+            self._db.execute(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:  # SQLite built without FTS5: search scans instead
+            self.has_fts = False
+        self._db.commit()
+        self._read_lock = threading.Lock()
+
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="transcript-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    # ------------------------------------------------------------------
+    # Writing (non-blocking)
+    # ------------------------------------------------------------------
+
+    def open_session(self, session_id: str, working_directory: Optional[str] = None,
+                     model: Optional[str] = None) -> None:
+        """Record a session's metadata (no-op if it already exists)."""
+        self._queue.put(("session", session_id, time.time(), working_directory, model))
+
+    def append(self, session_id: str, kind: str, text: str, msg_type: Optional[str] = None,
+               tool: Optional[str] = None, payload: Optional[dict] = None,
+               ts: Optional[float] = None) -> None:
+        """Queue an entry; it is committed within flush_interval_s."""
+        self._queue.put(("entry", session_id, ts or time.time(), kind, text or "", msg_type, tool, payload))
+
+    def log_message(self, session_id: str, parsed: ParsedMessage, ts: Optional[float] = None) -> None:
+        """Queue a parsed CLI message, with its raw payload."""
+        text = parsed.text or ""
+        if parsed.type == MessageType.TOOL_RESULT:
+            text = parsed.tool_result or ""
+        self.append(session_id, MESSAGE, text, msg_type=parsed.type.value,
+                    tool=parsed.tool_name, payload=parsed.raw_data or None, ts=ts)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until everything queued so far is committed."""
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait(timeout)
+
+    def _write_loop(self) -> None:
+        db = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_s
+            while batch[-1][0] == "entry" or batch[-1][0] == "session":
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or len(batch) >= 500:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                with db:
+                    for item in batch:
+                        if item[0] == "session":
+                            self._write_session(db, *item[1:])
+                        elif item[0] == "entry":
+                            self._write_entry(db, *item[1:])
+            except sqlite3.Error as e:
+                print(f"\n[Transcript store write failed: {e}]")
+
+            for item in batch:
+                if item[0] == "flush":
+                    item[1].set()
+                elif item[0] == "close":
+                    db.close()
+                    item[1].set()
+                    return
+
+    def _write_session(self, db: sqlite3.Connection, session_id: str, ts: float,
+                       working_directory: Optional[str], model: Optional[str]) -> None:
+        db.execute(
+            "INSERT OR IGNORE INTO sessions (id, started, last, working_directory, model) VALUES (?, ?, ?, ?, ?)",
+            (session_id, ts, ts, working_directory, model),
+        )
+
+    def _write_entry(self, db: sqlite3.Connection, session_id: str, ts: float, kind: str, text: str,
+                     msg_type: Optional[str], tool: Optional[str], payload: Optional[dict]) -> None:
+        payload_hash = None
+        if payload:
+            raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+            payload_hash = hashlib.sha256(raw).digest()[:16]
+            db.execute("INSERT OR IGNORE INTO payloads (hash, data) VALUES (?, ?)",
+                       (payload_hash, zlib.compress(raw, 6)))
+
+        cursor = db.execute(
+            "INSERT INTO entries (session_id, ts, kind, msg_type, tool, text, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (session_id, ts, kind, msg_type, tool, _compress(text) if text else None, payload_hash),
+        )
+        if text and self.has_fts:
+            db.execute("INSERT INTO entries_fts (rowid, text) VALUES (?, ?)", (cursor.lastrowid, text))
+
+        db.execute("INSERT OR IGNORE INTO sessions (id, started, last) VALUES (?, ?, ?)", (session_id, ts, ts))
+        db.execute("UPDATE sessions SET last = MAX(last, ?), entries = entries + 1 WHERE id = ?", (ts, session_id))
+        if kind == TRANSCRIPT and text:
+            db.execute("UPDATE sessions SET title = ? WHERE id = ? AND title IS NULL", (text[:120], session_id))
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._read_lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def sessions(self, limit: int = 20, working_directory: Optional[str] = None,
+                 since: Optional[float] = None) -> list[SessionInfo]:
+        """Sessions with at least one entry, most recently active first."""
+        sql = "SELECT id, started, last, entries, working_directory, model, title FROM sessions WHERE entries > 0"
+        params: list[Any] = []
+        if working_directory is not None:
+            sql += " AND working_directory = ?"
+            params.append(working_directory)
+        if since is not None:
+            sql += " AND last >= ?"
+            params.append(since)
+        sql += " ORDER BY last DESC LIMIT ?"
+        params.append(limit)
+        return [SessionInfo(*row) for row in self._query(sql, tuple(params))]
+
+    def last_session(self, working_directory: Optional[str] = None,
+                     exclude: Optional[str] = None) -> Optional[SessionInfo]:
+        """The most recently active session (optionally in a directory, other than exclude)."""
+        for session in self.sessions(limit=2, working_directory=working_directory):
+            if session.id != exclude:
+                return session
+        return None
+
+    def entries(self, session_id: str, kinds: Optional[list[str]] = None, tool: Optional[str] = None,
+                since: Optional[float] = None, until: Optional[float] = None,
+                limit: Optional[int] = None, newest: bool = False) -> list[Entry]:
+        """
+        A session's entries in time order.
+
+        Args:
+            newest: With limit, take the last `limit` entries rather than the first
+        """
+        sql = "SELECT id, session_id, ts, kind, text, msg_type, tool, payload FROM entries WHERE session_id = ?"
+        params: list[Any] = [session_id]
+        if kinds:
+            sql += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        if tool is not None:
+            sql += " AND tool = ?"
+            params.append(tool)
+        if since is not None:
+            sql += " AND ts >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND ts < ?"
+            params.append(until)
+        sql += " ORDER BY ts DESC, id DESC" if newest else " ORDER BY ts, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self._query(sql, tuple(params))
+        if newest:
+            rows.reverse()
+        return [self._entry(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20, session_id: Optional[str] = None,
+               kinds: Optional[list[str]] = None, since: Optional[float] = None,
+               until: Optional[float] = None) -> list[Entry]:
+        """
+        Entries containing every word of query, newest first.
+
+        Rowids grow with appends, so newest-first walks the index backwards
+        and stops at limit instead of ranking every match. Without FTS5 this
+        falls back to a scan, which is correct but slow.
+        """
+        filters, params = [], []
+        if session_id is not None:
+            filters.append("e.session_id = ?")
+            params.append(session_id)
+        if kinds:
+            filters.append(f"e.kind IN ({', '.join('?' * len(kinds))})")
+            params.extend(kinds)
+        if since is not None:
+            filters.append("e.ts >= ?")
+            params.append(since)
+        if until is not None:
+            filters.append("e.ts < ?")
+            params.append(until)
+        where = (" AND " + " AND ".join(filters)) if filters else ""
+        columns = "e.id, e.session_id, e.ts, e.kind, e.text, e.msg_type, e.tool, e.payload"
+
+        if self.has_fts:
+            rows = self._query(
+                f"SELECT {columns} FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+                f"WHERE entries_fts MATCH ?{where} ORDER BY entries_fts.rowid DESC LIMIT ?",
+                (_fts_query(query), *params, limit),
+            )
+            return [self._entry(row) for row in rows]
+
+        words = query.lower().split()
+        hits = []
+        for row in self._query(f"SELECT {columns} FROM entries e WHERE e.text IS NOT NULL{where} "
+                               "ORDER BY e.ts DESC", tuple(params)):
+            entry = self._entry(row)
+            if all(word in entry.text.lower() for word in words):
+                hits.append(entry)
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def payload(self, payload_hash: bytes) -> Optional[dict]:
+        """The raw CLI message an entry was parsed from."""
+        rows = self._query("SELECT data FROM payloads WHERE hash = ?", (payload_hash,))
+        return json.loads(zlib.decompress(rows[0][0])) if rows else None
+
+    def stats(self) -> dict:
+        """Row counts and file size."""
+        sessions, entries = self._query("SELECT COUNT(*), COALESCE(SUM(entries), 0) FROM sessions")[0]
+        payloads = self._query("SELECT COUNT(*) FROM payloads")[0][0]
+        return {
+            "sessions": sessions,
+            "entries": entries,
+            "payloads": payloads,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+    @staticmethod
+    def _entry(row: tuple) -> Entry:
+        entry_id, session_id, ts, kind, text, msg_type, tool, payload = row
+        return Entry(entry_id, session_id, ts, kind, _decompress(text), msg_type, tool, payload)
+
+    def close(self) -> None:
+        """Commit everything queued and stop the writer."""
+        if self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(("close", done))
+            done.wait(5.0)
+        with self._read_lock:
+            self._db.close()
+
+
+def format_entry(entry: Entry, width: int = 100) -> str:
+    """One line: time, who, text."""
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.ts))
+    who = {TRANSCRIPT: "you", SPEECH: "spoken"}.get(entry.kind, entry.tool or entry.msg_type or entry.kind)
+    text = " ".join(entry.text.split())
+    if len(text) > width:
+        text = text[:width - 3] + "..."
+    return f"{stamp}  {who:<12} {text}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Browse and search Voice V10 session transcripts")
+    parser.add_argument("--path", default=DEFAULT_TRANSCRIPT_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Recent sessions")
+    show = commands.add_parser("show", help="A session's transcript")
+    show.add_argument("session", nargs="?", help="Session id or prefix (default: the last session)")
+    show.add_argument("--all", action="store_true", help="Include tool results and other CLI messages")
+    search = commands.add_parser("search", help="Full-text search over every session")
+    search.add_argument("query")
+    search.add_argument("-n", "--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = TranscriptStore(args.path)
+    try:
+        if args.command == "list":
+            for s in store.sessions():
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(s.last))
+                print(f"{s.id[:8]}  {when}  {s.entries:4d} entries  {s.title or ''}")
+            print(f"\n{store.stats()}")
+        elif args.command == "show":
+            session = None
+            if args.session:
+                matches = [s for s in store.sessions(limit=1000) if s.id.startswith(args.session)]
+                session = matches[0] if matches else None
+            else:
+                session = store.last_session()
+            if session is None:
+                print("No such session")
+            else:
+                kinds = None if args.all else [TRANSCRIPT, SPEECH]
+                for entry in store.entries(session.id, kinds=kinds):
+                    print(format_entry(entry))
+        elif args.command == "search":
+            start = time.perf_counter()
+            hits = store.search(args.query, limit=args.limit)
+            for entry in hits:
+                print(f"{entry.session_id[:8]}  {format_entry(entry)}")
+            print(f"\n{len(hits)} hits in {(time.perf_counter() - start) * 1000:.1f} ms")
+    finally:
+        store.close()
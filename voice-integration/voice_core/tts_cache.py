@@ -0,0 +1,240 @@
+"""
+TTS Cache - Synthesised speech cache for Voice V10.
+
+Keeps decoded PCM for repeated phrases ("Reading package.json", "Goodbye!")
+in an in-memory LRU backed by a size-bounded disk tier, so they play
+without a synthesis round trip, including across sessions.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "voice_v10", "tts")
+
+# Fixed phrases Voice V10 speaks itself, synthesised at startup
+PREWARM_PHRASES = [
+    "Goodbye!",
+    "Starting a new conversation.",
+    "I'm still busy with earlier requests.",
+    "No files found",
+    "No matches found",
+]
+
+
+@dataclass
+class TTSCacheConfig:
+    """Configuration for the TTS cache."""
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR  # None = memory only
+    memory_items: int = 64           # Clips kept in memory
+    disk_limit_mb: float = 50.0      # Disk tier size bound (LRU eviction)
+    max_text_chars: int = 120        # Longer phrases (Claude's answers) rarely repeat
+
+
+@dataclass
+class TTSCacheStats:
+    """Hit/miss counters for the TTS cache."""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    prewarmed: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.memory_hits + self.disk_hits) / self.lookups if self.lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.lookups} lookups, {self.hit_rate:.0%} hit "
+            f"({self.memory_hits} memory, {self.disk_hits} disk), "
+            f"{self.prewarmed} prewarmed, {self.evictions} evicted"
+        )
+
+
+class TTSCache:
+    """
+    Two-tier cache of synthesised speech keyed by text, voice and rate.
+
+    Disk entries are raw int16 PCM named "<key>-<sample rate>.pcm"; file
+    modification time orders the disk LRU, so the order survives restarts.
+
+    Usage:
+        cache = TTSCache()
+        hit = cache.get("Goodbye!", voice, rate)
+        if hit is None:
+            cache.put("Goodbye!", voice, rate, samples, 24000)
+    """
+
+    def __init__(self, config: Optional[TTSCacheConfig] = None):
+        self.config = config or TTSCacheConfig()
+        self.stats = TTSCacheStats()
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, tuple[np.ndarray, int]] = OrderedDict()
+        self._disk: OrderedDict[str, tuple[str, int, int]] = OrderedDict()  # key -> (path, rate, bytes)
+        self._disk_bytes = 0
+
+        if self.config.cache_dir:
+            try:
+                os.makedirs(self.config.cache_dir, exist_ok=True)
+                self._load_index()
+            except OSError as e:
+                print(f"TTS cache disabled on disk: {e}")
+                self.config.cache_dir = None
+
+    @staticmethod
+    def key(text: str, voice: str, rate: str) -> str:
+        return hashlib.sha1(f"{voice}|{rate}|{text.strip()}".encode("utf-8")).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        return 0 < len(text.strip()) <= self.config.max_text_chars
+
+    def contains(self, text: str, voice: str, rate: str) -> bool:
+        """Check for an entry without counting a lookup."""
+        key = self.key(text, voice, rate)
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def get(self, text: str, voice: str, rate: str) -> Optional[tuple[np.ndarray, int]]:
+        """
+        Look up a phrase.
+
+        Returns:
+            (samples, sample_rate), or None on a miss
+        """
+        if not self.cacheable(text):
+            return None
+
+        key = self.key(text, voice, rate)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return entry
+
+            disk = self._disk.get(key)
+            if disk is not None:
+                path, sample_rate, _ = disk
+                try:
+                    samples = np.fromfile(path, dtype=np.int16)
+                    os.utime(path)
+                except OSError:
+                    self._drop_disk(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._remember(key, (samples, sample_rate))
+                    self.stats.disk_hits += 1
+                    return samples, sample_rate
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, text: str, voice: str, rate: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Store a synthesised phrase in both tiers."""
+        if not self.cacheable(text):
+            return
+
+        key = self.key(text, voice, rate)
+        samples = np.ascontiguousarray(samples, dtype=np.int16)
+        with self._lock:
+            self._remember(key, (samples, sample_rate))
+            self.stats.stores += 1
+
+            if self.config.cache_dir and key not in self._disk:
+                path = os.path.join(self.config.cache_dir, f"{key}-{sample_rate}.pcm")
+                tmp = path + ".tmp"  # A torn write must never be served as a hit
+                try:
+                    samples.tofile(tmp)
+                    os.replace(tmp, path)
+                except OSError as e:
+                    print(f"TTS cache write failed: {e}")
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+                    return
+                self._disk[key] = (path, sample_rate, samples.nbytes)
+                self._disk_bytes += samples.nbytes
+                self._evict_disk()
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk):
+                self._drop_disk(key)
+
+    def _remember(self, key: str, entry: tuple[np.ndarray, int]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.config.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        limit = self.config.disk_limit_mb * 1024 * 1024
+        while self._disk_bytes > limit and len(self._disk) > 1:
+            self._drop_disk(next(iter(self._disk)))
+            self.stats.evictions += 1
+
+    def _drop_disk(self, key: str) -> None:
+        path, _, size = self._disk.pop(key)
+        self._disk_bytes -= size
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _load_index(self) -> None:
+        """Rebuild the disk index, oldest first."""
+        entries = []
+        for name in os.listdir(self.config.cache_dir):
+            if name.endswith(".pcm.tmp"):  # Left by a crash mid-write
+                try:
+                    os.unlink(os.path.join(self.config.cache_dir, name))
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(".pcm"):
+                continue
+            key, _, rate = name[:-4].rpartition("-")
+            if not key or not rate.isdigit():
+                continue
+            path = os.path.join(self.config.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, key, path, int(rate), stat.st_size))
+
+        for _, key, path, rate, size in sorted(entries):
+            self._disk[key] = (path, rate, size)
+            self._disk_bytes += size
+        self._evict_disk()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTSCache(TTSCacheConfig(cache_dir=tmp, memory_items=2, disk_limit_mb=0.2))
+        clip = (np.random.randn(24000) * 3000).astype(np.int16)  # 1 s
+
+        for phrase in ["Goodbye!", "Reading package.json", "Running npm"]:
+            cache.put(phrase, "en-US-GuyNeural", "+10%", clip, 24000)
+
+        for phrase in ["Running npm", "Goodbye!", "Reading package.json", "Never seen"]:
+            start = time.perf_counter()
+            hit = cache.get(phrase, "en-US-GuyNeural", "+10%")
+            print(f"{phrase!r:25} {'hit ' if hit else 'miss'} ({(time.perf_counter() - start) * 1000:.2f} ms)")
+
+        print(cache.stats.summary())
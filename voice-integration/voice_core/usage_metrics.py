@@ -0,0 +1,259 @@
+"""
+Usage Metrics - Per-turn token, cost and duration accounting for Voice V10.
+
+Every CLI run ends with a result message carrying its usage, cost and
+duration. Each one becomes a TurnRecord, appended as a JSON line to a local
+log (never rewritten), so model choices can be compared on latency and cost
+from real traffic. Records aggregate per session, day or model, and turns
+that are slow or expensive raise an alert.
+
+Usage:
+    python usage_metrics.py                  # Per-day totals for the last week
+    python usage_metrics.py --by model --days 30
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field, asdict, fields
+from typing import Callable, Iterator, Optional
+
+from stream_parser import ResultUsage
+
+DEFAULT_USAGE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "voice_v10", "usage.jsonl")
+
+
+@dataclass
+class UsageConfig:
+    """Configuration for usage accounting."""
+    path: Optional[str] = DEFAULT_USAGE_PATH  # Append-only JSONL (None = memory only)
+    slow_turn_s: float = 60.0        # Alert on turns slower than this (0 = off)
+    expensive_turn_usd: float = 0.50  # Alert on turns costing more than this (0 = off)
+
+
+@dataclass
+class TurnRecord:
+    """One CLI run's usage, as stored."""
+    timestamp: float                 # time.time() when the result arrived
+    session_id: Optional[str] = None
+    requested_model: Optional[str] = None  # CLIConfig.model, e.g. "sonnet"
+    model: Optional[str] = None      # Model the CLI reported
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost_usd: float = 0.0
+    duration_ms: float = 0.0
+    duration_api_ms: float = 0.0
+    wall_ms: float = 0.0             # Spawn to result, as seen from here (includes CLI startup)
+    num_turns: int = 0
+    is_error: bool = False
+
+    @classmethod
+    def from_usage(cls, usage: ResultUsage, requested_model: Optional[str] = None,
+                   wall_ms: float = 0.0, timestamp: Optional[float] = None) -> "TurnRecord":
+        values = {f.name: getattr(usage, f.name) for f in fields(cls) if hasattr(usage, f.name)}
+        return cls(timestamp=timestamp or time.time(), requested_model=requested_model,
+                   wall_ms=wall_ms, **values)
+
+    @property
+    def day(self) -> str:
+        return time.strftime("%Y-%m-%d", time.localtime(self.timestamp))
+
+    def summary(self) -> str:
+        return (
+            f"{self.duration_ms / 1000:.1f}s, ${self.cost_usd:.4f}, "
+            f"{self.input_tokens + self.cache_read_tokens + self.cache_write_tokens} in "
+            f"({self.cache_read_tokens} cached) / {self.output_tokens} out"
+        )
+
+
+@dataclass
+class UsageTotals:
+    """Aggregate over a group of turns."""
+    turns: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost_usd: float = 0.0
+    durations_ms: list[float] = field(default_factory=list)
+
+    def add(self, record: TurnRecord) -> None:
+        self.turns += 1
+        self.errors += record.is_error
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.cache_read_tokens += record.cache_read_tokens
+        self.cache_write_tokens += record.cache_write_tokens
+        self.cost_usd += record.cost_usd
+        self.durations_ms.append(record.duration_ms)
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank duration percentile in ms (0 if empty)."""
+        if not self.durations_ms:
+            return 0.0
+        ordered = sorted(self.durations_ms)
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of prompt tokens served from the prompt cache."""
+        prompt = self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+        return self.cache_read_tokens / prompt if prompt else 0.0
+
+    @property
+    def cost_per_turn(self) -> float:
+        return self.cost_usd / self.turns if self.turns else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.turns} turns, ${self.cost_usd:.4f} (${self.cost_per_turn:.4f}/turn), "
+            f"p50 {self.percentile(50) / 1000:.1f}s p95 {self.percentile(95) / 1000:.1f}s, "
+            f"{self.output_tokens} out, {self.cache_hit_ratio:.0%} cached"
+        )
+
+    def to_dict(self) -> dict:
+        totals = asdict(self)
+        del totals["durations_ms"]
+        totals.update(
+            cost_usd=round(self.cost_usd, 6),
+            p50_ms=round(self.percentile(50), 1),
+            p95_ms=round(self.percentile(95), 1),
+            cache_hit_ratio=round(self.cache_hit_ratio, 3),
+        )
+        return totals
+
+
+GROUP_KEYS = {
+    "day": lambda r: r.day,
+    "session": lambda r: r.session_id or "-",
+    "model": lambda r: r.model or r.requested_model or "-",
+    "requested_model": lambda r: r.requested_model or "-",
+}
+
+
+class UsageLog:
+    """
+    Append-only log of TurnRecords with aggregation and alerts.
+
+    Usage:
+        log = UsageLog(UsageConfig(), on_alert=print)
+        record = log.record(parsed.usage, requested_model="sonnet", wall_ms=5400)
+        for model, totals in log.aggregate("model", since=time.time() - 7 * 86400).items():
+            print(model, totals.summary())
+    """
+
+    def __init__(self, config: Optional[UsageConfig] = None,
+                 on_alert: Optional[Callable[[str, TurnRecord], None]] = None):
+        self.config = config or UsageConfig()
+        self.on_alert = on_alert
+        self.sessions: dict[str, UsageTotals] = {}  # Recorded by this process, per session
+        self._lock = threading.Lock()
+
+    def record(self, usage: ResultUsage, requested_model: Optional[str] = None,
+               wall_ms: float = 0.0, session_id: Optional[str] = None) -> TurnRecord:
+        """
+        Store one CLI run's usage and check it against the alert limits.
+
+        Args:
+            usage: From the result message (ParsedMessage.usage)
+            requested_model: The model the CLI was asked for
+            wall_ms: Spawn to result as measured by the caller
+            session_id: Used when the result message doesn't carry one
+        """
+        record = TurnRecord.from_usage(usage, requested_model, wall_ms)
+        record.session_id = record.session_id or session_id
+        with self._lock:
+            self.sessions.setdefault(record.session_id or "-", UsageTotals()).add(record)
+            if self.config.path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.config.path)), exist_ok=True)
+                with open(self.config.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(record)) + "\n")
+
+        for message in self.check(record):
+            if self.on_alert:
+                self.on_alert(message, record)
+        return record
+
+    def check(self, record: TurnRecord) -> list[str]:
+        """Alert messages for a turn over the configured limits."""
+        alerts = []
+        if self.config.slow_turn_s and record.duration_ms > self.config.slow_turn_s * 1000:
+            alerts.append(f"slow turn: {record.duration_ms / 1000:.0f}s ({record.model or record.requested_model})")
+        if self.config.expensive_turn_usd and record.cost_usd > self.config.expensive_turn_usd:
+            alerts.append(f"expensive turn: ${record.cost_usd:.2f} ({record.model or record.requested_model})")
+        return alerts
+
+    def read(self, since: Optional[float] = None, until: Optional[float] = None,
+             session_id: Optional[str] = None, model: Optional[str] = None) -> Iterator[TurnRecord]:
+        """
+        Stored records, oldest first, filtered by time (time.time() values),
+        session and model (reported or requested).
+        """
+        if not self.config.path or not os.path.exists(self.config.path):
+            return
+        known = {f.name for f in fields(TurnRecord)}
+        with open(self.config.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue  # Torn final line from a crash
+                record = TurnRecord(**{k: v for k, v in data.items() if k in known})
+                if since is not None and record.timestamp < since:
+                    continue
+                if until is not None and record.timestamp >= until:
+                    continue
+                if session_id is not None and record.session_id != session_id:
+                    continue
+                if model is not None and model not in (record.model, record.requested_model):
+                    continue
+                yield record
+
+    def aggregate(self, by: str = "day", **filters) -> dict[str, UsageTotals]:
+        """
+        Totals per group over stored records.
+
+        Args:
+            by: "day", "session", "model" or "requested_model"
+            **filters: As for read()
+        """
+        key = GROUP_KEYS[by]
+        groups: dict[str, UsageTotals] = {}
+        for record in self.read(**filters):
+            groups.setdefault(key(record), UsageTotals()).add(record)
+        return groups
+
+    def snapshot(self) -> dict:
+        """This process's per-session totals (for the metrics endpoint)."""
+        return {session: totals.to_dict() for session, totals in self.sessions.items()}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarise Claude CLI usage recorded by Voice V10")
+    parser.add_argument("--by", default="day", choices=list(GROUP_KEYS))
+    parser.add_argument("--days", type=float, default=7, help="How far back to look")
+    parser.add_argument("--model", help="Only turns on this model (reported or requested)")
+    parser.add_argument("--path", default=DEFAULT_USAGE_PATH)
+    args = parser.parse_args()
+
+    log = UsageLog(UsageConfig(path=args.path))
+    groups = log.aggregate(args.by, since=time.time() - args.days * 86400, model=args.model)
+    if not groups:
+        print(f"No turns recorded in {args.path} over the last {args.days:g} days")
+    overall = UsageTotals()
+    for name, totals in sorted(groups.items()):
+        print(f"{name:<36} {totals.summary()}")
+        overall.turns += totals.turns
+        overall.cost_usd += totals.cost_usd
+        overall.output_tokens += totals.output_tokens
+        overall.durations_ms += totals.durations_ms
+    if len(groups) > 1:
+        print(f"{'total':<36} {overall.turns} turns, ${overall.cost_usd:.4f}, "
+              f"p95 {overall.percentile(95) / 1000:.1f}s")
@@ -0,0 +1,218 @@
+"""
+VAD - Energy-based utterance segmentation for Voice V10.
+
+Splits a stream of capture blocks into utterances: speech starts when a
+block's RMS crosses the threshold and ends after a run of trailing silence.
+Durations are counted in samples rather than wall-clock time, so the same
+audio always segments the same way however fast it is fed (live capture,
+WAV fixtures, benchmarks).
+
+compact_speech() is the offline counterpart for a finished recording: it
+trims leading and trailing silence and shortens long pauses before the audio
+goes to Whisper, whose cost grows with input length, and returns a TimeMap
+for mapping timestamps back to the original.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+
+
+@dataclass
+class VADConfig:
+    """Configuration for utterance segmentation."""
+    sample_rate: int = 16000
+    threshold: float = 0.02          # RMS threshold for speech detection
+    silence_ms: int = 800            # Silence duration to end utterance
+    min_speech_ms: int = 300         # Minimum utterance duration (onset to end of silence)
+    max_speech_ms: int = 0           # Cut utterances at this length (0 = no limit)
+
+
+class VADSegmenter:
+    """
+    Accumulates capture blocks into utterances.
+
+    Usage:
+        vad = VADSegmenter(VADConfig(threshold=0.02))
+        for block in blocks:
+            audio = vad.push(block)
+            if audio is not None:
+                transcribe(audio)
+    """
+
+    def __init__(self, config: Optional[VADConfig] = None):
+        self.config = config or VADConfig()
+        self._silence_limit = self.config.sample_rate * self.config.silence_ms // 1000
+        self._min_speech = self.config.sample_rate * self.config.min_speech_ms // 1000
+        self._max_speech = self.config.sample_rate * self.config.max_speech_ms // 1000
+        self._chunks: list[np.ndarray] = []
+        self._speech_samples = 0     # Since onset, including trailing silence
+        self._silence_samples = 0    # Trailing silence since the last voiced block
+        self.in_speech = False
+
+    def is_speech(self, block: np.ndarray) -> bool:
+        """Check a block's RMS against the threshold (int16 or float blocks)."""
+        samples = block.reshape(-1)
+        if samples.size == 0:
+            return False
+        samples = samples.astype(np.float32)
+        if block.dtype == np.int16:
+            samples *= 1 / 32768.0
+        rms = np.sqrt(np.dot(samples, samples) / samples.size)
+        return rms > self.config.threshold
+
+    def push(self, block: np.ndarray, is_speech: Optional[bool] = None) -> Optional[np.ndarray]:
+        """
+        Add a capture block.
+
+        Args:
+            block: Capture block (frames x channels, as delivered by the stream)
+            is_speech: Override the energy decision (e.g. barge-in gating)
+
+        Returns:
+            The utterance's audio when this block ends it, otherwise None
+        """
+        if is_speech is None:
+            is_speech = self.is_speech(block)
+        frames = len(block)
+
+        if is_speech:
+            self.in_speech = True
+            self._chunks.append(block)
+            self._speech_samples += frames
+            self._silence_samples = 0
+            if self._max_speech and self._speech_samples >= self._max_speech:
+                return self.flush()  # Still talking: the next block starts a new utterance
+            return None
+
+        if not self.in_speech:
+            return None
+
+        self._chunks.append(block)  # Include some silence
+        self._speech_samples += frames
+        self._silence_samples += frames
+        if self._silence_samples <= self._silence_limit:
+            return None
+
+        if self._speech_samples <= self._min_speech:
+            self.reset()  # Too short
+            return None
+
+        audio = np.concatenate(self._chunks)
+        self.reset()
+        return audio
+
+    def flush(self) -> Optional[np.ndarray]:
+        """Return any utterance in progress (e.g. at end of input) and reset."""
+        audio = np.concatenate(self._chunks) if self.in_speech and self._chunks else None
+        self.reset()
+        return audio
+
+    def reset(self) -> None:
+        """Discard any utterance in progress."""
+        self._chunks = []
+        self._speech_samples = 0
+        self._silence_samples = 0
+        self.in_speech = False
+
+
+@dataclass
+class TimeMap:
+    """Maps times in compacted audio back to the original recording."""
+    compact_starts: np.ndarray    # Seconds: where each kept span starts in the compacted audio
+    original_starts: np.ndarray   # Seconds: where that span started in the original
+    removed_s: float = 0.0        # Silence cut out
+
+    def to_original(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Original time(s) for time(s) in the compacted audio."""
+        t = np.asarray(t, dtype=np.float64)
+        if len(self.compact_starts) == 0:
+            return float(t) if t.ndim == 0 else t
+        span = np.clip(np.searchsorted(self.compact_starts, t, side="right") - 1, 0, None)
+        original = self.original_starts[span] + (t - self.compact_starts[span])
+        return float(original) if original.ndim == 0 else original
+
+
+def compact_speech(audio: np.ndarray, sample_rate: int = 16000, threshold: Optional[float] = None,
+                   frame_ms: int = 20, gap_ms: int = 300) -> tuple[np.ndarray, TimeMap]:
+    """
+    Trim silence from a recording and shorten long pauses to a fixed gap.
+
+    Frames quieter than threshold are dropped unless they lie within gap_ms/2
+    of speech, so pauses up to gap_ms are kept as they are, longer ones
+    shrink to gap_ms, and gap_ms/2 of lead-in and tail remain.
+
+    Args:
+        audio: Samples (int16 or float), any shape; used as mono
+        sample_rate: Sample rate of audio
+        threshold: Frame RMS (full scale = 1.0) counted as speech; None =
+            adapt to the recording's noise floor
+        frame_ms: Analysis frame
+        gap_ms: Longest pause kept
+
+    Returns:
+        (compacted 1-D audio of the input dtype, TimeMap); empty audio if no
+        frame reaches the threshold
+    """
+    samples = audio.reshape(-1)
+    frame = sample_rate * frame_ms // 1000
+    n = len(samples) // frame
+    identity = TimeMap(np.zeros(1), np.zeros(1))
+    if n == 0:
+        return samples, identity
+
+    frames = samples[:n * frame].astype(np.float32).reshape(n, frame)
+    if samples.dtype == np.int16:
+        frames *= 1 / 32768.0
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+    if threshold is None:
+        threshold = max(0.005, 3 * float(np.percentile(rms, 10)))
+    voiced = rms > threshold
+    if not voiced.any():
+        return samples[:0], TimeMap(np.zeros(0), np.zeros(0), removed_s=len(samples) / sample_rate)
+
+    # Keep every frame within pad frames of speech (a dilation via prefix sums)
+    pad = max(0, gap_ms // 2 // frame_ms)
+    counts = np.concatenate([[0], np.cumsum(voiced)])
+    index = np.arange(n)
+    keep = counts[np.minimum(index + pad + 1, n)] > counts[np.maximum(index - pad, 0)]
+
+    edges = np.diff(keep.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    compacted = samples[:n * frame][np.repeat(keep, frame)]
+    if keep[-1]:
+        compacted = np.concatenate([compacted, samples[n * frame:]])  # Partial last frame
+
+    lengths = (ends - starts) * frame
+    compact_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) / sample_rate
+    time_map = TimeMap(compact_starts, starts * frame / sample_rate,
+                       removed_s=(len(samples) - len(compacted)) / sample_rate)
+    return compacted, time_map
+
+
+if __name__ == "__main__":
+    import time
+
+    sr = 16000
+    block = sr // 50  # 20 ms
+    rng = np.random.default_rng(0)
+    speech = (rng.standard_normal(sr) * 3000).astype(np.int16)
+    stream = np.concatenate([np.zeros(sr // 2, np.int16), speech, np.zeros(sr, np.int16)] * 3)
+
+    vad = VADSegmenter()
+    start = time.perf_counter()
+    for i in range(0, len(stream), block):
+        audio = vad.push(stream[i:i + block].reshape(-1, 1))
+        if audio is not None:
+            print(f"Utterance: {len(audio) / sr:.2f}s ending at {(i + block) / sr:.2f}s")
+    elapsed = time.perf_counter() - start
+    print(f"{len(stream) // block} blocks in {elapsed * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    compacted, time_map = compact_speech(stream)
+    elapsed = time.perf_counter() - start
+    print(f"Compacted {len(stream) / sr:.1f}s to {len(compacted) / sr:.1f}s in {elapsed * 1000:.1f} ms; "
+          f"1.0s in compacted audio is {time_map.to_original(1.0):.2f}s in the original")
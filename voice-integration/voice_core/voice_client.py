@@ -0,0 +1,166 @@
+"""
+Voice Client - Thin client for the Voice V10 server.
+
+Streams the microphone to voice_server.py and plays the speech it sends
+back. Needs only sounddevice and numpy - no Whisper model or Claude CLI on
+this machine. Barge-in is detected here, where the playback reference is
+known, and reported to the server.
+
+Usage:
+    VOICE_SERVER_TOKEN=<secret> python voice_client.py --host 192.168.1.20 --name alice
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Optional
+
+import numpy as np
+
+try:
+    import sounddevice as sd
+except ImportError:
+    print("Please install sounddevice: pip install sounddevice")
+    sys.exit(1)
+
+from audio_io import AudioOutput
+from barge_in import BargeInDetector, BargeInConfig
+from voice_protocol import HELLO, AUDIO, CONTROL, EVENT, SPEECH, DEFAULT_PORT, read_frame, write_frame, write_json
+
+
+class VoiceClient:
+    """
+    Connects the local microphone and speakers to a voice server.
+
+    Usage:
+        client = VoiceClient("127.0.0.1", name="alice")
+        asyncio.run(client.run())
+    """
+
+    def __init__(self, host: str, port: int = DEFAULT_PORT, name: str = "client",
+                 working_directory: Optional[str] = None, block_ms: int = 20, token: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.name = name
+        self.token = token
+        self.working_directory = working_directory
+        self.block_ms = block_ms
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._output: Optional[AudioOutput] = None
+        self._barge_in: Optional[BargeInDetector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._speech_rate = 24000
+        self._clip_done = None           # Playback event of the latest clip
+
+    async def run(self) -> None:
+        reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        hello = {"name": self.name}
+        if self.token:
+            hello["token"] = self.token
+        if self.working_directory:
+            hello["working_directory"] = self.working_directory
+        write_json(self._writer, HELLO, hello)
+
+        kind, payload = await read_frame(reader)
+        ready = json.loads(payload)
+        if kind != EVENT or ready.get("type") != "ready":
+            print(f"Refused: {ready.get('message', ready)}")
+            return
+        print(f"Connected as {ready['session']} ({ready['working_directory']})")
+
+        sample_rate = ready["sample_rate"]
+        self._barge_in = BargeInDetector(BargeInConfig(sample_rate=sample_rate, frame_ms=self.block_ms),
+                                         on_barge_in=self._on_barge_in)
+        self._output = AudioOutput(sample_rate=ready["tts_sample_rate"], block_ms=self.block_ms,
+                                   on_block=self._barge_in.push_reference)
+        self._output.start()
+
+        self._loop = asyncio.get_running_loop()
+
+        def audio_callback(indata, frames, time_info, status):
+            self._barge_in.process(indata)
+            self._loop.call_soon_threadsafe(write_frame, self._writer, AUDIO, indata.tobytes())
+
+        stream = sd.InputStream(
+            samplerate=sample_rate,
+            channels=1,
+            dtype='int16',
+            blocksize=int(sample_rate * self.block_ms / 1000),
+            callback=audio_callback,
+        )
+        stream.start()
+        print("[Listening...] Say 'goodbye' to disconnect.")
+        try:
+            await self._receive(reader)
+        finally:
+            stream.stop()
+            stream.close()
+            self._output.close()
+            if not self._writer.is_closing():
+                write_json(self._writer, CONTROL, {"type": "bye"})
+                self._writer.close()
+
+    async def _receive(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            try:
+                kind, payload = await read_frame(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                print("\nDisconnected.")
+                return
+
+            if kind == SPEECH:
+                self._clip_done = self._output.play(np.frombuffer(payload, dtype=np.int16), self._speech_rate)
+                self._barge_in.arm()
+                asyncio.create_task(self._disarm_when_done(self._clip_done))
+                continue
+            if kind != EVENT:
+                continue
+
+            event = json.loads(payload)
+            kind = event.get("type")
+            if kind == "speech":
+                self._speech_rate = event["sample_rate"]
+            elif kind == "speech_stop":
+                self._output.stop()
+            elif kind == "transcript":
+                print(f'\nYou: "{event["text"]}"')
+            elif kind == "response":
+                print(f"Claude: {event['text']}")
+            elif kind in ("busy", "queued", "error"):
+                print(f"[{event.get('message', kind)}]")
+
+    async def _disarm_when_done(self, done) -> None:
+        while not done.is_set():
+            await asyncio.sleep(0.02)
+        if done is self._clip_done:  # A newer clip keeps it armed
+            self._barge_in.disarm()
+
+    def _on_barge_in(self) -> None:
+        """Barge-in detector callback (audio thread): silence locally, tell the server."""
+        self._output.stop()
+        self._loop.call_soon_threadsafe(write_json, self._writer, CONTROL, {"type": "barge_in"})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Voice V10 thin client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--name", default="client")
+    parser.add_argument("--cwd", help="Working directory on the server (under its workspace root)")
+    parser.add_argument("--token", default=os.environ.get("VOICE_SERVER_TOKEN"),
+                        help="The server's shared secret (default: $VOICE_SERVER_TOKEN)")
+    args = parser.parse_args()
+
+    client = VoiceClient(args.host, args.port, name=args.name, working_directory=args.cwd, token=args.token)
+    try:
+        asyncio.run(client.run())
+    except KeyboardInterrupt:
+        print("\nBye.")
+    except ConnectionRefusedError:
+        print(f"No voice server at {args.host}:{args.port}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Voice Protocol - Framing for the Voice V10 server and its clients.
+
+Frames are <1-byte kind><4-byte big-endian length><payload> over a local
+TCP socket.
+
+    Client -> server:
+        H  hello    JSON {"name", "token"?, "working_directory"?}
+        A  audio    int16 mono PCM at 16 kHz, any block size
+        C  control  JSON {"type": "cancel" | "reset" | "barge_in" | "bye"}
+
+    Server -> client:
+        E  event    JSON {"type": "ready" | "state" | "transcript" | "response" |
+                          "speech" | "speech_stop" | "queued" | "busy" | "error", ...}
+        S  speech   int16 mono PCM at the preceding "speech" event's sample_rate
+"""
+
+import asyncio
+import json
+import struct
+
+HELLO = b"H"
+AUDIO = b"A"
+CONTROL = b"C"
+EVENT = b"E"
+SPEECH = b"S"
+
+DEFAULT_PORT = 8765
+MAX_FRAME_BYTES = 8 * 1024 * 1024   # A long synthesised answer at 24 kHz is well under this
+
+_HEADER = struct.Struct(">cI")
+
+
+async def read_frame(reader: asyncio.StreamReader, max_bytes: int = MAX_FRAME_BYTES) -> tuple[bytes, bytes]:
+    """
+    Read one frame.
+
+    Returns:
+        (kind, payload)
+
+    Raises:
+        asyncio.IncompleteReadError: Connection closed
+        ValueError: Frame larger than max_bytes
+    """
+    kind, length = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if length > max_bytes:
+        raise ValueError(f"Frame too large: {length} bytes")
+    return kind, await reader.readexactly(length)
+
+
+def write_frame(writer: asyncio.StreamWriter, kind: bytes, payload: bytes) -> None:
+    """Buffer one frame (await writer.drain() for flow control)."""
+    writer.write(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def write_json(writer: asyncio.StreamWriter, kind: bytes, message: dict) -> None:
+    write_frame(writer, kind, json.dumps(message).encode("utf-8"))
@@ -0,0 +1,388 @@
+"""
+Voice Server - Multi-client Voice V10 for a shared box.
+
+Clients stream microphone audio over a local socket (see voice_protocol)
+and get speech back. The server loads one resident STT model and shares it
+through a TranscriptionScheduler; each client gets its own VoiceV10
+pipeline and Claude CLI session, so memory grows per session rather than
+per model. Admission limits cap sessions, concurrent CLI runs, audio ingest
+rate and utterance length, and the shared model serves clients round-robin.
+
+Usage:
+    python voice_server.py --port 8765 --max-sessions 8
+    VOICE_SERVER_TOKEN=<secret> python voice_server.py --host 0.0.0.0        # Serve the LAN
+    VOICE_SERVER_TOKEN=<secret> python voice_client.py --host <server> --name alice
+
+Clients must present the shared token in their hello; without a token the
+server only binds a loopback address.
+"""
+
+import argparse
+import asyncio
+import hmac
+import ipaddress
+import itertools
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+import numpy as np
+
+import voice_v10
+from offline_tts import OfflineTTSWorker, OfflineTTSConfig
+from stt_backend import SAMPLE_RATE, TranscriptionResult, create_stt_backend
+from stt_scheduler import TranscriptionScheduler, SchedulerConfig
+from tts_cache import TTSCache, TTSCacheConfig
+from voice_protocol import (
+    HELLO, AUDIO, CONTROL, EVENT, SPEECH, DEFAULT_PORT,
+    read_frame, write_frame, write_json,
+)
+from voice_v10 import VoiceV10, VoiceConfig
+
+
+@dataclass
+class ServerConfig:
+    """Configuration for the voice server."""
+    host: str = "127.0.0.1"
+    port: int = DEFAULT_PORT
+    max_sessions: int = 8              # Concurrent clients; more are refused
+    max_concurrent_cli: int = 2        # Claude CLI runs across all clients (FIFO between clients)
+    max_audio_rate: float = 1.5        # Audio ingest cap per client (x real time)
+    audio_burst_s: float = 5.0         # Ingest allowance above the cap (reconnect catch-up)
+    max_utterance_s: float = 30.0      # Longer utterances are truncated before transcription
+    max_stt_waiting: int = 16          # Queued transcriptions across clients before rejecting
+    stt_max_batch: int = 4             # Utterances from different clients decoded together
+    stt_max_wait_ms: float = 30.0      # Batching window
+    hello_timeout_s: float = 10.0
+    token: Optional[str] = None        # Shared secret clients send in their hello; required off loopback
+    workspace_root: Optional[str] = None  # Clients may choose a working directory under this
+    voice: VoiceConfig = field(default_factory=VoiceConfig)  # Template for client sessions
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # A hostname or "" (every interface)
+
+
+class ClientSession(VoiceV10):
+    """
+    VoiceV10 pipeline for one remote client.
+
+    Audio arrives from the client's socket instead of a microphone and
+    synthesised speech is sent back instead of played. STT, the TTS engine
+    and the TTS cache are the server's shared instances.
+    """
+
+    def __init__(self, server: "VoiceServer", name: str, writer: asyncio.StreamWriter, config: VoiceConfig):
+        self._server = server
+        self.name = name
+        self._writer = writer
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        super().__init__(config, stt=server.stt.client(name, on_rejected=self._on_stt_rejected))
+        self._tts_cache = server.tts_cache
+
+        # Audio ingest accounting (rate limit)
+        self._connected_at = time.monotonic()
+        self._received_samples = 0
+        self.dropped_samples = 0
+
+        self.on_state_change = lambda state: self.send_event({"type": "state", "state": state.name.lower()})
+        self.on_transcription = lambda text: self.send_event({"type": "transcript", "text": text})
+        self.on_response = lambda text: self.send_event({"type": "response", "text": text})
+
+    def send_event(self, event: dict) -> None:
+        if not self._writer.is_closing():
+            write_json(self._writer, EVENT, event)
+
+    def feed_audio(self, pcm: bytes) -> None:
+        """Queue client audio for the capture stage, enforcing the ingest rate cap."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        config = self._server.config
+        allowance = ((time.monotonic() - self._connected_at) * config.max_audio_rate
+                     + config.audio_burst_s) * self.config.sample_rate
+        if self._received_samples + len(samples) > allowance:
+            if not self.dropped_samples:
+                self.send_event({"type": "error", "message": "Audio arriving faster than real time - dropping"})
+            self.dropped_samples += len(samples)
+            return
+        self._received_samples += len(samples)
+        self._audio_queue.put_nowait(samples.reshape(-1, 1))
+
+    def control(self, message: dict) -> None:
+        """Handle a control message from the client."""
+        kind = message.get("type")
+        if kind == "cancel":
+            self._intent_cancel("")
+        elif kind == "reset":
+            self._intent_reset("")
+        elif kind == "barge_in":
+            # The client detected the user talking over our speech (echo removed there)
+            self._barge_in_detected = True
+            self._tts_cancel.set()
+        elif kind == "bye":
+            self.stop()
+
+    def _on_stt_rejected(self) -> None:
+        # Called from the transcription thread
+        if self._loop:
+            self._loop.call_soon_threadsafe(
+                self.send_event, {"type": "busy", "message": "Server busy - please repeat that"})
+
+    def _init_tts(self) -> None:
+        self._tts_engine = self._server.tts_engine
+        self._render_audio = True  # Speech is always sent to the client as PCM
+
+    def _open_audio(self) -> None:
+        self._loop = asyncio.get_running_loop()
+
+    def _close_audio(self) -> None:
+        pass
+
+    async def _render(self, text: str) -> tuple[np.ndarray, int]:
+        if self._server.offline_tts:
+            return await asyncio.wrap_future(self._server.offline_tts.render(text))
+        return await super()._render(text)
+
+    async def _run_stt(self, audio: np.ndarray) -> TranscriptionResult:
+        # Await the shared scheduler directly rather than parking a thread on it
+        return await asyncio.wrap_future(self._stt.submit(audio, self.config.whisper_language))
+
+    async def _execute_and_speak(self, prompt: str, turn: int, trace) -> None:
+        slots = self._server.cli_slots
+        if slots.locked():
+            self.send_event({"type": "queued", "message": "Waiting for a free CLI slot"})
+        async with slots:
+            if turn <= self._speech_floor:
+                return  # Cancelled while waiting
+            await super()._execute_and_speak(prompt, turn, trace)
+
+    async def _play_pcm(self, audio: np.ndarray, sample_rate: int, on_start=None) -> None:
+        """Send a clip to the client, then wait out its duration so turns keep their pacing."""
+        self.send_event({"type": "speech", "sample_rate": sample_rate, "samples": len(audio)})
+        write_frame(self._writer, SPEECH, np.asarray(audio, dtype=np.int16).tobytes())
+        await self._writer.drain()
+        if on_start:
+            on_start(time.monotonic())  # Sent; the client's playback isn't observable here
+
+        end = time.monotonic() + len(audio) / sample_rate
+        while time.monotonic() < end:
+            if self._tts_cancel.is_set():
+                self.send_event({"type": "speech_stop"})
+                break
+            await asyncio.sleep(0.02)
+
+
+class VoiceServer:
+    """
+    Accepts voice clients and runs a ClientSession per connection.
+
+    Usage:
+        server = VoiceServer(ServerConfig(port=8765))
+        asyncio.run(server.serve())
+    """
+
+    def __init__(self, config: Optional[ServerConfig] = None):
+        self.config = config or ServerConfig()
+        voice = self.config.voice
+        if not self.config.token and not _is_loopback(self.config.host):
+            raise ValueError(f"Refusing to serve {self.config.host or 'every interface'} without a token "
+                             f"(set --token or VOICE_SERVER_TOKEN)")
+
+        # One resident STT model for every client
+        print(f"Loading Whisper model '{voice.stt_config().model}' ({voice.stt_backend})...")
+        backend = create_stt_backend(voice.stt_config())
+        self.stt = TranscriptionScheduler(backend, SchedulerConfig(
+            max_audio_s=self.config.max_utterance_s,
+            max_waiting=self.config.max_stt_waiting,
+            max_batch=self.config.stt_max_batch,
+            max_wait_ms=self.config.stt_max_wait_ms,
+        ))
+        print(f"Whisper model loaded ({backend.name}).")
+
+        # Shared TTS: edge-tts is stateless; pyttsx3 gets one worker rendering for everyone
+        self.tts_engine = voice_v10.TTS_ENGINE if voice.tts_engine == "auto" else voice.tts_engine
+        self.offline_tts: Optional[OfflineTTSWorker] = None
+        if self.tts_engine == "edge" and voice_v10.edge_tts is None:
+            raise ImportError("Please install edge-tts: pip install edge-tts")
+        if self.tts_engine == "pyttsx3":
+            self.offline_tts = OfflineTTSWorker(OfflineTTSConfig(
+                rate=voice.offline_rate,
+                voice=voice.offline_voice,
+            ))
+
+        self.tts_cache: Optional[TTSCache] = None
+        if voice.tts_cache:
+            self.tts_cache = TTSCache(TTSCacheConfig(
+                cache_dir=voice.tts_cache_dir,
+                disk_limit_mb=voice.tts_cache_mb,
+            ))
+
+        self.cli_slots = asyncio.Semaphore(self.config.max_concurrent_cli)
+        self.sessions: dict[str, ClientSession] = {}
+        self._ids = itertools.count(1)
+        self.refused = 0
+
+    async def serve(self) -> None:
+        """Serve clients until cancelled."""
+        self.stt.start()
+        if self.offline_tts:
+            self.offline_tts.start()
+
+        server = await asyncio.start_server(self._handle_client, self.config.host, self.config.port)
+        print(f"Voice server listening on {self.config.host}:{self.config.port} "
+              f"(max {self.config.max_sessions} sessions, {self.config.max_concurrent_cli} CLI runs)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for session in list(self.sessions.values()):
+                session.stop()
+            self.stt.close()
+            if self.offline_tts:
+                self.offline_tts.close()
+            print(f"\nSTT: {self.stt.stats.summary()}")
+            if self.tts_cache:
+                print(f"TTS cache: {self.tts_cache.stats.summary()}")
+            print(f"Refused connections: {self.refused}")
+
+    def _working_directory(self, requested: Optional[str]) -> str:
+        """Resolve a client's working directory request against workspace_root."""
+        if not requested:
+            return self.config.voice.working_directory
+        root = self.config.workspace_root
+        if root is None:
+            raise ValueError("This server doesn't allow choosing a working directory")
+        root = os.path.realpath(root)
+        path = os.path.realpath(os.path.join(root, requested))
+        if os.path.commonpath([root, path]) != root or not os.path.isdir(path):
+            raise ValueError(f"Working directory must be a directory under {root}")
+        return path
+
+    def _authorized(self, hello: dict) -> bool:
+        """Check the hello's token against the server's in constant time."""
+        if not self.config.token:
+            return True  # Loopback only (enforced at startup)
+        token = hello.get("token")
+        return isinstance(token, str) and hmac.compare_digest(token.encode(), self.config.token.encode())
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            kind, payload = await asyncio.wait_for(read_frame(reader), self.config.hello_timeout_s)
+            if kind != HELLO:
+                raise ValueError("Expected hello")
+            hello = json.loads(payload)
+            if not self._authorized(hello):
+                raise ValueError("Invalid token")
+            if len(self.sessions) >= self.config.max_sessions:
+                raise ValueError(f"Server full ({self.config.max_sessions} sessions)")
+            working_directory = self._working_directory(hello.get("working_directory"))
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except ValueError as e:  # Includes malformed JSON
+            self.refused += 1
+            write_json(writer, EVENT, {"type": "error", "message": str(e)})
+            await writer.drain()
+            writer.close()
+            return
+
+        name = f"{hello.get('name') or 'client'}-{next(self._ids)}"
+        # No session history: one shared store would let "resume" attach a client to another's CLI session
+        config = replace(self.config.voice, working_directory=working_directory, tts_cache=False, metrics_port=0,
+                         transcript_path=None, resume_session=False)
+        session = ClientSession(self, name, writer, config)
+        self.sessions[name] = session
+        print(f"\n[{name} connected from {writer.get_extra_info('peername')} - {len(self.sessions)} active]")
+        session.send_event({
+            "type": "ready",
+            "session": name,
+            "working_directory": working_directory,
+            "sample_rate": SAMPLE_RATE,
+            "tts_sample_rate": config.tts_sample_rate,
+        })
+
+        run = asyncio.create_task(session.run())
+        receive = asyncio.create_task(self._receive(session, reader))
+        try:
+            await asyncio.wait({run, receive}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            session.stop()
+            receive.cancel()
+            await asyncio.gather(run, receive, return_exceptions=True)
+            self.sessions.pop(name, None)
+            self.stt.remove_client(name)
+            writer.close()
+            print(f"\n[{name} disconnected - {len(self.sessions)} active]")
+
+    async def _receive(self, session: ClientSession, reader: asyncio.StreamReader) -> None:
+        """Dispatch client frames until it disconnects or says bye."""
+        while True:
+            try:
+                kind, payload = await read_frame(reader)
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                return
+            if kind == AUDIO:
+                session.feed_audio(payload)
+            elif kind == CONTROL:
+                try:
+                    message = json.loads(payload)
+                except ValueError:
+                    continue
+                session.control(message)
+                if message.get("type") == "bye":
+                    return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Voice V10 multi-client server")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Bind address (a non-loopback address such as 0.0.0.0 needs --token)")
+    parser.add_argument("--token", default=os.environ.get("VOICE_SERVER_TOKEN"),
+                        help="Shared secret clients must send (default: $VOICE_SERVER_TOKEN)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=8)
+    parser.add_argument("--max-cli", type=int, default=2, help="Concurrent Claude CLI runs")
+    parser.add_argument("--model", default="auto", help="Whisper model (auto = tuned for this machine, else base)")
+    parser.add_argument("--backend", default="auto", help="STT backend: whisper, faster-whisper, auto")
+    parser.add_argument("--threads", type=int, default=0, help="STT intra-op threads (0 = tuned, else engine default)")
+    parser.add_argument("--batch", type=int, default=4, help="Max utterances per STT batch (1 = off)")
+    parser.add_argument("--batch-wait-ms", type=float, default=30.0, help="STT batching window")
+    parser.add_argument("--claude-path", default=VoiceConfig.claude_path)
+    parser.add_argument("--workspace-root", help="Let clients choose a working directory under this")
+    args = parser.parse_args()
+
+    server = VoiceServer(ServerConfig(
+        host=args.host,
+        token=args.token,
+        port=args.port,
+        max_sessions=args.max_sessions,
+        max_concurrent_cli=args.max_cli,
+        workspace_root=args.workspace_root,
+        stt_max_batch=args.batch,
+        stt_max_wait_ms=args.batch_wait_ms,
+        voice=VoiceConfig(
+            whisper_model=args.model,
+            stt_backend=args.backend,
+            stt_threads=args.threads,
+            claude_path=args.claude_path,
+        ),
+    ))
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\nVoice server stopped.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (ImportError, ValueError) as e:
+        print(e)
+        sys.exit(1)
@@ -6,18 +6,18 @@ Combines VAD, Whisper STT, CLI Bridge, and TTS for hands-free coding.
 
 Architecture:
     User speaks → VAD → Whisper → CLI Bridge → Parser → Summarizer → TTS → Speakers
-                          ↑                                              ↓
-                    Barge-in detector ←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←
+         ↓                                                               ↓
+    Barge-in detector (on the capture stream) ←←←←←←←← playback reference
 """
 
 import asyncio
-import queue
 import threading
 import time
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 
 # Audio processing
@@ -25,31 +25,35 @@ import numpy as np
 
 try:
     import sounddevice as sd
-except ImportError:
-    print("Please install sounddevice: pip install sounddevice")
-    sys.exit(1)
+except (ImportError, OSError):  # OSError: PortAudio library missing (headless hosts)
+    sd = None
 
-try:
-    import whisper
-except ImportError:
-    print("Please install openai-whisper: pip install openai-whisper")
-    sys.exit(1)
-
-# TTS options - try edge-tts first (free), fall back to pyttsx3
+# TTS options - try edge-tts first (free), fall back to pyttsx3 (offline)
 try:
     import edge_tts
     TTS_ENGINE = "edge"
 except ImportError:
-    try:
-        import pyttsx3
-        TTS_ENGINE = "pyttsx3"
-    except ImportError:
-        print("Please install a TTS engine: pip install edge-tts  OR  pip install pyttsx3")
-        sys.exit(1)
+    edge_tts = None
+    TTS_ENGINE = "pyttsx3"
 
 # Local modules
 from cli_bridge import ClaudeCLIBridge, CLIConfig
-from stream_parser import StreamParser, MessageType
+from stt_backend import STTBackend, STTConfig, TranscriptionResult, CascadeBackend, create_stt_backend
+from intent_matcher import IntentMatcher, BUILTIN_INTENTS, register_local_actions
+from pipeline import PipelineSupervisor, StageMetrics, put_bounded
+from barge_in import BargeInDetector, BargeInConfig
+from audio_io import AudioOutput, decode_audio
+from tts_cache import TTSCache, TTSCacheConfig, DEFAULT_CACHE_DIR, PREWARM_PHRASES
+from offline_tts import OfflineTTSWorker, OfflineTTSConfig, PYTTSX3_AVAILABLE
+from tracing import Tracer, TracerConfig, TurnTrace
+from vad import VADSegmenter, VADConfig, TimeMap, compact_speech
+from capture_process import CaptureProcess, CaptureConfig
+from stt_autotune import resolve_model
+from wake_gate import WakeGate, WakeGateConfig, IdleMeter, KeywordSpotter
+from stream_parser import StreamParser, MessageType, ParsedMessage
+from event_bus import EventBus, DropPolicy
+from transcript_store import TranscriptStore, DEFAULT_TRANSCRIPT_PATH, TRANSCRIPT, SPEECH, format_entry
+from usage_metrics import UsageLog, UsageConfig, TurnRecord, DEFAULT_USAGE_PATH
 from tts_summarizer import TTSSummarizer, TTSConfig
 
 
@@ -69,19 +73,54 @@ class VoiceConfig:
     sample_rate: int = 16000
     channels: int = 1
     dtype: str = 'int16'
+    capture_block_ms: int = 20       # Capture callback block: barge-in reacts within one frame
+                                     # (the wake gate batches blocks itself while idle)
+    capture_process: bool = False    # Capture in a child process via shared memory (no GIL
+                                     # contention with inference, so no overflows under load)
+    capture_buffer_s: float = 10.0   # Shared ring size for capture_process
 
     # VAD settings
     vad_threshold: float = 0.02      # RMS threshold for speech detection
     vad_silence_ms: int = 800        # Silence duration to end utterance
     vad_min_speech_ms: int = 300     # Minimum speech duration
+    stt_compact: bool = True         # Trim silence and shorten pauses before transcribing
+    stt_max_gap_ms: int = 300        # Pauses longer than this are shortened to it
+
+    # Idle wake gate: cheap checks in the capture callback before blocks reach VAD and STT
+    wake_gate: bool = True           # Energy + spectral gate while nobody is talking
+    wake_snr: float = 3.0            # Block RMS over the adaptive noise floor to be a candidate
+    wake_min_voice_ratio: float = 0.35  # Share of energy in the voice band (rejects hum)
+    wake_max_flatness: float = 0.45  # Spectral flatness limit (rejects hiss, fans, clicks)
+    wake_onset_ms: int = 80          # Speech-like audio needed to open the gate
+    wake_poll_ms: int = 100          # capture_process: ring poll interval while the gate is closed
+    wake_phrase: Optional[str] = None  # e.g. "hey claude": required before commands
+    wake_model: str = "tiny"         # Whisper model that listens for the wake phrase
+    wake_timeout_s: float = 10.0     # Follow-ups within this long of a turn need no wake phrase
 
     # Whisper settings
-    whisper_model: str = "base"      # tiny, base, small, medium, large
+    whisper_model: str = "auto"      # tiny, base, small, medium, large; auto = tuned (stt_autotune), else base
     whisper_language: str = "en"
+    stt_backend: str = "whisper"     # whisper, faster-whisper (int8), auto
+    stt_threads: int = 0             # Inference threads (0 = tuned, else engine default)
+    stt_compute_type: str = "int8"   # faster-whisper quantisation
+    stt_fast_path_s: float = 10.0    # Greedy single-pass decode for clips up to this long
+    stt_prompt: Optional[str] = None  # Project vocabulary, e.g. "GPNet, Preventli, Drizzle, vitest"
+    stt_cascade_model: Optional[str] = None  # e.g. "tiny": try first, escalate to whisper_model
+    stt_cascade_logprob: float = -0.5        # Min avg log-probability to accept fast tier
+    stt_cascade_no_speech: float = 0.5       # Max no-speech probability to accept fast tier
 
     # TTS settings
+    tts_engine: str = "auto"            # auto, edge, pyttsx3 (offline)
     tts_voice: str = "en-US-GuyNeural"  # Edge TTS voice
     tts_rate: str = "+10%"              # Speech rate
+    tts_sample_rate: int = 24000        # Output stream rate (edge-tts voices are 24 kHz)
+    tts_cache: bool = True              # Reuse decoded audio for repeated phrases
+    tts_cache_dir: Optional[str] = DEFAULT_CACHE_DIR  # None = memory only
+    tts_cache_mb: float = 50.0          # Disk tier size bound
+    offline_voice: Optional[str] = None  # pyttsx3 voice id (None = system default)
+    offline_rate: int = 0               # pyttsx3 words per minute (0 = default)
+    offline_render: bool = False        # Render pyttsx3 speech to memory and play it on the
+                                        # output stream (echo-cancelled barge-in, caching)
 
     # CLI settings
     claude_path: str = r"C:\Users\Paul\AppData\Roaming\npm\claude.cmd"
@@ -92,6 +131,76 @@ class VoiceConfig:
     announce_tool_use: bool = True
     summarize_tool_result: bool = True
     enable_barge_in: bool = True
+    barge_in_threshold: float = 0.03  # Residual RMS after removing playback echo
+    barge_in_frames: int = 2          # Consecutive speech frames to trigger
+    local_intents: bool = True       # Answer built-in/simple commands without the CLI
+    intent_threshold: float = 0.9    # Fuzzy match cutoff for local commands
+
+    # Pipeline
+    full_duplex: bool = True          # Keep listening (and queue commands) while a turn runs
+    max_pending_utterances: int = 2   # Captured utterances awaiting transcription
+    max_queued_commands: int = 3      # Transcribed commands awaiting execution
+    max_pending_speech: int = 8       # Phrases awaiting TTS
+    tts_prefetch: int = 2             # Phrases synthesised ahead of playback
+
+    # Tracing
+    trace_path: Optional[str] = None  # Append per-turn latency traces (JSONL)
+    metrics_port: int = 0             # Serve latency/pipeline metrics on 127.0.0.1 (0 = off)
+
+    # Usage accounting (tokens, cost and duration of each CLI run)
+    usage_path: Optional[str] = DEFAULT_USAGE_PATH  # Append-only JSONL (None = memory only)
+    usage_slow_turn_s: float = 60.0   # Alert on CLI runs slower than this (0 = off)
+    usage_expensive_usd: float = 0.50  # Alert on CLI runs costing more than this (0 = off)
+
+    # Session history (transcripts, CLI messages, spoken text)
+    transcript_path: Optional[str] = DEFAULT_TRANSCRIPT_PATH  # SQLite store (None = off)
+    resume_session: bool = False      # Continue this directory's last session on start
+
+    # (backend, (model, threads)) from the tuning profile, read once per backend
+    _tuned: Optional[tuple[str, tuple[str, int]]] = field(default=None, init=False, repr=False, compare=False)
+
+    def stt_config(self) -> STTConfig:
+        """STT backend settings derived from this config."""
+        model, threads = self.whisper_model, self.stt_threads
+        if model == "auto":
+            if self._tuned is None or self._tuned[0] != self.stt_backend:
+                self._tuned = (self.stt_backend, resolve_model("command", "base", self.stt_backend))
+            model, tuned_threads = self._tuned[1]
+            threads = threads or tuned_threads
+        return STTConfig(
+            backend=self.stt_backend,
+            model=model,
+            language=self.whisper_language,
+            threads=threads,
+            compute_type=self.stt_compute_type,
+            short_utterance_s=self.stt_fast_path_s,
+            initial_prompt=self.stt_prompt,
+            cascade_model=self.stt_cascade_model,
+            cascade_logprob_threshold=self.stt_cascade_logprob,
+            cascade_no_speech_threshold=self.stt_cascade_no_speech,
+        )
+
+
+@dataclass
+class SpeechClip:
+    """A phrase synthesised ahead of playback."""
+    text: str
+    turn: Optional[int] = None       # None for local intent replies
+    audio: Optional[np.ndarray] = None  # Decoded int16 PCM (None: engine speaks text directly)
+    sample_rate: int = 0
+    synth_ms: float = 0.0
+    cached: bool = False
+
+
+@dataclass
+class CLIEvent:
+    """A CLI stream message, parsed once and published on the event bus."""
+    parsed: ParsedMessage
+    turn: int
+    trace: TurnTrace
+    session_id: str
+    spawned_at: Optional[float]      # time.monotonic() the CLI run started
+    received_at: float               # time.monotonic() the line was read
 
 
 class VoiceV10:
@@ -102,19 +211,72 @@ class VoiceV10:
     executes via Claude CLI, and speaks results.
     """
 
-    def __init__(self, config: Optional[VoiceConfig] = None):
+    def __init__(self, config: Optional[VoiceConfig] = None, stt: Optional[STTBackend] = None):
+        """
+        Args:
+            config: Voice settings
+            stt: Already-loaded STT backend to share (e.g. a voice server's
+                resident model); None = load one from config
+        """
         self.config = config or VoiceConfig()
         self.state = VoiceState.IDLE
         self._running = False
 
         # Audio components
-        self._audio_queue: queue.Queue = queue.Queue()
-        self._stream: Optional[sd.InputStream] = None
-
-        # Whisper model
-        print(f"Loading Whisper model '{self.config.whisper_model}'...")
-        self._whisper = whisper.load_model(self.config.whisper_model)
-        print("Whisper model loaded.")
+        self._audio_queue: asyncio.Queue = asyncio.Queue()  # Microphone blocks
+        self._stream = None                # sounddevice.InputStream
+        self._capture: Optional[CaptureProcess] = None  # capture_process mode
+        self._capture_poll: Optional[asyncio.Task] = None
+        self._capturing = False
+        self._vad = VADSegmenter(VADConfig(
+            sample_rate=self.config.sample_rate,
+            threshold=self.config.vad_threshold,
+            silence_ms=self.config.vad_silence_ms,
+            min_speech_ms=self.config.vad_min_speech_ms,
+        ))
+        self._wake_gate: Optional[WakeGate] = None
+        if self.config.wake_gate:
+            self._wake_gate = WakeGate(WakeGateConfig(
+                sample_rate=self.config.sample_rate,
+                threshold=self.config.vad_threshold,
+                snr=self.config.wake_snr,
+                min_voice_ratio=self.config.wake_min_voice_ratio,
+                max_flatness=self.config.wake_max_flatness,
+                onset_ms=self.config.wake_onset_ms,
+                hold_ms=self.config.vad_silence_ms + 200,  # Outlast the VAD's endpoint silence
+            ))
+        self._idle_meter = IdleMeter(self._wake_gate.stats if self._wake_gate else None)  # Idle CPU
+
+        # STT backend
+        if stt is not None:
+            self._stt = stt
+        else:
+            models = self.config.stt_config().model
+            if self.config.stt_cascade_model:
+                models = f"{self.config.stt_cascade_model} -> {models}"
+            print(f"Loading Whisper model '{models}' ({self.config.stt_backend})...")
+            try:
+                self._stt = create_stt_backend(self.config.stt_config())
+            except ImportError as e:
+                print(e)
+                sys.exit(1)
+            print(f"Whisper model loaded ({self._stt.name}).")
+
+        # Wake phrase spotting with a small model, ahead of the full transcription
+        self._spotter: Optional[KeywordSpotter] = None
+        self._awake_until = 0.0  # Until then, utterances need no wake phrase
+        if self.config.wake_phrase:
+            print(f"Loading wake phrase model '{self.config.wake_model}'...")
+            self._spotter = KeywordSpotter(self.config.wake_phrase, create_stt_backend(STTConfig(
+                backend=self.config.stt_backend,
+                model=self.config.wake_model,
+                language="en",
+                threads=self.config.stt_config().threads,
+                compute_type=self.config.stt_compute_type,
+            )), sample_rate=self.config.sample_rate)
+
+        # Inference gets its own thread instead of competing on the default executor
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
 
         # CLI Bridge
         self._cli = ClaudeCLIBridge(config=CLIConfig(
@@ -123,6 +285,21 @@ class VoiceV10:
             working_directory=self.config.working_directory,
         ))
 
+        # Local session history; resuming reuses the CLI session id
+        self._transcripts: Optional[TranscriptStore] = None
+        if self.config.transcript_path:
+            self._transcripts = TranscriptStore(self.config.transcript_path)
+            if self.config.resume_session:
+                self._resume_last_session()
+            self._open_transcript_session()
+
+        # Per-turn usage from the CLI's result messages
+        self._usage = UsageLog(UsageConfig(
+            path=self.config.usage_path,
+            slow_turn_s=self.config.usage_slow_turn_s,
+            expensive_turn_usd=self.config.usage_expensive_usd,
+        ), on_alert=self._on_usage_alert)
+
         # Parsers
         self._parser = StreamParser()
         self._summarizer = TTSSummarizer(TTSConfig(
@@ -130,369 +307,942 @@ class VoiceV10:
             summarize_tool_result=self.config.summarize_tool_result,
         ))
 
+        # CLI messages fan out to subscribers; only speech may hold back the stream
+        self.bus = EventBus()
+        self.bus.subscribe("console", self._print_message, maxsize=64)
+        self.bus.subscribe("speech", self._speak_message, maxsize=4, policy=DropPolicy.BLOCK)
+        self.bus.subscribe("usage", self._record_usage, maxsize=16, kinds={MessageType.RESULT.value})
+        if self._transcripts:
+            self.bus.subscribe("transcript", self._log_message, maxsize=256)
+
+        # Local command fast-path
+        self._intents = IntentMatcher(threshold=self.config.intent_threshold)
+        self._register_intents()
+
         # TTS state
         self._tts_playing = False
         self._tts_cancel = threading.Event()
+        self._offline_tts: Optional[OfflineTTSWorker] = None
+        self._init_tts()
+
+        self._tts_cache: Optional[TTSCache] = None
+        if self.config.tts_cache and self._render_audio:
+            self._tts_cache = TTSCache(TTSCacheConfig(
+                cache_dir=self.config.tts_cache_dir,
+                disk_limit_mb=self.config.tts_cache_mb,
+            ))
 
-        # Barge-in detection
+        # Barge-in detection, fed from the capture stream
         self._barge_in_detected = False
+        self._barge_in = BargeInDetector(BargeInConfig(
+            sample_rate=self.config.sample_rate,
+            threshold=self.config.barge_in_threshold,
+            min_frames=self.config.barge_in_frames,
+        ), on_barge_in=self._on_barge_in)
+
+        # Output stream, opened once; each block it plays becomes the barge-in echo reference
+        self._output = AudioOutput(
+            sample_rate=self.config.tts_sample_rate,
+            on_block=self._barge_in.push_reference,
+        )
+
+        # Timings of the most recent transcription (ms per stage)
+        self.last_stt_timings: dict = {}
+        # Maps the last transcription's timestamps back to the captured audio (stt_compact)
+        self.last_time_map: Optional[TimeMap] = None
+
+        # Pipeline: capture -> utterances -> STT -> commands -> execute -> speech -> TTS
+        self._utterance_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.max_pending_utterances)
+        self._command_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.max_queued_commands)
+        self._speech_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.max_pending_speech)
+        self._clip_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.tts_prefetch))
+        self._prefetch: dict[asyncio.Task, Optional[int]] = {}  # Synthesis task -> turn
+        self._pipeline = PipelineSupervisor()
+        self._pipeline.on_change = self._refresh_state
+        self._pipeline.add_stage("capture", self._capture_stage)
+        self._pipeline.add_stage("stt", self._stt_stage, self._utterance_queue)
+        self._pipeline.add_stage("execute", self._execute_stage, self._command_queue)
+        self._pipeline.add_stage("synth", self._synth_stage, self._speech_queue)
+        self._pipeline.add_stage("tts", self._tts_stage, self._clip_queue)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+        # Turn tracking: speech from turns <= _speech_floor is discarded
+        self._turn_id = 0
+        self._speech_floor = 0
+
+        # Latency tracing: one TurnTrace per utterance, carried through the queues
+        self._tracer = Tracer(TracerConfig(
+            trace_path=self.config.trace_path,
+            metrics_port=self.config.metrics_port,
+        ))
+        self._tracer.extra_metrics = self._extra_metrics
+        self._turn_traces: dict[int, TurnTrace] = {}
 
         # Callbacks
         self.on_state_change: Optional[Callable[[VoiceState], None]] = None
         self.on_transcription: Optional[Callable[[str], None]] = None
         self.on_response: Optional[Callable[[str], None]] = None
 
+    def _init_tts(self) -> None:
+        """Select the TTS engine; sets _tts_engine, _offline_tts and _render_audio."""
+        self._tts_engine = TTS_ENGINE if self.config.tts_engine == "auto" else self.config.tts_engine
+        if self._tts_engine == "edge" and edge_tts is None:
+            print("Please install edge-tts: pip install edge-tts")
+            sys.exit(1)
+
+        # Offline engine: one long-lived worker thread owns pyttsx3
+        if self._tts_engine == "pyttsx3":
+            if not PYTTSX3_AVAILABLE:
+                print("Please install a TTS engine: pip install edge-tts  OR  pip install pyttsx3")
+                sys.exit(1)
+            self._offline_tts = OfflineTTSWorker(OfflineTTSConfig(
+                rate=self.config.offline_rate,
+                voice=self.config.offline_voice,
+            ))
+
+        # Speech rendered to PCM plays on the output stream and can be cached
+        self._render_audio = self._tts_engine == "edge" or self.config.offline_render
+
+    def _register_intents(self) -> None:
+        """Register built-in voice commands and local actions."""
+        handlers = {
+            "quit": self._intent_quit,
+            "reset": self._intent_reset,
+            "cancel": self._intent_cancel,
+            "resume": self._intent_resume if self._transcripts else None,
+        }
+        for name, (phrases, exact) in BUILTIN_INTENTS.items():
+            if handlers[name]:
+                self._intents.register(name, phrases, handlers[name], exact=exact)
+        if self.config.local_intents:
+            register_local_actions(self._intents, self.config.working_directory)
+
+    def _intent_quit(self, text: str) -> str:
+        # The STT stage speaks the goodbye directly, then stops the pipeline
+        print("\nGoodbye!")
+        return "Goodbye!"
+
+    def _intent_reset(self, text: str) -> str:
+        self._cancel_turn(clear_queued=True)
+        self._cli.reset_session()
+        self._open_transcript_session()
+        print("[Session reset]")
+        return "Starting a new conversation."
+
+    def _intent_resume(self, text: str) -> str:
+        self._cancel_turn(clear_queued=True)
+        session = self._resume_last_session(exclude=self._cli.session_id)
+        if session is None:
+            return "There's no earlier conversation to resume."
+        return f"Resuming: {session.title}" if session.title else "Resuming the last conversation."
+
+    def _open_transcript_session(self) -> None:
+        if self._transcripts:
+            self._transcripts.open_session(self._cli.session_id, self.config.working_directory,
+                                           self.config.claude_model)
+
+    def _resume_last_session(self, exclude: Optional[str] = None):
+        """Point the CLI at this directory's most recent stored session and show its tail."""
+        session = self._transcripts.last_session(self.config.working_directory, exclude=exclude)
+        if session is None:
+            return None
+        self._cli.session_id = session.id
+        print(f"\n[Resuming session {session.id[:8]} - {session.entries} entries]")
+        for entry in self._transcripts.entries(session.id, kinds=[TRANSCRIPT, SPEECH], limit=6, newest=True):
+            print(f"  {format_entry(entry, width=80)}")
+        return session
+
+    def _intent_cancel(self, text: str) -> None:
+        self._cancel_turn(clear_queued=True)
+        print("[Cancelled]")
+        return None
+
     def _set_state(self, state: VoiceState) -> None:
         """Update state and notify callback."""
         self.state = state
+        self._idle_meter.update(state == VoiceState.IDLE)
         if self.on_state_change:
             self.on_state_change(state)
 
+    def _refresh_state(self) -> None:
+        """Derive the overall state from what the pipeline stages are doing."""
+        stages = self._pipeline.stages
+        if stages["tts"].active:
+            state = VoiceState.SPEAKING
+        elif stages["execute"].active:
+            state = VoiceState.EXECUTING
+        elif stages["stt"].active:
+            state = VoiceState.PROCESSING
+        elif self._capturing:
+            state = VoiceState.LISTENING
+        else:
+            state = VoiceState.IDLE
+
+        # Idle = nothing being processed or waiting downstream of capture
+        busy = any(m.active or m.depth for name, m in stages.items() if name != "capture")
+        if busy:
+            self._idle.clear()
+        else:
+            self._idle.set()
+
+        if state != self.state:
+            self._set_state(state)
+
+    def pipeline_metrics(self) -> dict[str, dict]:
+        """Per-stage occupancy, throughput and queue depth."""
+        return self._pipeline.metrics()
+
+    def _extra_metrics(self) -> dict:
+        metrics = {"pipeline": self.pipeline_metrics()}
+        if self._capture is not None:
+            metrics["capture"] = self._capture.snapshot()
+        if self._wake_gate is not None:
+            metrics["wake_gate"] = self._wake_gate.snapshot()
+        metrics["usage"] = self._usage.snapshot()
+        metrics["bus"] = self.bus.snapshot()
+        return metrics
+
     async def run(self) -> None:
-        """Main run loop for voice interface."""
+        """
+        Main run loop for voice interface.
+
+        Runs capture, STT, execution and TTS as concurrent stages joined by
+        bounded queues, so the user can queue follow-up commands while a
+        turn executes (full_duplex). Turn semantics:
+
+        - "stop"/"cancel" cancels the running turn (CLI and its pending
+          speech) and drops queued commands.
+        - Barge-in during speech cancels the turn being spoken; what the user
+          said is captured and queued as the next command.
+        - "quit" speaks goodbye and stops every stage.
+        """
         self._running = True
         print("\n" + "=" * 50)
         print("Voice V10 - Natural Language Coding Interface")
         print("=" * 50)
         print(f"Working directory: {self.config.working_directory}")
         print(f"Claude model: {self.config.claude_model}")
-        print(f"Whisper model: {self.config.whisper_model}")
+        print(f"Whisper model: {self.config.stt_config().model}")
+        print(f"Full duplex: {'on' if self.config.full_duplex else 'off'}")
         print("\nSay 'quit' or 'goodbye' to exit.")
         print("Say 'new conversation' or 'start over' to reset context.")
         print("=" * 50 + "\n")
 
+        self._tracer.serve()
+        prewarm = asyncio.create_task(self._prewarm_tts())
         try:
-            while self._running:
-                # Wait for speech input
-                self._set_state(VoiceState.IDLE)
-                print("\n[Listening...] ", end="", flush=True)
-
-                audio = await self._capture_speech()
-                if audio is None:
-                    continue
-
-                # Transcribe
-                self._set_state(VoiceState.PROCESSING)
-                print("[Transcribing...] ", end="", flush=True)
-
-                text = await self._transcribe(audio)
-                if not text or not text.strip():
-                    print("(no speech detected)")
-                    continue
-
-                print(f'"{text}"')
-                if self.on_transcription:
-                    self.on_transcription(text)
-
-                # Handle special commands
-                lower_text = text.lower().strip()
-                if lower_text in ("quit", "goodbye", "exit", "bye"):
-                    print("\nGoodbye!")
-                    await self._speak("Goodbye!")
-                    break
-                elif lower_text in ("new conversation", "start over", "reset", "clear"):
-                    self._cli.reset_session()
-                    print("[Session reset]")
-                    await self._speak("Starting a new conversation.")
-                    continue
-                elif lower_text in ("stop", "cancel", "nevermind", "never mind"):
-                    self._cli.cancel()
-                    print("[Cancelled]")
-                    continue
-
-                # Execute via Claude CLI
-                self._set_state(VoiceState.EXECUTING)
-                await self._execute_and_speak(text)
+            self._open_audio()
+            self._idle_meter.update(self.state == VoiceState.IDLE)
+            if self._spotter:
+                print(f'\nSay "{self.config.wake_phrase}" before a command.')
+            print("\n[Listening...] ", end="", flush=True)
+            await self._pipeline.run()
 
         except KeyboardInterrupt:
             print("\n\nInterrupted by user.")
         finally:
             self._running = False
             self._cli.cancel()
+            self._cancel_prefetch()
+            prewarm.cancel()
+            self._close_audio()
+            self._idle_meter.update(False)
+            self.bus.close()
+            if self._transcripts:
+                self._transcripts.close()
+            self._stt_executor.shutdown(wait=False)
+            print(f"\nPipeline:\n{self._pipeline.summary()}")
+            if self._capture is not None:
+                print(f"\nCapture: {self._capture.stats.summary()}")
+            if self._wake_gate is not None and self._wake_gate.stats.blocks:
+                print(f"\nWake gate:\n{self._wake_gate.stats.summary()}")
+            elif self._idle_meter.stats.idle_s:
+                print(f"\nIdle CPU: {self._idle_meter.stats.idle_cpu_percent:.1f}% of a core")
+            if isinstance(self._stt, CascadeBackend):
+                print(f"\nSTT cascade: {self._stt.stats.summary()}")
+            if self._tts_cache:
+                print(f"\nTTS cache: {self._tts_cache.stats.summary()}")
+            if any(s.stats.delivered for s in self.bus.subscriptions.values()):
+                print(f"\nEvent bus:\n{self.bus.summary()}")
+            for session, totals in self._usage.sessions.items():
+                print(f"\nUsage ({session[:8]}): {totals.summary()}")
+            if self._tracer.turns:
+                print(f"\nLatency (ms):\n{self._tracer.summary()}")
+            self._tracer.close()
             print("\nVoice V10 stopped.")
 
-    async def _capture_speech(self) -> Optional[np.ndarray]:
+    def _cancel_turn(self, turn: Optional[int] = None, clear_queued: bool = False) -> None:
         """
-        Capture speech using VAD (Voice Activity Detection).
+        Cancel a turn: stop its CLI run and drop its pending speech.
 
-        Returns audio when speech ends (silence detected after speech).
+        Args:
+            turn: Turn to cancel (default: the most recent turn)
+            clear_queued: Also drop commands waiting to execute
         """
-        # Clear audio queue
+        turn = turn if turn is not None else self._turn_id
+        self._speech_floor = max(self._speech_floor, turn)
+        trace = self._turn_traces.get(turn)
+        if trace:
+            trace.cancelled = True
+            trace.mark("cancel_requested")
+        if turn == self._turn_id:
+            self._cli.cancel()
+        self._tts_cancel.set()
+        self._cancel_prefetch(self._speech_floor)
+
+        if clear_queued:
+            while not self._command_queue.empty():
+                try:
+                    _, trace = self._command_queue.get_nowait()
+                    trace.cancelled = True
+                    self._tracer.finish(trace)
+                    self._pipeline.stages["execute"].dropped += 1
+                except asyncio.QueueEmpty:
+                    break
+
+    # ------------------------------------------------------------------
+    # Capture
+    # ------------------------------------------------------------------
+
+    def _open_audio(self) -> None:
+        """Start the TTS engine, the output stream and microphone capture."""
+        if self._offline_tts:
+            self._offline_tts.start()
+        if self._render_audio:
+            self._output.start()
+        self._start_capture()
+
+    def _close_audio(self) -> None:
+        """Close everything _open_audio() started."""
+        self._output.close()
+        if self._offline_tts:
+            self._offline_tts.close()
+        self._stop_capture()
+
+    def _start_capture(self) -> None:
+        """Open the persistent microphone stream feeding _audio_queue."""
+        if self.config.capture_process:
+            self._capture = CaptureProcess(CaptureConfig(
+                sample_rate=self.config.sample_rate,
+                channels=self.config.channels,
+                block_ms=self.config.capture_block_ms,
+                buffer_s=self.config.capture_buffer_s,
+            ))
+            self._capture.start()
+            self._capture_poll = asyncio.create_task(self._poll_capture())
+            return
+
+        if sd is None:
+            raise RuntimeError("Please install sounddevice: pip install sounddevice")
+        loop = asyncio.get_running_loop()
+
+        def audio_callback(indata, frames, time_info, status):
+            if status:
+                print(f"Audio status: {status}")
+            # Score for barge-in here so cancel fires within a block, not a poll interval
+            self._barge_in.process(indata)
+            for block in self._gate_block(indata):
+                loop.call_soon_threadsafe(self._audio_queue.put_nowait, block.copy())
+
+        self._stream = sd.InputStream(
+            samplerate=self.config.sample_rate,
+            channels=self.config.channels,
+            dtype=self.config.dtype,
+            callback=audio_callback,
+            blocksize=int(self.config.sample_rate * self.config.capture_block_ms / 1000),
+        )
+        self._stream.start()
+
+    async def _poll_capture(self) -> None:
+        """Move blocks from the capture process's ring onto _audio_queue."""
+        interval = self.config.capture_block_ms / 2000
+        while self._running:
+            blocks = self._capture.read()
+            for block in blocks:
+                self._barge_in.process(block)
+                for passed in self._gate_block(block):
+                    self._audio_queue.put_nowait(passed.copy())  # The ring slot will be reused
+            if not blocks:
+                if not self._capture.alive:
+                    print("\n[Capture process exited]")
+                    self.stop()
+                    return
+                gated = self._wake_gate is not None and not self._wake_gate.is_open
+                # The ring holds capture_buffer_s, so a closed gate can afford to check rarely
+                await asyncio.sleep(self.config.wake_poll_ms / 1000 if gated else interval)
+
+    def _gate_block(self, block: np.ndarray) -> list[np.ndarray]:
+        """Blocks to pass on to the VAD (capture thread or poll loop)."""
+        if self._wake_gate is None:
+            return [block]
+        if self._tts_playing:
+            # Barge-in needs every block; stay open briefly after playback for the rest of it
+            self._wake_gate.hold()
+        return self._wake_gate.process(block)
+
+    def _stop_capture(self) -> None:
+        """Close the microphone stream."""
+        if self._capture_poll is not None:
+            self._capture_poll.cancel()
+            self._capture_poll = None
+        if self._capture is not None:
+            self._capture.close()
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+
+    def _drain_audio(self) -> None:
+        """Discard buffered microphone blocks."""
         while not self._audio_queue.empty():
             try:
                 self._audio_queue.get_nowait()
-            except queue.Empty:
+            except asyncio.QueueEmpty:
                 break
 
-        # Start audio stream
-        def audio_callback(indata, frames, time_info, status):
-            if status:
-                print(f"Audio status: {status}")
-            self._audio_queue.put(indata.copy())
+    async def _capture_stage(self, metrics: StageMetrics) -> None:
+        """Pipeline stage: segment microphone audio into utterances."""
+        while self._running:
+            if not self.config.full_duplex and not self._idle.is_set():
+                # Half duplex: wait for the turn to finish, ignore what was heard meanwhile
+                await self._idle.wait()
+                self._drain_audio()
+                print("\n[Listening...] ", end="", flush=True)
+
+            captured = await self._capture_speech()
+            if captured is None:
+                continue
+
+            audio, _ = captured
+            metrics.items += 1
+            metrics.busy_s += len(audio) / self.config.sample_rate
+            if not await put_bounded(self._utterance_queue, captured, metrics):
+                print("\n[Dropped oldest untranscribed utterance]")
+            self._refresh_state()
+
+    async def _capture_speech(self) -> Optional[tuple[np.ndarray, TurnTrace]]:
+        """
+        Capture speech using VAD (Voice Activity Detection).
 
-        chunks = []
-        speech_detected = False
-        silence_start = None
-        speech_start = None
+        Reads blocks from the persistent capture stream and returns audio
+        when speech ends (silence detected after speech), with a new trace
+        marked at speech onset, end of speech and endpoint.
+        """
+        vad = self._vad
+        vad.reset()
+        audio = None
+        onset = last_voiced = None
 
         try:
-            with sd.InputStream(
-                samplerate=self.config.sample_rate,
-                channels=self.config.channels,
-                dtype=self.config.dtype,
-                callback=audio_callback,
-                blocksize=int(self.config.sample_rate * 0.1),  # 100ms blocks
-            ):
-                while self._running:
-                    try:
-                        chunk = self._audio_queue.get(timeout=0.1)
-                    except queue.Empty:
-                        continue
-
-                    # Calculate RMS for VAD
-                    audio_float = chunk.astype(np.float32) / 32768.0
-                    rms = np.sqrt(np.mean(audio_float ** 2))
-
-                    is_speech = rms > self.config.vad_threshold
-
-                    if is_speech:
-                        if not speech_detected:
-                            speech_detected = True
-                            speech_start = time.time()
-                            print("*", end="", flush=True)
-                        silence_start = None
-                        chunks.append(chunk)
-                    else:
-                        if speech_detected:
-                            chunks.append(chunk)  # Include some silence
-                            if silence_start is None:
-                                silence_start = time.time()
-                            elif (time.time() - silence_start) * 1000 > self.config.vad_silence_ms:
-                                # Check minimum speech duration
-                                if speech_start and (time.time() - speech_start) * 1000 > self.config.vad_min_speech_ms:
-                                    break
-                                else:
-                                    # Too short, reset
-                                    speech_detected = False
-                                    silence_start = None
-                                    chunks = []
+            while self._running and audio is None:
+                chunk = await self._audio_queue.get()
+                is_speech = vad.is_speech(chunk)
+
+                # While TTS plays, only the barge-in detector (which removes our own
+                # echo) may start an utterance; the barge-in speech is then captured
+                if self._tts_playing and not vad.in_speech:
+                    is_speech = self._barge_in_detected
+
+                if is_speech:
+                    last_voiced = time.monotonic()
+                    if not vad.in_speech:
+                        onset = last_voiced
+                        self._capturing = True
+                        self._refresh_state()
+                        print("*", end="", flush=True)
+
+                audio = vad.push(chunk, is_speech)
+        finally:
+            self._capturing = False
 
-        except Exception as e:
-            print(f"\nAudio capture error: {e}")
+        if audio is None:
             return None
+        if self._wake_gate is not None:
+            self._wake_gate.mark_utterance()
+
+        trace = self._tracer.begin()
+        trace.mark("speech_onset", onset)
+        trace.mark("speech_end", last_voiced)
+        trace.mark("endpoint")
+        return audio, trace
+
+    # ------------------------------------------------------------------
+    # Transcription
+    # ------------------------------------------------------------------
+
+    async def _stt_stage(self, metrics: StageMetrics) -> None:
+        """Pipeline stage: transcribe utterances, handle local intents, queue commands."""
+        while self._running:
+            audio, trace = await self._utterance_queue.get()
+
+            with metrics.busy():
+                if not await self._wake_phrase_heard(audio, trace):
+                    print("(no wake phrase)")
+                    trace.label = "no_wake_phrase"
+                    self._tracer.finish(trace)
+                    continue
+                print("[Transcribing...] ", end="", flush=True)
+                text = await self._transcribe(audio)
+                if self._spotter and text:
+                    text = self._spotter.strip(text)
+            trace.mark("transcript_ready")
+            trace.text = text or ""
+
+            if not text or not text.strip():
+                print("(no speech detected)")
+                trace.label = "empty"
+                if self._wake_gate is not None:
+                    self._wake_gate.reject()
+                self._tracer.finish(trace)
+                continue
+            self._awake_until = time.monotonic() + self.config.wake_timeout_s
+
+            print(f'"{text}" ({self.last_stt_timings.get("total_ms", 0):.0f} ms)')
+            if self._transcripts:
+                self._transcripts.append(self._cli.session_id, TRANSCRIPT, text)
+            if self.on_transcription:
+                self.on_transcription(text)
+
+            # Handle built-in and simple local commands without the CLI
+            match = self._intents.match(text)
+            if match:
+                trace.label = f"intent:{match.intent.name}"
+                speech = await self._intents.execute(match)
+                if speech:
+                    print(f"[{match.intent.name}] {speech}")
+                if match.intent.name == "quit":
+                    # Say goodbye before stopping, or other stages exiting would cut it off
+                    trace.mark("first_speakable")
+                    await self._speak(speech, trace)
+                    self._complete_trace(trace)
+                    self.stop()
+                    return
+                if speech:
+                    await self._queue_speech(None, speech, trace)
+                self._complete_trace(trace)
+                continue
 
-        if not chunks:
-            return None
+            if self._command_queue.full():
+                print("[Command queue full - dropped]")
+                self._pipeline.stages["execute"].dropped += 1
+                trace.label = "dropped"
+                await self._queue_speech(None, "I'm still busy with earlier requests.", trace)
+                continue
 
-        return np.concatenate(chunks)
+            execute = self._pipeline.stages["execute"]
+            ahead = self._command_queue.qsize() + (1 if execute.active else 0)
+            if ahead:
+                print(f"[Queued - {ahead} ahead]")
+            await self._command_queue.put((text, trace))
+            execute.max_depth = max(execute.max_depth, self._command_queue.qsize())
+            self._refresh_state()
+
+    async def _wake_phrase_heard(self, audio: np.ndarray, trace: TurnTrace) -> bool:
+        """Check the utterance for the wake phrase, unless a recent turn left us awake."""
+        if self._spotter is None or trace.marks.get("speech_onset", 0) < self._awake_until:
+            return True
+        stats = self._wake_gate.stats if self._wake_gate else None
+        audio_float = audio.astype(np.float32).flatten() / 32768.0
+        loop = asyncio.get_running_loop()
+        heard = await loop.run_in_executor(self._stt_executor, self._spotter.heard, audio_float)
+        trace.mark("wake_checked")
+        if stats:
+            stats.keyword_checks += 1
+            if not heard:
+                stats.keyword_rejects += 1
+                self._wake_gate.reject()
+        return heard
 
     async def _transcribe(self, audio: np.ndarray) -> str:
-        """Transcribe audio using Whisper."""
+        """Transcribe audio using the configured STT backend."""
         # Convert to float32 for Whisper
-        audio_float = audio.astype(np.float32) / 32768.0
-
-        # Run transcription in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: self._whisper.transcribe(
-                audio_float,
-                language=self.config.whisper_language,
-                fp16=False,  # Use fp32 for CPU
-            )
+        audio_float = audio.astype(np.float32).flatten() / 32768.0
+
+        # The VAD keeps trailing silence and every pause; Whisper pays for all of it
+        self.last_time_map = None
+        if self.config.stt_compact:
+            compacted, time_map = compact_speech(audio_float, self.config.sample_rate,
+                                                 threshold=self.config.vad_threshold,
+                                                 gap_ms=self.config.stt_max_gap_ms)
+            if compacted.size:
+                audio_float = compacted
+                self.last_time_map = time_map
+
+        result = await self._run_stt(audio_float)
+        self.last_stt_timings = result.timings
+        if self.last_time_map is not None:
+            self.last_stt_timings["trimmed_ms"] = self.last_time_map.removed_s * 1000
+        return result.text
+
+    async def _run_stt(self, audio: np.ndarray) -> TranscriptionResult:
+        """Run the STT backend off the event loop, on the dedicated STT thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._stt_executor,
+            lambda: self._stt.transcribe(audio, language=self.config.whisper_language)
         )
 
-        return result.get("text", "").strip()
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
 
-    async def _execute_and_speak(self, prompt: str) -> None:
-        """Execute prompt via Claude CLI and speak results."""
-        self._barge_in_detected = False
-        speech_queue = asyncio.Queue()
-        speak_task = None
+    async def _execute_stage(self, metrics: StageMetrics) -> None:
+        """Pipeline stage: run queued commands through the Claude CLI, one at a time."""
+        while self._running:
+            prompt, trace = await self._command_queue.get()
+            self._turn_id += 1
+            trace.turn = self._turn_id
+            self._turn_traces[self._turn_id] = trace
 
-        try:
-            # Start TTS consumer task
-            speak_task = asyncio.create_task(self._tts_consumer(speech_queue))
+            with metrics.busy():
+                await self._execute_and_speak(prompt, self._turn_id, trace)
 
+            trace.mark("cli_done")
+            self._complete_trace(trace)
+
+    async def _execute_and_speak(self, prompt: str, turn: int, trace: TurnTrace) -> None:
+        """Execute prompt via Claude CLI and queue speech for the TTS stage."""
+        try:
             # Stream from Claude CLI
             async for message in self._cli.execute(prompt):
-                if self._barge_in_detected:
-                    print("\n[Barge-in - stopping]")
+                if not trace.has("first_stdout"):
+                    trace.mark("cli_spawned", self._cli.spawned_at)
+                    trace.mark("first_stdout", self._cli.first_output_at)
+
+                if turn <= self._speech_floor:
+                    print("\n[Turn cancelled - stopping]")
                     self._cli.cancel()
                     break
 
-                # Parse message
+                # Parse once; subscribers print, speak and account for it
                 parsed = self._parser.parse_line(message)
+                await self.bus.publish(parsed.type.value, CLIEvent(
+                    parsed=parsed,
+                    turn=turn,
+                    trace=trace,
+                    session_id=self._cli.session_id,
+                    spawned_at=self._cli.spawned_at,
+                    received_at=time.monotonic(),
+                ))
 
-                # Debug output
-                if parsed.type == MessageType.ASSISTANT and parsed.has_text:
-                    print(f"\nClaude: {parsed.text[:200]}..." if len(parsed.text or "") > 200 else f"\nClaude: {parsed.text}")
-                elif parsed.type == MessageType.TOOL_USE:
-                    print(f"\n[Tool: {parsed.tool_name}]")
-                elif parsed.type == MessageType.ERROR:
-                    print(f"\n[Error: {parsed.text}]")
+        except Exception as e:
+            print(f"\nExecution error: {e}")
+            await self.bus.join("speech")
+            await self._queue_speech(turn, f"Sorry, I encountered an error: {str(e)[:50]}", trace, wait=True)
+
+        # The turn's speech must be queued before the turn can complete
+        await self.bus.join("speech")
+
+    def _log_message(self, event: CLIEvent) -> None:
+        """Bus subscriber: session history (queued to the store's writer thread)."""
+        self._transcripts.log_message(event.session_id, event.parsed)
+
+    def _print_message(self, event: CLIEvent) -> None:
+        """Bus subscriber: console output."""
+        parsed = event.parsed
+        if parsed.type == MessageType.ASSISTANT and parsed.has_text:
+            print(f"\nClaude: {parsed.text[:200]}..." if len(parsed.text or "") > 200 else f"\nClaude: {parsed.text}")
+        elif parsed.type == MessageType.TOOL_USE:
+            print(f"\n[Tool: {parsed.tool_name}]")
+        elif parsed.type == MessageType.ERROR:
+            print(f"\n[Error: {parsed.text}]")
+
+    async def _speak_message(self, event: CLIEvent) -> None:
+        """Bus subscriber: summarise for speech and queue it for the TTS stage."""
+        if self._is_cancelled(event.turn):
+            return
+        speech_text = self._summarizer.summarize_for_speech(event.parsed)
+        if speech_text:
+            # Blocks when the speech queue is full (backpressure back to the CLI reader)
+            await self._queue_speech(event.turn, speech_text, event.trace, wait=True)
+            if self.on_response:
+                self.on_response(speech_text)
+
+    async def _record_usage(self, event: CLIEvent) -> None:
+        """Bus subscriber: log a CLI run's tokens, cost and duration (off the event loop)."""
+        if not event.parsed.usage:
+            return
+        wall_ms = (event.received_at - event.spawned_at) * 1000 if event.spawned_at else 0.0
+        record = await asyncio.to_thread(
+            self._usage.record, event.parsed.usage, self.config.claude_model, wall_ms, event.session_id)
+        print(f"\n[Usage: {record.summary()}]")
 
-                # Get speech text
-                speech_text = self._summarizer.summarize_for_speech(parsed)
-                if speech_text:
-                    await speech_queue.put(speech_text)
-                    if self.on_response:
-                        self.on_response(speech_text)
+    def _on_usage_alert(self, message: str, record: TurnRecord) -> None:
+        print(f"\n[Usage alert - {message}]")
 
-            # Signal end of speech
-            await speech_queue.put(None)
+    async def _queue_speech(self, turn: Optional[int], text: str, trace: Optional[TurnTrace], wait: bool = False) -> None:
+        """
+        Queue a phrase for TTS, tracking it on its trace.
 
-            # Wait for TTS to finish
-            if speak_task:
-                await speak_task
+        Args:
+            wait: Block while the queue is full (backpressure) instead of
+                dropping the oldest phrase
+        """
+        if trace:
+            trace.pending_speech += 1
+            trace.mark("first_speakable")
+        if wait:
+            await self._speech_queue.put((turn, text, trace))
+            return
 
-        except Exception as e:
-            print(f"\nExecution error: {e}")
-            await self._speak(f"Sorry, I encountered an error: {str(e)[:50]}")
+        while self._speech_queue.full():
+            _, _, dropped = self._speech_queue.get_nowait()
+            self._pipeline.stages["synth"].dropped += 1
+            self._speech_done(dropped)
+        self._speech_queue.put_nowait((turn, text, trace))
+
+    def _speech_done(self, trace: Optional[TurnTrace]) -> None:
+        """A queued phrase was played or dropped."""
+        if trace:
+            trace.pending_speech -= 1
+            self._complete_trace(trace)
+
+    def _complete_trace(self, trace: Optional[TurnTrace]) -> None:
+        """Finish a trace once its CLI run (if any) has ended and all its speech has played."""
+        if trace is None or trace.pending_speech > 0:
+            return
+        if trace.turn is not None and not trace.has("cli_done"):
+            return
+        trace.mark("turn_complete")
+        self._awake_until = time.monotonic() + self.config.wake_timeout_s  # Reply without the wake phrase
+        if trace.cancelled:
+            trace.mark("cancel_done")
+        self._tracer.finish(trace)
+        self._turn_traces.pop(trace.turn, None)
+
+    # ------------------------------------------------------------------
+    # Speech output
+    # ------------------------------------------------------------------
+
+    def _is_cancelled(self, turn: Optional[int]) -> bool:
+        # turn is None for local intent replies, which aren't tied to a CLI turn
+        return turn is not None and turn <= self._speech_floor
+
+    async def _synth_stage(self, metrics: StageMetrics) -> None:
+        """
+        Pipeline stage: start synthesis of queued phrases ahead of playback.
 
-    async def _tts_consumer(self, speech_queue: asyncio.Queue) -> None:
-        """Consume speech queue and play TTS."""
-        while True:
-            text = await speech_queue.get()
-            if text is None:
-                break
+        Up to tts_prefetch phrases are synthesised concurrently while the TTS
+        stage plays earlier ones, so consecutive phrases play back to back
+        instead of waiting a synthesis round trip each.
+        """
+        while self._running:
+            turn, text, trace = await self._speech_queue.get()
+            if self._is_cancelled(turn):
+                metrics.dropped += 1
+                self._speech_done(trace)
+                continue
 
-            if self._barge_in_detected:
+            task = asyncio.create_task(self._synthesize(text, turn))
+            self._prefetch[task] = turn
+
+            def done(task: asyncio.Task) -> None:
+                self._prefetch.pop(task, None)
+                clip = self._clip_of(task)
+                if clip:
+                    metrics.busy_s += clip.synth_ms / 1000
+
+            task.add_done_callback(done)
+            metrics.items += 1
+
+            # Blocks while tts_prefetch clips are waiting to play (backpressure)
+            await self._clip_queue.put((turn, task, trace))
+            metrics.max_depth = max(metrics.max_depth, self._speech_queue.qsize())
+
+    @staticmethod
+    def _clip_of(task: asyncio.Task) -> Optional[SpeechClip]:
+        """Result of a finished synthesis task (None if cancelled or failed)."""
+        if not task.done() or task.cancelled() or task.exception():
+            return None
+        return task.result()
+
+    def _cancel_prefetch(self, floor: Optional[int] = None) -> None:
+        """Cancel in-flight synthesis for turns <= floor (default: all)."""
+        for task, turn in list(self._prefetch.items()):
+            if floor is None or (turn is not None and turn <= floor):
+                task.cancel()
+
+    async def _tts_stage(self, metrics: StageMetrics) -> None:
+        """Pipeline stage: play synthesised phrases in order, skipping cancelled turns."""
+        while self._running:
+            turn, task, trace = await self._clip_queue.get()
+            if not self._is_cancelled(turn):
+                await asyncio.wait({task})
+
+            clip = self._clip_of(task)
+            if clip is None or self._is_cancelled(turn):
+                task.cancel()
+                metrics.dropped += 1
+                self._speech_done(trace)
                 continue
 
-            self._set_state(VoiceState.SPEAKING)
-            await self._speak(text)
+            with metrics.busy():
+                self._barge_in_detected = False
+                await self._play(clip, trace)
 
             if self._barge_in_detected:
-                break
-
-    async def _speak(self, text: str) -> None:
-        """Speak text using TTS."""
+                print(f"\n[Barge-in detected - {self._barge_in.stats.last_reaction_ms:.0f} ms - stopping]")
+                if turn is not None:
+                    self._cancel_turn(turn)
+            self._speech_done(trace)
+
+    async def _speak(self, text: str, trace: Optional[TurnTrace] = None) -> None:
+        """Speak text immediately, bypassing the speech queue."""
+        clip = await self._synthesize(text)
+        if clip:
+            await self._play(clip, trace)
+
+    async def _synthesize(self, text: str, turn: Optional[int] = None) -> Optional[SpeechClip]:
+        """Synthesise text to a clip (None on error)."""
         if not text:
+            return None
+
+        start = time.perf_counter()
+        clip = SpeechClip(text=text, turn=turn)
+        if self._render_audio:
+            voice, rate = self._tts_cache_key()
+            cached = self._tts_cache.get(text, voice, rate) if self._tts_cache else None
+            if cached:
+                clip.audio, clip.sample_rate = cached
+                clip.cached = True
+            else:
+                try:
+                    clip.audio, clip.sample_rate = await self._render(text)
+                except Exception as e:
+                    print(f"TTS error: {e}")
+                    return None
+                if self._tts_cache:
+                    self._tts_cache.put(text, voice, rate, clip.audio, clip.sample_rate)
+        clip.synth_ms = (time.perf_counter() - start) * 1000
+        return clip
+
+    def _tts_cache_key(self) -> tuple[str, str]:
+        """(voice, rate) identifying the current engine's output in the TTS cache."""
+        if self._tts_engine == "edge":
+            return self.config.tts_voice, self.config.tts_rate
+        return f"pyttsx3:{self.config.offline_voice or 'default'}", str(self.config.offline_rate)
+
+    async def _render(self, text: str) -> tuple[np.ndarray, int]:
+        """Render text to int16 PCM with the active engine."""
+        if self._offline_tts:
+            return await asyncio.wrap_future(self._offline_tts.render(text))
+
+        data = await self._synthesize_edge(text)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, decode_audio, data, self.config.tts_sample_rate)
+
+    async def _prewarm_tts(self) -> None:
+        """Synthesise fixed phrases into the TTS cache in the background."""
+        if not self._tts_cache:
             return
 
+        voice, rate = self._tts_cache_key()
+        for text in PREWARM_PHRASES:
+            if self._tts_cache.contains(text, voice, rate):
+                continue
+            try:
+                audio, sample_rate = await self._render(text)
+            except Exception:
+                return  # Offline or no decoder - phrases are synthesised on demand
+            self._tts_cache.put(text, voice, rate, audio, sample_rate)
+            self._tts_cache.stats.prewarmed += 1
+
+    async def _play(self, clip: SpeechClip, trace: Optional[TurnTrace] = None) -> None:
+        """Play a synthesised clip with barge-in detection."""
+        if self._transcripts:
+            self._transcripts.append(self._cli.session_id, SPEECH, clip.text)
         self._tts_cancel.clear()
+        self._tts_playing = True
+        if self.config.enable_barge_in:
+            self._barge_in.arm()
 
         try:
-            if TTS_ENGINE == "edge":
-                await self._speak_edge(text)
+            if clip.audio is not None:
+                # Marked when the first block reaches the speaker, output latency included
+                on_start = (lambda at: trace.mark("first_audio_out", at)) if trace else None
+                await self._play_pcm(clip.audio, clip.sample_rate, on_start)
             else:
-                await self._speak_pyttsx3(text)
+                if trace:
+                    trace.mark("first_audio_out")  # Spoken by the engine; no device timing
+                await self._speak_offline(clip.text)
         except Exception as e:
             print(f"TTS error: {e}")
+        finally:
+            self._barge_in.disarm()
+            self._tts_playing = False
 
-    async def _speak_edge(self, text: str) -> None:
-        """Speak using Edge TTS."""
-        import tempfile
+    def _on_barge_in(self) -> None:
+        """
+        Barge-in detector callback (runs on the audio thread).
 
+        Only sets flags and stops output; _tts_stage reports it from the
+        event loop, since blocking here (e.g. on stdout) would glitch capture.
+        """
+        self._barge_in_detected = True
+        self._tts_cancel.set()
+        self._output.stop()  # From the audio thread: silent from the next output block
+        if self._offline_tts:
+            self._offline_tts.stop()
+
+    async def _synthesize_edge(self, text: str) -> bytes:
+        """Synthesise using Edge TTS; returns MP3 bytes."""
         communicate = edge_tts.Communicate(
             text,
             self.config.tts_voice,
             rate=self.config.tts_rate,
         )
 
-        # Save to temp file and play
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-            temp_path = f.name
-
-        try:
-            await communicate.save(temp_path)
-
-            if not self._tts_cancel.is_set():
-                # Play audio file
-                await self._play_audio_file(temp_path)
-        finally:
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-
-    async def _play_audio_file(self, path: str) -> None:
-        """Play audio file with barge-in detection."""
-        try:
-            import pygame
-            pygame.mixer.init()
-            pygame.mixer.music.load(path)
-            pygame.mixer.music.play()
-
-            # Monitor for barge-in while playing
-            while pygame.mixer.music.get_busy():
-                if self._tts_cancel.is_set() or self._barge_in_detected:
-                    pygame.mixer.music.stop()
-                    break
-                await asyncio.sleep(0.1)
-
-                # Check for voice input (barge-in)
-                if self.config.enable_barge_in:
-                    await self._check_barge_in()
-
-        except ImportError:
-            # Fallback: use sounddevice with scipy
-            try:
-                from scipy.io import wavfile
-                import subprocess
-
-                # Convert mp3 to wav using ffmpeg
-                wav_path = path.replace(".mp3", ".wav")
-                subprocess.run(
-                    ["ffmpeg", "-y", "-i", path, "-ar", "24000", "-ac", "1", wav_path],
-                    capture_output=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
-                )
-
-                sr, audio = wavfile.read(wav_path)
-                sd.play(audio, sr)
-                sd.wait()
-
-                os.unlink(wav_path)
-            except Exception as e:
-                print(f"Audio playback error: {e}")
-
-    async def _speak_pyttsx3(self, text: str) -> None:
-        """Speak using pyttsx3."""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._speak_pyttsx3_sync, text)
+        audio = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+        return bytes(audio)
 
-    def _speak_pyttsx3_sync(self, text: str) -> None:
-        """Synchronous pyttsx3 speech."""
-        engine = pyttsx3.init()
-        engine.say(text)
-        engine.runAndWait()
+    async def _play_pcm(self, audio: np.ndarray, sample_rate: int,
+                        on_start: Optional[Callable[[float], None]] = None) -> None:
+        """
+        Play decoded PCM on the persistent output stream, stopping when cancelled.
 
-    async def _check_barge_in(self) -> None:
-        """Check for user speech during TTS playback (barge-in)."""
-        # Quick check of audio input level
-        try:
-            recording = sd.rec(
-                int(0.1 * self.config.sample_rate),
-                samplerate=self.config.sample_rate,
-                channels=1,
-                dtype='int16',
-            )
-            sd.wait()
-
-            audio_float = recording.astype(np.float32) / 32768.0
-            rms = np.sqrt(np.mean(audio_float ** 2))
-
-            # Higher threshold during playback to avoid feedback
-            if rms > self.config.vad_threshold * 3:
-                self._barge_in_detected = True
-                self._tts_cancel.set()
-                print("\n[Barge-in detected]")
-        except:
-            pass
+        on_start gets the monotonic time the first block reaches the speaker.
+        """
+        done = self._output.play(audio, sample_rate, on_start)
+        while not done.is_set():
+            if self._tts_cancel.is_set():
+                self._output.stop()
+                break
+            await asyncio.sleep(0.02)
+
+    async def _speak_offline(self, text: str) -> None:
+        """Speak directly through the offline worker, stopping when cancelled."""
+        done = self._offline_tts.speak(text)
+        while not done.done():
+            if self._tts_cancel.is_set():
+                self._offline_tts.stop()
+                break
+            await asyncio.sleep(0.02)
 
     def stop(self) -> None:
         """Stop the voice interface."""
         self._running = False
         self._cli.cancel()
         self._tts_cancel.set()
+        self._cancel_prefetch()
+        self._pipeline.stop()
 
 
 async def main():
     """Main entry point."""
+    if sd is None:
+        print("Please install sounddevice: pip install sounddevice")
+        sys.exit(1)
+
     config = VoiceConfig(
-        whisper_model="base",  # Use "tiny" for faster, less accurate; "small" for better accuracy
+        whisper_model="auto",  # Tuned for this machine (python stt_autotune.py), else "base"
+        stt_backend="auto",    # int8 faster-whisper when installed, else openai-whisper
         claude_model="sonnet",
         announce_tool_use=True,
         summarize_tool_result=True,
@@ -507,7 +1257,9 @@ if __name__ == "__main__":
     print("Voice V10 - Natural Language Coding Interface")
     print("-" * 45)
     print("Required packages:")
-    print("  pip install sounddevice numpy openai-whisper edge-tts pygame")
+    print("  pip install sounddevice numpy openai-whisper edge-tts miniaudio")
+    print("Optional (int8 CPU inference, stt_backend='faster-whisper'):")
+    print("  pip install faster-whisper")
     print("-" * 45 + "\n")
 
     asyncio.run(main())